@@ -2,8 +2,8 @@
 #
 # armar-sc-gui.py - Version 1.6 - 2025-11-11
 #
-# Dependencies: python3-pyqt5, jq, systemd
-# To Install Dependencies: (Debian/Ubuntu): sudo apt install python3-pyqt5 jq systemd
+# Dependencies: python3-pyqt5, systemd, armar_sc_config.py (in the same folder)
+# To Install Dependencies: (Debian/Ubuntu): sudo apt install python3-pyqt5 systemd
 # 
 #
 # Copyright (c) 2025 Hanzerik307
@@ -27,19 +27,50 @@
 # SOFTWARE.
 
 import sys
+import argparse
 import subprocess
+import shlex
 import json
 import os
 import re
+import time
+import io
+import inspect
+import functools
+import contextlib
+import cProfile
+import pstats
+import tracemalloc
+import hashlib
+import difflib
+import tempfile
+import stat
+import zlib
+import fcntl
+import struct
+import asyncio
+import threading
+import shutil
+import concurrent.futures
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QTabWidget, QLineEdit, QComboBox, QCheckBox, QTextEdit,
-    QMessageBox, QDialog, QTextBrowser, QScrollArea
+    QMessageBox, QDialog, QTextBrowser, QScrollArea, QListWidget, QListWidgetItem,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QAction, QListView
 )
-from PyQt5.QtCore import Qt, QProcess
+from PyQt5.QtCore import Qt, QProcess, QTimer, QThread, QFileSystemWatcher, pyqtSignal, QAbstractListModel, QModelIndex
 from PyQt5.QtGui import QPalette, QColor, QFont
 
+# The config classes live next to this script without Qt, so armar-sc.sh can use them on a headless server.
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+from armar_sc_config import SERVER_FPS_BUDGET, ConfigFile, StartScript, ConfigValidator, validate_files
+
 class ConfigDialog(QDialog):
     def __init__(self, content, title, parent=None):
         super().__init__(parent)
@@ -80,352 +111,3850 @@ class AddModsDialog(QDialog):
     def get_mod_ids(self):
         return [mod_input.text().strip().upper() for mod_input in self.mod_inputs if mod_input.text().strip()]
 
-class ArmaServerControlApp(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("Arma Reforger Server Control")
-        self.setGeometry(100, 100, 600, 600)
-        self.is_dark_theme = False
-        self.config_file = os.path.expanduser("~/arma/server.json")
-        self.addons_dir = os.path.expanduser("~/arma/profile/addons")
-        self.start_script = os.path.expanduser("~/arma/start.sh")
-        self.service_name = "arma.service"  # Confirmed correct
+class SaveBrowserDialog(QDialog):
+    def __init__(self, save_index, scenario_names, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Session Saves")
+        self.setGeometry(100, 100, 700, 400)
+        self.save_index = save_index
+        self.scenario_names = scenario_names
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Saves in the server profile, newest first. Double-click a save to load it on the next start:"))
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Save", "Scenario", "Size", "Modified"])
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.doubleClicked.connect(self.accept)
+        layout.addWidget(self.table)
+        self.status_label = QLabel("Checking for new saves...")
+        layout.addWidget(self.status_label)
+        button_layout = QHBoxLayout()
+        self.use_button = QPushButton("Use Selected Save")
+        self.cancel_button = QPushButton("Cancel")
+        self.use_button.clicked.connect(self.accept)
+        self.cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(self.use_button)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+        self.populate()
+        # The cached list is shown right away; new and changed saves are read in the background.
+        self.index_thread = SaveIndexThread(save_index, self)
+        self.index_thread.indexed.connect(self.indexed)
+        self.index_thread.start()
 
-        self.scenarios = [
-            ("{ECC61978EDCC2B5A}Missions/23_Campaign.conf", "Conflict - Everon"),
-            ("{59AD59368755F41A}Missions/21_GM_Eden.conf", "Game Master - Everon"),
-            ("{2BBBE828037C6F4B}Missions/22_GM_Arland.conf", "Game Master - Arland"),
-            ("{C700DB41F0C546E1}Missions/23_Campaign_NorthCentral.conf", "Conflict - Northern Everon"),
-            ("{28802845ADA64D52}Missions/23_Campaign_SWCoast.conf", "Conflict - Southern Everon"),
-            ("{94992A3D7CE4FF8A}Missions/23_Campaign_Western.conf", "Conflict - Western Everon"),
-            ("{FDE33AFE2ED7875B}Missions/23_Campaign_Montignac.conf", "Conflict - Montignac"),
-            ("{DAA03C6E6099D50F}Missions/24_CombatOps.conf", "Combat Ops - Arland"),
-            ("{C41618FD18E9D714}Missions/23_Campaign_Arland.conf", "Conflict - Arland"),
-            ("{DFAC5FABD11F2390}Missions/26_CombatOpsEveron.conf", "Combat Ops - Everon"),
-            ("{3F2E005F43DBD2F8}Missions/CAH_Briars_Coast.conf", "Capture & Hold: Briars"),
-            ("{F1A1BEA67132113E}Missions/CAH_Castle.conf", "Capture & Hold: Montfort Castle"),
-            ("{589945FB9FA7B97D}Missions/CAH_Concrete_Plant.conf", "Capture & Hold: Concrete Plant"),
-            ("{9405201CBD22A30C}Missions/CAH_Factory.conf", "Capture & Hold: Almara Factory"),
-            ("{1CD06B409C6FAE56}Missions/CAH_Forest.conf", "Capture & Hold: Simon's Wood"),
-            ("{7C491B1FCC0FF0E1}Missions/CAH_LeMoule.conf", "Capture & Hold: Le Moule"),
-            ("{6EA2E454519E5869}Missions/CAH_Military_Base.conf", "Capture & Hold: Camp Blake"),
-            ("{2B4183DF23E88249}Missions/CAH_Morton.conf", "Capture & Hold: Morton"),
-            ("{0220741028718E7F}Missions/23_Campaign_HQC_Everon.conf", "Conflict: HQ Commander - Everon"),
-			("{68D1240A11492545}Missions/23_Campaign_HQC_Arland.conf", "Conflict: HQ Commander - Arland"),
-            ("{BB5345C22DD2B655}Missions/23_Campaign_HQC_Cain.conf", "Conflict: HQ Commander - Kolguyev"),
-			("{CB347F2F10065C9C}Missions/CombatOpsCain.conf", "Combat Ops - Kolguyev"),
-			("{F45C6C15D31252E6}Missions/27_GM_Cain.conf", "Game Master - Kolguyev"),
-        ]
+    def populate(self):
+        saves = self.save_index.saves()
+        self.table.setRowCount(len(saves))
+        for row, entry in enumerate(saves):
+            scenario = entry["scenario"]
+            if scenario:
+                scenario = self.scenario_names.get(scenario) or ScenarioIndexer.describe(scenario.split("}", 1)[-1])
+            size = entry["size"]
+            size_text = f"{size / 1048576:.1f} MB" if size >= 1048576 else f"{size / 1024:.0f} KB"
+            modified = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry["mtime_ns"] / 1e9))
+            for column, text in enumerate([entry["name"], scenario or "Unknown", size_text, modified]):
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        self.table.resizeColumnToContents(0)
 
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)
-        self.layout = QVBoxLayout(self.central_widget)
+    def indexed(self, changed):
+        if changed:
+            self.populate()
+        count = self.table.rowCount()
+        self.status_label.setText(f"{count} save{'s' if count != 1 else ''} found." if count else "No saves found in the server profile.")
 
-        self.theme_button = QPushButton("Switch to Dark Theme")
-        self.theme_button.clicked.connect(self.toggle_theme)
-        self.layout.addWidget(self.theme_button)
+    def selected_save(self):
+        row = self.table.currentRow()
+        return self.table.item(row, 0).text() if row >= 0 else ""
 
-        self.tabs = QTabWidget()
-        self.layout.addWidget(self.tabs)
+    def done(self, result):
+        if self.index_thread.isRunning():
+            self.save_index.cancel()
+            self.index_thread.wait(2000)
+        super().done(result)
 
-        # Service Management Tab
-        self.service_tab = QWidget()
-        self.service_layout = QVBoxLayout(self.service_tab)
-        status_layout = QHBoxLayout()
-        self.status_button = QPushButton("Status")
-        self.status_button.setFixedSize(100, 30)
-        font = QFont()
-        font.setPointSize(8)
-        self.status_button.setFont(font)
-        self.status_button.clicked.connect(self.show_status)
-        status_layout.addStretch()
-        status_layout.addWidget(self.status_button)
-        status_layout.addStretch()
-        self.service_layout.addLayout(status_layout)
-        self.log_window = QTextEdit()
-        self.log_window.setReadOnly(True)
-        self.log_window.setPlaceholderText("Service logs will appear here...")
-        self.service_layout.addWidget(QLabel("Service Logs:"))
-        self.service_layout.addWidget(self.log_window)
-        self.start_button = QPushButton("Start Service")
-        self.stop_button = QPushButton("Stop Service")
-        self.restart_button = QPushButton("Restart Service")
-        self.start_button.clicked.connect(self.start_service)
-        self.stop_button.clicked.connect(self.stop_service)
-        self.restart_button.clicked.connect(self.restart_service)
-        self.start_button.setStyleSheet("background-color: #00FF00;")
-        self.stop_button.setStyleSheet("background-color: #FF0000;")
-        self.restart_button.setStyleSheet("background-color: #FFFF00;")
-        self.update_status_button_color()
-        button_layout = QHBoxLayout()
-        button_layout.addWidget(self.start_button)
-        button_layout.addWidget(self.stop_button)
-        button_layout.addWidget(self.restart_button)
-        self.service_layout.addLayout(button_layout)
-        self.tabs.addTab(self.service_tab, "Service Control")
-        self.log_process = QProcess(self)
-        self.log_process.readyReadStandardOutput.connect(self.handle_log_output)
-        self.log_process.readyReadStandardError.connect(self.handle_log_output)
-        self.start_logging()
+class ConfigHistory:
+    # Every saved version of server.json and start.sh as a diff against the
+    # previous one, with a full snapshot every SNAPSHOT_EVERY revisions of a file
+    # so rebuilding an old revision never replays the whole history.
+    SNAPSHOT_EVERY = 20
+    TAG_DELAY = 120
+    TAG_WINDOW = 15 * 60
 
-        # Server Configuration Tab
-        self.config_tab = QWidget()
-        self.config_scroll = QScrollArea()
-        self.config_scroll.setWidgetResizable(True)
-        self.config_scroll.setWidget(self.config_tab)
-        self.config_layout = QVBoxLayout(self.config_tab)
-        self.config_layout.addWidget(QLabel("Server Configuration:"))
+    def __init__(self, history_dir):
+        self.history_dir = history_dir
+        self.revisions_file = os.path.join(history_dir, "revisions.jsonl")
+        self.lock = threading.Lock()
+        self.revisions = []
+        self.cache = {}
+        self.load()
 
-        # Inline: Public IP Address
-        self.ip_input = QLineEdit()
-        ip_layout = QHBoxLayout()
-        ip_layout.addWidget(QLabel("Public IP Address:"))
-        ip_layout.addWidget(self.ip_input)
-        self.config_layout.addLayout(ip_layout)
+    def load(self):
+        self.revisions = []
+        self.cache = {}
+        by_rev = {}
+        try:
+            with open(self.revisions_file, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if "tag" in record:
+                        if record["tag"] in by_rev:
+                            by_rev[record["tag"]].update(record.get("data", {}))
+                    elif "rev" in record:
+                        self.revisions.append(record)
+                        by_rev[record["rev"]] = record
+        except OSError:
+            pass
 
-        # Inline: Public Port
-        self.port_input = QLineEdit()
-        self.port_input.setPlaceholderText("1024-65535")
-        port_layout = QHBoxLayout()
-        port_layout.addWidget(QLabel("Public Port:"))
-        port_layout.addWidget(self.port_input)
-        self.config_layout.addLayout(port_layout)
+    @staticmethod
+    def kind(file_name):
+        return "json" if file_name.endswith(".json") else "text"
 
-        # Inline: Server Name
-        self.name_input = QLineEdit()
-        name_layout = QHBoxLayout()
-        name_layout.addWidget(QLabel("Server Name:"))
-        name_layout.addWidget(self.name_input)
-        self.config_layout.addLayout(name_layout)
+    @classmethod
+    def json_diff(cls, old, new, path=()):
+        ops = []
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key in old:
+                if key not in new:
+                    ops.append(["del", list(path) + [key]])
+            for key in new:
+                if key not in old:
+                    ops.append(["set", list(path) + [key], new[key]])
+                else:
+                    ops.extend(cls.json_diff(old[key], new[key], path + (key,)))
+        elif old != new or type(old) != type(new):
+            ops.append(["set", list(path), new])
+        return ops
 
-        # Inline: Game Password
-        self.game_password_input = QLineEdit()
-        game_password_layout = QHBoxLayout()
-        game_password_layout.addWidget(QLabel("Game Password:"))
-        game_password_layout.addWidget(self.game_password_input)
-        self.config_layout.addLayout(game_password_layout)
+    @staticmethod
+    def apply_json_diff(doc, ops):
+        for op in ops:
+            keys = op[1]
+            if not keys:
+                doc = op[2]
+                continue
+            target = doc
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+            if op[0] == "del":
+                target.pop(keys[-1], None)
+            else:
+                target[keys[-1]] = op[2]
+        return doc
 
-        # Inline: Admin Password
-        self.admin_password_input = QLineEdit()
-        admin_password_layout = QHBoxLayout()
-        admin_password_layout.addWidget(QLabel("Admin Password:"))
-        admin_password_layout.addWidget(self.admin_password_input)
-        self.config_layout.addLayout(admin_password_layout)
+    @staticmethod
+    def text_diff(old, new):
+        old_lines = old.splitlines(keepends=True)
+        new_lines = new.splitlines(keepends=True)
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        return [[i1, i2, new_lines[j1:j2]] for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
 
-        # Stacked: Admins
-        self.admins_input = QTextEdit()
-        self.admins_input.setPlaceholderText("Enter up to 20 Player IdentityIds, one per line (e.g., 3690a2f4-edb0-434e-ab2e-758906631a38)")
-        self.admins_input.setFixedHeight(100)
-        self.config_layout.addWidget(QLabel("Admins (up to 20 Player IdentityIds):"))
-        self.config_layout.addWidget(self.admins_input)
+    @staticmethod
+    def apply_text_diff(text, ops):
+        lines = text.splitlines(keepends=True)
+        for i1, i2, new_lines in reversed(ops):
+            lines[i1:i2] = new_lines
+        return "".join(lines)
 
-        # Inline: Scenario
-        self.scenario_combo = QComboBox()
-        self.scenario_combo.addItems([desc for _, desc in self.scenarios])
-        scenario_layout = QHBoxLayout()
-        scenario_layout.addWidget(QLabel("Scenario:"))
-        scenario_layout.addWidget(self.scenario_combo)
-        self.config_layout.addLayout(scenario_layout)
+    @staticmethod
+    def parse(file_name, data):
+        text = data.decode() if isinstance(data, bytes) else data
+        return json.loads(text) if ConfigHistory.kind(file_name) == "json" else text
 
-        # Stacked: Custom Scenario
-        self.custom_scenario_input = QLineEdit()
-        self.custom_scenario_input.setPlaceholderText("e.g., {ECC61978EDCC2B5A}Missions/23_Campaign.conf")
-        self.config_layout.addWidget(QLabel("Custom Scenario ID (optional, overrides dropdown):"))
-        self.config_layout.addWidget(self.custom_scenario_input)
+    def get(self, rev):
+        for revision in self.revisions:
+            if revision["rev"] == rev:
+                return revision
+        raise KeyError(f"No revision {rev}")
 
-        # Inline: Max Players
-        self.max_players_input = QLineEdit()
-        self.max_players_input.setPlaceholderText("2-128")
-        max_players_layout = QHBoxLayout()
-        max_players_layout.addWidget(QLabel("Max Players:"))
-        max_players_layout.addWidget(self.max_players_input)
-        self.config_layout.addLayout(max_players_layout)
+    def latest(self, file_name):
+        for revision in reversed(self.revisions):
+            if revision["file"] == file_name:
+                return revision
+        return None
 
-        # Inline: Max View Distance
-        self.view_distance_input = QLineEdit()
-        self.view_distance_input.setPlaceholderText("500-10000")
-        view_distance_layout = QHBoxLayout()
-        view_distance_layout.addWidget(QLabel("Max View Distance:"))
-        view_distance_layout.addWidget(self.view_distance_input)
-        self.config_layout.addLayout(view_distance_layout)
+    def previous(self, rev):
+        file_name = self.get(rev)["file"]
+        previous = None
+        for revision in self.revisions:
+            if revision["rev"] == rev:
+                return previous
+            if revision["file"] == file_name:
+                previous = revision
+        return previous
 
-        # Inline: Min Grass Distance
-        self.grass_distance_input = QLineEdit()
-        self.grass_distance_input.setPlaceholderText("50-150")
-        grass_distance_layout = QHBoxLayout()
-        grass_distance_layout.addWidget(QLabel("Min Grass Distance:"))
-        grass_distance_layout.addWidget(self.grass_distance_input)
-        self.config_layout.addLayout(grass_distance_layout)
+    def content(self, rev):
+        if rev in self.cache:
+            return json.loads(json.dumps(self.cache[rev]))
+        target = self.get(rev)
+        chain = []
+        for revision in self.revisions:
+            if revision["file"] != target["file"]:
+                continue
+            if "snapshot" in revision:
+                chain = [revision]
+            else:
+                chain.append(revision)
+            if revision["rev"] == rev:
+                break
+        doc = json.loads(json.dumps(chain[0]["snapshot"]))
+        for revision in chain[1:]:
+            if self.kind(target["file"]) == "json":
+                doc = self.apply_json_diff(doc, revision["diff"])
+            else:
+                doc = self.apply_text_diff(doc, revision["diff"])
+        self.cache = {rev: doc}
+        return json.loads(json.dumps(doc))
 
-        # Inline: Network View Distance
-        self.network_view_distance_input = QLineEdit()
-        self.network_view_distance_input.setPlaceholderText("500-5000")
-        network_view_distance_layout = QHBoxLayout()
-        network_view_distance_layout.addWidget(QLabel("Network View Distance:"))
-        network_view_distance_layout.addWidget(self.network_view_distance_input)
-        self.config_layout.addLayout(network_view_distance_layout)
+    def render(self, rev):
+        doc = self.content(rev)
+        if self.kind(self.get(rev)["file"]) == "json":
+            return json.dumps(doc, indent=2, ensure_ascii=False) + "\n"
+        return doc
 
-        # Checkboxes
-        self.crossplay_checkbox = QCheckBox("Enable Crossplay")
-        crossplay_layout = QHBoxLayout()
-        crossplay_layout.addWidget(self.crossplay_checkbox)
-        crossplay_layout.addWidget(QLabel("(Default: False)"))
-        crossplay_layout.addStretch()
-        self.config_layout.addLayout(crossplay_layout)
+    def record(self, file_name, data, source):
+        digest = ConfigFile.digest(data if isinstance(data, bytes) else data.encode())
+        with self.lock:
+            latest = self.latest(file_name)
+            if latest and latest["digest"] == digest:
+                return None
+            doc = self.parse(file_name, data)
+            revision = {
+                "rev": self.revisions[-1]["rev"] + 1 if self.revisions else 1,
+                "ts": round(time.time(), 3),
+                "file": file_name,
+                "source": source,
+                "digest": digest,
+            }
+            since_snapshot = 0
+            for previous in reversed(self.revisions):
+                if previous["file"] != file_name:
+                    continue
+                if "snapshot" in previous:
+                    break
+                since_snapshot += 1
+            if latest is None or since_snapshot + 1 >= self.SNAPSHOT_EVERY:
+                revision["snapshot"] = doc
+            if latest is not None:
+                old_doc = self.content(latest["rev"])
+                if self.kind(file_name) == "json":
+                    revision["diff"] = self.json_diff(old_doc, doc)
+                else:
+                    revision["diff"] = self.text_diff(old_doc, doc)
+            self.append(revision)
+            self.revisions.append(revision)
+            self.cache = {revision["rev"]: doc}
+            return revision["rev"]
 
-        self.disable_3rd_person_checkbox = QCheckBox("Disable Third Person")
-        third_person_layout = QHBoxLayout()
-        third_person_layout.addWidget(self.disable_3rd_person_checkbox)
-        third_person_layout.addWidget(QLabel("(Default: False)"))
-        third_person_layout.addStretch()
-        self.config_layout.addLayout(third_person_layout)
+    def append(self, record):
+        os.makedirs(self.history_dir, exist_ok=True)
+        with open(self.revisions_file, 'a') as f:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
 
-        self.battleye_checkbox = QCheckBox("Enable BattlEye")
-        battleye_layout = QHBoxLayout()
-        battleye_layout.addWidget(self.battleye_checkbox)
-        battleye_layout.addWidget(QLabel("(Default: True)"))
-        battleye_layout.addStretch()
-        self.config_layout.addLayout(battleye_layout)
+    def tag(self, rev, data):
+        with self.lock:
+            self.get(rev).update(data)
+            self.append({"tag": rev, "data": data})
 
-        self.von_disable_ui_checkbox = QCheckBox("Disable VON UI")
-        von_ui_layout = QHBoxLayout()
-        von_ui_layout.addWidget(self.von_disable_ui_checkbox)
-        von_ui_layout.addWidget(QLabel("(Default: False)"))
-        von_ui_layout.addStretch()
-        self.config_layout.addLayout(von_ui_layout)
+    def changes(self, rev):
+        revision = self.get(rev)
+        if "diff" not in revision:
+            return "initial version"
+        if self.kind(revision["file"]) == "json":
+            paths = [".".join(str(key) for key in op[1]) or "(whole file)" for op in revision["diff"]]
+            return ", ".join(paths) if paths else "formatting only"
+        added = sum(len(op[2]) for op in revision["diff"])
+        removed = sum(op[1] - op[0] for op in revision["diff"])
+        return f"+{added} -{removed} lines"
 
-        self.von_disable_direct_speech_checkbox = QCheckBox("Disable Direct Speech UI")
-        von_direct_speech_layout = QHBoxLayout()
-        von_direct_speech_layout.addWidget(self.von_disable_direct_speech_checkbox)
-        von_direct_speech_layout.addWidget(QLabel("(Default: False)"))
-        von_direct_speech_layout.addStretch()
-        self.config_layout.addLayout(von_direct_speech_layout)
+    def diff(self, rev_a, rev_b):
+        a, b = self.get(rev_a), self.get(rev_b)
+        if a["file"] != b["file"]:
+            raise ValueError(f"r{rev_a} is {a['file']} and r{rev_b} is {b['file']}")
+        lines = [f"{a['file']}: r{rev_a} -> r{rev_b}", ""]
+        if self.kind(a["file"]) == "json":
+            for op in self.json_diff(self.content(rev_a), self.content(rev_b)):
+                path = ".".join(str(key) for key in op[1]) or "(whole file)"
+                if op[0] == "del":
+                    lines.append(f"removed {path}")
+                else:
+                    lines.append(f"{path} = {json.dumps(op[2], ensure_ascii=False)}")
+            lines.append("")
+        lines.extend(difflib.unified_diff(self.render(rev_a).splitlines(), self.render(rev_b).splitlines(),
+                                          f"r{rev_a}", f"r{rev_b}", lineterm=""))
+        return "\n".join(lines)
 
-        self.von_transmit_cross_faction_checkbox = QCheckBox("Allow Cross-Faction VON Transmit")
-        von_transmit_layout = QHBoxLayout()
-        von_transmit_layout.addWidget(self.von_transmit_cross_faction_checkbox)
-        von_transmit_layout.addWidget(QLabel("(Default: False)"))
-        von_transmit_layout.addStretch()
-        self.config_layout.addLayout(von_transmit_layout)
+    def timeline(self):
+        # Every revision that ran, rebuilt in order, with the time it took effect:
+        # when the server started with it, or when it was written if never tagged.
+        with self.lock:
+            revisions = list(self.revisions)
+        docs = {}
+        changes = []
+        for revision in revisions:
+            file_name = revision["file"]
+            if "snapshot" in revision:
+                docs[file_name] = json.loads(json.dumps(revision["snapshot"]))
+            elif file_name not in docs:
+                continue
+            elif self.kind(file_name) == "json":
+                docs[file_name] = self.apply_json_diff(docs[file_name], revision["diff"])
+            else:
+                docs[file_name] = self.apply_text_diff(docs[file_name], revision["diff"])
+            if "applied" in revision and revision["applied"] is None:
+                continue
+            doc = json.loads(json.dumps(docs[file_name])) if self.kind(file_name) == "json" else docs[file_name]
+            changes.append((revision.get("applied") or revision["ts"], file_name, doc))
+        return changes
+
+    def untagged(self, since=None):
+        return [revision for revision in self.revisions
+                if "applied" not in revision and (since is None or revision["ts"] <= since)]
+
+    def latest_per_file(self, revisions):
+        latest = {}
+        for revision in revisions:
+            latest[revision["file"]] = revision
+        return list(latest.values())
+
+    @classmethod
+    def summarize_samples(cls, samples, applied):
+        window = [sample for sample in samples
+                  if applied + cls.TAG_DELAY <= sample["ts"] <= applied + cls.TAG_DELAY + cls.TAG_WINDOW]
+        def average(key):
+            values = [sample[key] for sample in window if sample.get(key) is not None]
+            return round(sum(values) / len(values), 1) if values else None
+        rss = [sample["rss"] for sample in window if sample.get("rss") is not None]
+        return {
+            "samples": len(window),
+            "fps": average("fps"),
+            "fps_min": min((sample["fps"] for sample in window if sample.get("fps") is not None), default=None),
+            "players": average("players"),
+            "ai": average("ai"),
+            "cpu": average("cpu"),
+            "rss_mb": round(max(rss) / 1048576) if rss else None,
+        }
+
+    @staticmethod
+    def describe_metrics(metrics):
+        if not metrics or not metrics.get("samples"):
+            return ""
+        parts = []
+        if metrics.get("fps") is not None:
+            parts.append(f"FPS {metrics['fps']} (min {metrics['fps_min']})")
+        if metrics.get("players") is not None:
+            parts.append(f"{metrics['players']} players")
+        if metrics.get("ai") is not None:
+            parts.append(f"{metrics['ai']} AI")
+        if metrics.get("rss_mb") is not None:
+            parts.append(f"{metrics['rss_mb']} MB")
+        return ", ".join(parts)
+
+class ProfileSnapshots:
+    # Content-addressed store for ~/arma/profile. Files are cut into fixed-size
+    # chunks named by their SHA-256, so a chunk shared by any number of files or
+    # snapshots is stored once and a new snapshot only writes what changed.
+    CHUNK_SIZE = 1024 * 1024
+    EXCLUDE = ("addons", "logs")
+
+    def __init__(self, store_dir, source_dir, exclude=EXCLUDE):
+        self.store_dir = store_dir
+        self.source_dir = source_dir
+        self.chunks_dir = os.path.join(store_dir, "chunks")
+        self.manifests_dir = os.path.join(store_dir, "manifests")
+        self.exclude = set(exclude)
+
+    def chunk_path(self, digest):
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+
+    def names(self):
+        try:
+            return sorted(name[:-5] for name in os.listdir(self.manifests_dir) if name.endswith(".json"))
+        except OSError:
+            return []
+
+    def load(self, name):
+        with open(os.path.join(self.manifests_dir, name + ".json"), 'r') as f:
+            return json.load(f)
+
+    def walk(self):
+        for root, dirs, files in os.walk(self.source_dir):
+            if root == self.source_dir:
+                dirs[:] = [name for name in dirs if name not in self.exclude]
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                try:
+                    st = os.lstat(path)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    yield os.path.relpath(path, self.source_dir), st
+
+    def store_chunk(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.chunk_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = zlib.compress(data, 6)
+        fd, tmp_file = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_file, path)
+        return digest, len(compressed)
+
+    @contextlib.contextmanager
+    def locked(self):
+        # The GUI, its timer and a cron --snapshot can run at the same time; a
+        # prune must not sweep chunks a running snapshot has written but not referenced yet.
+        os.makedirs(self.store_dir, exist_ok=True)
+        with open(os.path.join(self.store_dir, "lock"), 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def read_chunk(self, digest):
+        with open(self.chunk_path(digest), 'rb') as f:
+            data = zlib.decompress(f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupt")
+        return data
+
+    def snapshot(self, keep=None):
+        if not os.path.isdir(self.source_dir):
+            raise FileNotFoundError(f"{self.source_dir} not found")
+        with self.locked():
+            name, stats = self.write_snapshot()
+            if keep:
+                self.remove_old(keep, time.time())
+        return name, stats
+
+    def write_snapshot(self):
+        names = self.names()
+        previous = self.load(names[-1])["files"] if names else {}
+        files = {}
+        stats = {"files": 0, "bytes": 0, "changed_files": 0, "stored_bytes": 0}
+        for rel_path, st in self.walk():
+            entry = previous.get(rel_path)
+            if (entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns
+                    and all(os.path.exists(self.chunk_path(digest)) for digest in entry["chunks"])):
+                files[rel_path] = entry
+            else:
+                chunks = []
+                size = 0
+                try:
+                    with open(os.path.join(self.source_dir, rel_path), 'rb') as f:
+                        while True:
+                            data = f.read(self.CHUNK_SIZE)
+                            if not data:
+                                break
+                            digest, written = self.store_chunk(data)
+                            chunks.append(digest)
+                            size += len(data)
+                            stats["stored_bytes"] += written
+                except OSError:
+                    # Deleted or replaced while we were reading it.
+                    continue
+                files[rel_path] = {"size": size, "mtime_ns": st.st_mtime_ns, "mode": st.st_mode & 0o7777, "chunks": chunks}
+                stats["changed_files"] += 1
+            stats["files"] += 1
+            stats["bytes"] += files[rel_path]["size"]
+        name = time.strftime("%Y%m%d-%H%M%S")
+        while name in names:
+            name += "a"
+        manifest = {"version": 1, "created": round(time.time(), 3), "source": self.source_dir, "stats": stats, "files": files}
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(prefix=".tmp-", dir=self.manifests_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, separators=(",", ":"))
+        os.replace(tmp_file, os.path.join(self.manifests_dir, name + ".json"))
+        return name, stats
+
+    def prune(self, keep):
+        started = time.time()
+        with self.locked():
+            return self.remove_old(keep, started)
+
+    def remove_old(self, keep, started):
+        names = self.names()
+        for name in names[:-keep] if keep < len(names) else []:
+            os.unlink(os.path.join(self.manifests_dir, name + ".json"))
+        referenced = set()
+        for name in self.names():
+            for entry in self.load(name)["files"].values():
+                referenced.update(entry["chunks"])
+        removed = 0
+        for root, dirs, files in os.walk(self.chunks_dir):
+            for name in files:
+                if name in referenced or name.startswith(".tmp-"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    # Chunks written after the prune started are left for the next one.
+                    if os.stat(path).st_mtime >= started:
+                        continue
+                    os.unlink(path)
+                except FileNotFoundError:
+                    continue
+                removed += 1
+        return removed
+
+    def restore(self, name, target_dir):
+        if os.path.exists(target_dir) and os.listdir(target_dir):
+            raise ValueError(f"{target_dir} is not empty")
+        files = self.load(name)["files"]
+        for rel_path, entry in files.items():
+            path = os.path.join(target_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                for digest in entry["chunks"]:
+                    f.write(self.read_chunk(digest))
+            os.chmod(path, entry["mode"])
+            os.utime(path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+        return len(files)
+
+    @staticmethod
+    def describe(name, manifest):
+        stats = manifest["stats"]
+        created = time.strftime('%Y-%m-%d %H:%M', time.localtime(manifest["created"]))
+        return (f"{name}  {created}  {stats['files']} files, {stats['bytes'] / 1048576:.1f} MB, "
+                f"{stats['changed_files']} changed, {stats['stored_bytes'] / 1048576:.1f} MB new")
+
+class ScenarioIndexer:
+    # Finds "{GUID}Missions/<name>.conf" resource references in an addon's files.
+    # Streams in chunks so multi-GB base game paks never sit in memory.
+    SCENARIO_PATTERN = re.compile(rb'\{([0-9A-Fa-f]{16})\}(Missions/[\w-]+\.conf)')
+    SCAN_SUFFIXES = (".pak", ".rdb", ".conf", ".meta")
+    CHUNK_SIZE = 4 * 1024 * 1024
+    OVERLAP = 256
+
+    def __init__(self):
+        self.cancelled = False
+
+    def scan_file(self, path, found):
+        with open(path, 'rb') as f:
+            tail = b""
+            while not self.cancelled:
+                chunk = f.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                data = tail + chunk
+                for match in self.SCENARIO_PATTERN.finditer(data):
+                    scenario_id = "{" + match.group(1).decode().upper() + "}" + match.group(2).decode()
+                    found.setdefault(scenario_id, self.describe(match.group(2).decode()))
+                tail = data[-self.OVERLAP:]
+
+    def scan_source(self, path):
+        found = {}
+        for root, dirs, files in os.walk(path):
+            for name in files:
+                if name.endswith(self.SCAN_SUFFIXES):
+                    try:
+                        self.scan_file(os.path.join(root, name), found)
+                    except OSError:
+                        continue
+        if self.cancelled:
+            return None
+        return sorted(found.items(), key=lambda item: item[1])
+
+    @staticmethod
+    def describe(conf_path):
+        name = os.path.splitext(os.path.basename(conf_path))[0]
+        return re.sub(r'^\d+_', '', name).replace("_", " ")
+
+class ModCatalog:
+    # Cache of addon metadata and discovered scenarios in ~/.arsc/mod-catalog.json.
+    # An addon is only re-read when the names, sizes or mtimes of its files change.
+    def __init__(self, catalog_file, addons_dir, game_addons_dir):
+        self.catalog_file = catalog_file
+        self.addons_dir = addons_dir
+        self.game_addons_dir = game_addons_dir
+        self.indexer = ScenarioIndexer()
+        self.lock = threading.Lock()
+        self.sources = {}
+        try:
+            with open(self.catalog_file, 'r') as f:
+                self.sources = json.load(f).get("sources", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    @staticmethod
+    def signature(path):
+        entries = []
+        with os.scandir(path) as it:
+            for entry in it:
+                stat = entry.stat()
+                entries.append([entry.name, stat.st_size, stat.st_mtime_ns])
+        return sorted(entries)
+
+    @staticmethod
+    def read_meta(meta_file):
+        with open(meta_file, 'r') as f:
+            meta = json.load(f).get("meta", {})
+        versions = meta.get("versions") or [{}]
+        return meta.get("id"), meta.get("name", "Unknown"), versions[0].get("version", "Unknown")
+
+    def addon_paths(self):
+        paths = []
+        if os.path.isdir(self.addons_dir):
+            with os.scandir(self.addons_dir) as it:
+                for entry in it:
+                    if entry.is_dir() and entry.name not in ("core", "data") and os.path.isfile(os.path.join(entry.path, "meta")):
+                        paths.append(entry.path)
+        return paths
+
+    def base_paths(self):
+        return [os.path.join(self.game_addons_dir, name) for name in ("core", "data")
+                if os.path.isdir(os.path.join(self.game_addons_dir, name))]
+
+    def refresh(self):
+        changed = False
+        seen = set()
+        with self.lock:
+            for path, kind in [(path, "base") for path in self.base_paths()] + [(path, "mod") for path in self.addon_paths()]:
+                seen.add(path)
+                try:
+                    signature = self.signature(path)
+                except OSError:
+                    continue
+                cached = self.sources.get(path)
+                if cached and cached.get("signature") == signature:
+                    continue
+                entry = {"kind": kind, "signature": signature, "id": None, "name": "Vanilla", "version": None, "scenarios": None}
+                if kind == "mod":
+                    try:
+                        entry["id"], entry["name"], entry["version"] = self.read_meta(os.path.join(path, "meta"))
+                    except (OSError, ValueError, AttributeError, IndexError):
+                        continue
+                self.sources[path] = entry
+                changed = True
+            for path in list(self.sources):
+                if path not in seen:
+                    del self.sources[path]
+                    changed = True
+        if changed:
+            self.save()
+        return changed
+
+    def mods(self):
+        with self.lock:
+            return {entry["id"]: (path, entry["name"], entry["version"])
+                    for path, entry in self.sources.items()
+                    if entry["kind"] == "mod" and entry["id"] and entry["id"] != "null"}
+
+    def index_scenarios(self):
+        with self.lock:
+            pending = [path for path, entry in self.sources.items() if entry["scenarios"] is None]
+        self.indexer.cancelled = False
+        for path in pending:
+            scenarios = self.indexer.scan_source(path)
+            if scenarios is None:
+                break
+            with self.lock:
+                if path in self.sources:
+                    self.sources[path]["scenarios"] = scenarios
+        if pending:
+            self.save()
+        return len(pending)
+
+    def cancel(self):
+        self.indexer.cancelled = True
+
+    def scenarios(self):
+        with self.lock:
+            result = []
+            for entry in self.sources.values():
+                for scenario_id, description in entry["scenarios"] or []:
+                    result.append((scenario_id, description, entry["name"] if entry["kind"] == "mod" else None))
+            return result
+
+    def save(self):
+        with self.lock:
+            data = {"version": 1, "sources": self.sources}
+            try:
+                os.makedirs(os.path.dirname(self.catalog_file), exist_ok=True)
+                tmp_file = self.catalog_file + ".tmp"
+                with open(tmp_file, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_file, self.catalog_file)
+            except OSError:
+                pass
+
+class ScenarioIndexThread(QThread):
+    indexed = pyqtSignal(int)
+
+    def __init__(self, catalog, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+
+    def run(self):
+        self.catalog.refresh()
+        self.indexed.emit(self.catalog.index_scenarios())
+
+class SaveIndex:
+    # Session save metadata cached in ~/.arsc/save-index.json by size and mtime,
+    # so the browser opens from the cache and only new or changed saves are read.
+    def __init__(self, cache_file, save_dir):
+        self.cache_file = cache_file
+        self.save_dir = save_dir
+        self.indexer = ScenarioIndexer()
+        self.lock = threading.Lock()
+        self.entries = {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                self.entries = json.load(f).get("saves", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def saves(self):
+        with self.lock:
+            return sorted(self.entries.values(), key=lambda entry: entry["mtime_ns"], reverse=True)
+
+    def cancel(self):
+        self.indexer.cancelled = True
+
+    def refresh(self):
+        self.indexer.cancelled = False
+        with self.lock:
+            cached = dict(self.entries)
+        found = {}
+        for root, dirs, files in os.walk(self.save_dir):
+            for name in files:
+                if name.startswith("."):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                rel_path = os.path.relpath(path, self.save_dir)
+                entry = cached.get(rel_path)
+                if not entry or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+                    scenarios = {}
+                    try:
+                        self.indexer.scan_file(path, scenarios)
+                    except OSError:
+                        continue
+                    if self.indexer.cancelled:
+                        return False
+                    entry = {"name": os.path.splitext(name)[0], "path": rel_path, "size": st.st_size,
+                             "mtime_ns": st.st_mtime_ns, "scenario": next(iter(scenarios), "")}
+                found[rel_path] = entry
+        if found == cached:
+            return False
+        with self.lock:
+            self.entries = found
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_file = self.cache_file + ".tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({"version": 1, "saves": found}, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            pass
+        return True
+
+class SaveIndexThread(QThread):
+    indexed = pyqtSignal(bool)
+
+    def __init__(self, save_index, parent=None):
+        super().__init__(parent)
+        self.save_index = save_index
+
+    def run(self):
+        self.indexed.emit(self.save_index.refresh())
+
+class ModStager:
+    # Fetches new and updated mods into <addons>/.staging while the server keeps
+    # running, checking every file's SHA-256, so the restart only has to move
+    # finished directories into place. There is no public service for this, the
+    # source is a mirror the admin hosts in this tool's own plain HTTP layout:
+    #   <source>/mods/<modId>/manifest.json (or <source>/mods/<modId>/<version>/manifest.json)
+    #     {"id", "name", "version", "dependencies": [{"id", "version"}], "files": [{"path", "size", "sha256"}]}
+    #   <source>/mods/<modId>/<version>/<path>
+    CHUNK_SIZE = 1024 * 1024
+    RETRIES = 3
+
+    def __init__(self, source_url, addons_dir, installed, max_workers=4, timeout=30, progress=None):
+        self.source_url = source_url.rstrip("/")
+        self.addons_dir = addons_dir
+        self.staging_dir = os.path.join(addons_dir, ".staging")
+        self.installed = installed
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.progress = progress or (lambda message: None)
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        self.done_bytes = 0
+        self.total_bytes = 0
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def url(self, *parts):
+        return "/".join([self.source_url] + [urllib.parse.quote(part) for part in parts])
+
+    def fetch_json(self, url):
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def resolve(self, mods):
+        # Breadth-first over dependencies; the first version asked for wins.
+        manifests = []
+        seen = set()
+        queue = deque((mod.get("modId", ""), mod.get("version")) for mod in mods)
+        while queue:
+            mod_id, version = queue.popleft()
+            if not mod_id or mod_id in seen:
+                continue
+            seen.add(mod_id)
+            parts = ("mods", mod_id, version, "manifest.json") if version else ("mods", mod_id, "manifest.json")
+            try:
+                manifest = self.fetch_json(self.url(*parts))
+            except urllib.error.HTTPError as e:
+                raise ValueError(f"Mod {mod_id}: content source returned {e.code}")
+            for file in manifest.get("files", []):
+                path = file.get("path", "")
+                if not path or os.path.isabs(path) or ".." in path.split("/"):
+                    raise ValueError(f"Mod {mod_id}: unsafe file path {path!r} in manifest")
+            manifest["id"] = mod_id
+            manifests.append(manifest)
+            queue.extend((dependency.get("id", ""), dependency.get("version")) for dependency in manifest.get("dependencies", []))
+        return manifests
+
+    def plan(self, mods):
+        staged = []
+        for manifest in self.resolve(mods):
+            current = self.installed.get(manifest["id"])
+            if current and current[2] == manifest["version"]:
+                continue
+            if current:
+                dir_name = os.path.basename(current[0])
+            else:
+                dir_name = re.sub(r'[^\w-]', '', manifest.get("name", "")) + "_" + manifest["id"]
+            staged.append({
+                "manifest": manifest,
+                "staged": os.path.join(self.staging_dir, dir_name),
+                "target": os.path.join(self.addons_dir, dir_name),
+                "previous": current[0] if current else None,
+            })
+        return staged
+
+    @classmethod
+    def file_digest(cls, path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for data in iter(lambda: f.read(cls.CHUNK_SIZE), b""):
+                digest.update(data)
+        return digest.hexdigest()
+
+    def add_progress(self, count):
+        with self.lock:
+            self.done_bytes += count
+            done, total = self.done_bytes, self.total_bytes
+        self.progress(f"Staging mods: {done / 1048576:.1f} of {total / 1048576:.1f} MB")
+
+    def fetch_file(self, item, file):
+        manifest = item["manifest"]
+        path = os.path.join(item["staged"], file["path"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Already staged by an earlier, interrupted run.
+        if os.path.exists(path) and os.path.getsize(path) == file["size"] and self.file_digest(path) == file["sha256"]:
+            self.add_progress(file["size"])
+            return 0
+        # Unchanged file of the installed version: copy it instead of downloading it again.
+        if item["previous"]:
+            existing = os.path.join(item["previous"], file["path"])
+            if (os.path.isfile(existing) and os.path.getsize(existing) == file["size"]
+                    and self.file_digest(existing) == file["sha256"]):
+                shutil.copy2(existing, path)
+                self.add_progress(file["size"])
+                return 0
+        url = self.url("mods", manifest["id"], manifest["version"], *file["path"].split("/"))
+        for attempt in range(self.RETRIES):
+            received = 0
+            try:
+                digest = hashlib.sha256()
+                with urllib.request.urlopen(url, timeout=self.timeout) as response, open(path + ".part", 'wb') as f:
+                    while not self.cancelled.is_set():
+                        data = response.read(self.CHUNK_SIZE)
+                        if not data:
+                            break
+                        digest.update(data)
+                        f.write(data)
+                        received += len(data)
+                        self.add_progress(len(data))
+                if self.cancelled.is_set():
+                    raise InterruptedError("Staging cancelled")
+                if received == file["size"] and digest.hexdigest() == file["sha256"]:
+                    os.replace(path + ".part", path)
+                    return received
+                error = f"{file['path']}: checksum mismatch"
+            except (OSError, urllib.error.URLError) as e:
+                if isinstance(e, InterruptedError):
+                    self.remove_part(path)
+                    raise
+                error = f"{file['path']}: {e}"
+            self.add_progress(-received)
+        self.remove_part(path)
+        raise ValueError(f"{manifest.get('name', manifest['id'])}: {error}")
+
+    @staticmethod
+    def remove_part(path):
+        try:
+            os.unlink(path + ".part")
+        except FileNotFoundError:
+            pass
+
+    def stage(self, mods):
+        items = self.plan(mods)
+        jobs = [(item, file) for item in items for file in item["manifest"].get("files", [])]
+        self.done_bytes = 0
+        self.total_bytes = sum(file["size"] for _, file in jobs)
+        downloaded = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self.fetch_file, item, file) for item, file in jobs]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    downloaded += future.result()
+            except BaseException:
+                self.cancel()
+                raise
+        for item in items:
+            manifest = item["manifest"]
+            wanted = {os.path.normpath(file["path"]) for file in manifest.get("files", [])}
+            for root, dirs, files in os.walk(item["staged"]):
+                for name in files:
+                    path = os.path.join(root, name)
+                    if os.path.relpath(path, item["staged"]) not in wanted:
+                        os.unlink(path)
+            os.makedirs(item["staged"], exist_ok=True)
+            if "meta" not in wanted:
+                meta = {"meta": {"id": manifest["id"], "name": manifest.get("name", "Unknown"),
+                                 "versions": [{"version": manifest["version"]}]}}
+                with open(os.path.join(item["staged"], "meta"), 'w') as f:
+                    json.dump(meta, f)
+        return items, downloaded
+
+    def commit(self, items):
+        # Only renames, so the server is down for as short as possible. If one
+        # fails, the swaps already made are undone and ValueError is raised, so
+        # the server starts on the old set. OSError means the undo failed too.
+        swapped = []
+        try:
+            for item in items:
+                old_dir = None
+                if os.path.exists(item["target"]):
+                    old_dir = os.path.join(self.staging_dir, ".old-" + os.path.basename(item["target"]))
+                    shutil.rmtree(old_dir, ignore_errors=True)
+                    os.replace(item["target"], old_dir)
+                try:
+                    os.replace(item["staged"], item["target"])
+                except OSError:
+                    if old_dir:
+                        os.replace(old_dir, item["target"])
+                    raise
+                swapped.append((item, old_dir))
+        except OSError as e:
+            self.rollback(swapped)
+            raise ValueError(f"{e} (previous mods restored)")
+        for _, old_dir in swapped:
+            if old_dir:
+                shutil.rmtree(old_dir, ignore_errors=True)
+        return len(items)
+
+    @staticmethod
+    def rollback(swapped):
+        for item, old_dir in reversed(swapped):
+            os.replace(item["target"], item["staged"])
+            if old_dir:
+                os.replace(old_dir, item["target"])
+
+class ModStageThread(QThread):
+    progress = pyqtSignal(str)
+    staged = pyqtSignal(object, int, str)
+
+    def __init__(self, stager, mods, parent=None):
+        super().__init__(parent)
+        self.stager = stager
+        self.stager.progress = self.progress.emit
+        self.mods = mods
+
+    def run(self):
+        try:
+            items, downloaded = self.stager.stage(self.mods)
+            self.staged.emit(items, downloaded, "")
+        except Exception as e:
+            self.staged.emit(None, 0, str(e))
+
+class Telemetry:
+    # Timing spans for user actions, timers and external commands, appended to
+    # ~/.arsc/trace.jsonl (rotated at 5 MB) so a slow GUI can be traced to
+    # systemctl, journalctl, a scan or Qt itself. Optional cProfile and tracemalloc captures.
+    MAX_BYTES = 5 * 1024 * 1024
+
+    def __init__(self, trace_file):
+        self.trace_file = trace_file
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.profiler = None
+        self.memory_started = None
+
+    @staticmethod
+    def command_name(argv):
+        words = [os.path.basename(argv[0])] + [arg for arg in argv[1:] if not arg.startswith("-")][:1]
+        return " ".join(words)
+
+    @contextlib.contextmanager
+    def span(self, kind, name, detail=None):
+        stack = self.local.__dict__.setdefault("stack", [])
+        info = {"ok": True}
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield info
+        except BaseException:
+            info["ok"] = False
+            raise
+        finally:
+            stack.pop()
+            self.record(kind, name, time.perf_counter() - start, info["ok"], detail, parent)
+
+    def record(self, kind, name, seconds, ok=True, detail=None, parent=None):
+        record = {"ts": round(time.time(), 3), "kind": kind, "name": name, "ms": round(seconds * 1000, 2), "ok": ok}
+        if detail:
+            record["detail"] = detail[:200]
+        if parent:
+            record["parent"] = parent
+        with self.lock:
+            try:
+                os.makedirs(os.path.dirname(self.trace_file), exist_ok=True)
+                if os.path.exists(self.trace_file) and os.path.getsize(self.trace_file) > self.MAX_BYTES:
+                    os.replace(self.trace_file, self.trace_file + ".1")
+                with open(self.trace_file, 'a') as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError:
+                pass
+
+    def read(self):
+        records = []
+        for trace_file in (self.trace_file + ".1", self.trace_file):
+            try:
+                with open(trace_file, 'r') as f:
+                    for line in f:
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                continue
+        return records
+
+    @staticmethod
+    def summary(records, limit=20):
+        totals = {}
+        for record in records:
+            key = (record["kind"], record["name"])
+            count, total, slowest, failed = totals.get(key, (0, 0.0, 0.0, 0))
+            totals[key] = (count + 1, total + record["ms"], max(slowest, record["ms"]), failed + (0 if record.get("ok", True) else 1))
+        lines = [f"{len(records)} spans recorded.", "", "Slowest operations (by worst time):",
+                 f"{'kind':<8} {'name':<36} {'count':>6} {'avg ms':>10} {'max ms':>10} {'failed':>6}"]
+        for (kind, name), (count, total, slowest, failed) in sorted(totals.items(), key=lambda item: item[1][2], reverse=True)[:limit]:
+            lines.append(f"{kind:<8} {name[:36]:<36} {count:>6} {total / count:>10.1f} {slowest:>10.1f} {failed:>6}")
+        lines += ["", "Slowest single spans:"]
+        for record in sorted(records, key=lambda record: record["ms"], reverse=True)[:limit]:
+            when = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record["ts"]))
+            lines.append(f"{when} {record['ms']:>10.1f} ms  {record['kind']} {record['name']}"
+                         + (f"  ({record['detail']})" if record.get("detail") else ""))
+        return "\n".join(lines)
+
+    def start_cpu_profile(self):
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop_cpu_profile(self, output_file, limit=30):
+        if self.profiler is None:
+            return ""
+        self.profiler.disable()
+        profiler, self.profiler = self.profiler, None
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        profiler.dump_stats(output_file)
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(limit)
+        return f"Saved to {output_file} (open with python3 -m pstats).\n" + report.getvalue()
+
+    def start_memory_trace(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self.memory_started = time.time()
+
+    def stop_memory_trace(self, output_file, limit=30):
+        if not tracemalloc.is_tracing():
+            return ""
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        lines = [f"Traced memory: {current / 1048576:.1f} MB now, {peak / 1048576:.1f} MB peak.", "", "Largest allocations by line:"]
+        lines += [str(stat) for stat in snapshot.statistics("lineno")[:limit]]
+        report = "\n".join(lines)
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        with open(output_file, 'w') as f:
+            f.write(report + "\n")
+        return f"Saved to {output_file}.\n" + report
+
+class CommandRunner:
+    # Runs argv lists without a shell, with a timeout per call and a limit on how
+    # many run at once. cancel() kills whatever is still running, e.g. on close.
+    def __init__(self, telemetry=None, max_running=4, timeout=30):
+        self.telemetry = telemetry
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(max_running)
+        self.lock = threading.Lock()
+        self.running = set()
+        self.cancelled = False
+
+    def run(self, argv, timeout=None, input=None):
+        timeout = timeout or self.timeout
+        if self.telemetry is None:
+            return self.execute(argv, timeout, input)
+        with self.telemetry.span("command", Telemetry.command_name(argv), detail=shlex.join(argv)) as span:
+            success, output = self.execute(argv, timeout, input)
+            span["ok"] = success
+            return success, output
+
+    def execute(self, argv, timeout, input):
+        with self.slots:
+            with self.lock:
+                if self.cancelled:
+                    return False, "Cancelled."
+                try:
+                    process = subprocess.Popen(argv, stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+                                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+                except OSError as e:
+                    return False, f"Cannot run {argv[0]}: {e}"
+                self.running.add(process)
+            try:
+                stdout, stderr = process.communicate(input, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                return False, f"{shlex.join(argv)} timed out after {timeout}s."
+            finally:
+                with self.lock:
+                    self.running.discard(process)
+            if process.returncode < 0 and self.cancelled:
+                return False, "Cancelled."
+            return process.returncode == 0, stdout + stderr
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            for process in self.running:
+                process.kill()
+
+class CommandThread(QThread):
+    # Runs the commands in turn until one succeeds (systemctl --user, then the
+    # system instance), so start/stop/restart never block the UI.
+    done = pyqtSignal(bool, str)
+
+    def __init__(self, runner, commands, timeout=None, parent=None):
+        super().__init__(parent)
+        self.runner = runner
+        self.commands = commands
+        self.timeout = timeout
+
+    def run(self):
+        success, output = False, ""
+        for argv in self.commands:
+            success, output = self.runner.run(argv, self.timeout)
+            if success:
+                break
+        self.done.emit(success, output)
+
+class MetricsCollector:
+    # Collects unit, process, -logStats and mod figures in one place so the
+    # GUI and the exporter read the same numbers without running extra commands.
+    UNIT_STATES = ("active", "reloading", "inactive", "failed", "activating", "deactivating")
+    FPS_PATTERN = re.compile(r'\bFPS:\s*([\d.]+)')
+    PLAYERS_PATTERN = re.compile(r'\bPlayers?:\s*(\d+)')
+    AI_PATTERN = re.compile(r'\bAI:\s*(\d+)')
+    STATS_MAX_AGE = 180
+    HISTORY_MAX_BYTES = 5 * 1024 * 1024
+
+    def __init__(self, history_file=None, max_samples=5760):
+        self.lock = threading.Lock()
+        self.history_file = history_file
+        self.samples = deque(maxlen=max_samples)
+        self.unit = {"state": "unknown", "main_pid": 0, "restarts": 0, "cgroup": "", "started": ""}
+        self.process = {"cpu_seconds": None, "cpu_percent": None, "rss_bytes": None, "started_at": None}
+        self.boot_time = None
+        self.stats = {"fps": None, "players": None, "ai": None, "timestamp": None}
+        self.mods = {"active": 0, "installed": 0, "disk_bytes": 0}
+        self.control_restarts = 0
+        self.last_cpu_reading = None
+        self.probes = {}
+        self.probe_history = {}
+        self.network = None
+
+    def update_unit(self, show_output):
+        props = {}
+        for line in show_output.splitlines():
+            key, sep, value = line.partition("=")
+            if sep:
+                props[key.strip()] = value.strip()
+        try:
+            main_pid = int(props.get("MainPID", 0))
+            restarts = int(props.get("NRestarts", 0))
+        except ValueError:
+            main_pid, restarts = 0, 0
+        with self.lock:
+            self.unit = {
+                "state": props.get("ActiveState", "unknown"),
+                "main_pid": main_pid,
+                "restarts": restarts,
+                "cgroup": props.get("ControlGroup", ""),
+                "started": props.get("ExecMainStartTimestamp", ""),
+            }
+        self.update_process()
+
+    def update_process(self):
+        cgroup, main_pid = self.unit["cgroup"], self.unit["main_pid"]
+        pids = []
+        cpu_seconds = None
+        if cgroup:
+            cgroup_dir = os.path.join("/sys/fs/cgroup", cgroup.lstrip("/"))
+            try:
+                with open(os.path.join(cgroup_dir, "cgroup.procs")) as f:
+                    pids = [int(pid) for pid in f.read().split()]
+                with open(os.path.join(cgroup_dir, "cpu.stat")) as f:
+                    for line in f:
+                        key, _, value = line.partition(" ")
+                        if key == "usage_usec":
+                            cpu_seconds = int(value) / 1000000
+            except (OSError, ValueError):
+                pass
+        if not pids and main_pid:
+            pids = [main_pid]
+        rss_bytes = 0
+        cpu_ticks = 0
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/statm") as f:
+                    rss_bytes += int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+                with open(f"/proc/{pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                    cpu_ticks += int(fields[11]) + int(fields[12])
+            except (OSError, ValueError, IndexError):
+                continue
+        if cpu_seconds is None and pids:
+            cpu_seconds = cpu_ticks / os.sysconf("SC_CLK_TCK")
+        started_at = self.process_start_time(main_pid) if main_pid else None
+        now = time.monotonic()
+        cpu_percent = None
+        if cpu_seconds is not None and self.last_cpu_reading:
+            last_time, last_seconds = self.last_cpu_reading
+            if now > last_time and cpu_seconds >= last_seconds:
+                cpu_percent = (cpu_seconds - last_seconds) / (now - last_time) * 100
+        self.last_cpu_reading = (now, cpu_seconds) if cpu_seconds is not None else None
+        with self.lock:
+            self.process = {
+                "cpu_seconds": cpu_seconds,
+                "cpu_percent": cpu_percent,
+                "rss_bytes": rss_bytes if pids else None,
+                "started_at": started_at,
+            }
+
+    def process_start_time(self, pid):
+        try:
+            if self.boot_time is None:
+                with open("/proc/stat") as f:
+                    for line in f:
+                        if line.startswith("btime "):
+                            self.boot_time = int(line.split()[1])
+            with open(f"/proc/{pid}/stat") as f:
+                start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+            return round(self.boot_time + start_ticks / os.sysconf("SC_CLK_TCK"))
+        except (OSError, ValueError, IndexError, TypeError):
+            return None
+
+    def ingest_log_line(self, line):
+        fps_match = self.FPS_PATTERN.search(line)
+        if not fps_match:
+            return False
+        players_match = self.PLAYERS_PATTERN.search(line)
+        ai_match = self.AI_PATTERN.search(line)
+        with self.lock:
+            self.stats = {
+                "fps": float(fps_match.group(1)),
+                "players": int(players_match.group(1)) if players_match else self.stats["players"],
+                "ai": int(ai_match.group(1)) if ai_match else self.stats["ai"],
+                "timestamp": time.time(),
+            }
+        return True
+
+    def update_mods(self, active, installed):
+        with self.lock:
+            self.mods = dict(self.mods, active=active, installed=installed)
+
+    def update_disk_usage(self, disk_bytes):
+        with self.lock:
+            self.mods = dict(self.mods, disk_bytes=disk_bytes)
+
+    @staticmethod
+    def disk_usage(path):
+        total = 0
+        for root, dirs, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+        return total
+
+    def record_control_restart(self):
+        with self.lock:
+            self.control_restarts += 1
+
+    def record_sample(self):
+        now = time.time()
+        with self.lock:
+            stats_fresh = (self.unit["state"] == "active" and self.stats["timestamp"] is not None
+                           and now - self.stats["timestamp"] <= self.STATS_MAX_AGE)
+            sample = {
+                "ts": round(now, 3),
+                "state": self.unit["state"],
+                "pid": self.unit["main_pid"] or None,
+                "started": self.unit["started"] or None,
+                "cpu": self.process["cpu_percent"],
+                "rss": self.process["rss_bytes"],
+                "fps": self.stats["fps"] if stats_fresh else None,
+                "players": self.stats["players"] if stats_fresh else None,
+                "ai": self.stats["ai"] if stats_fresh else None,
+            }
+            probe = next(iter(self.probes.values()), None)
+            if probe:
+                sample["a2s_ms"] = probe["latency_ms"]
+                sample["a2s_players"] = probe["players"]
+            self.samples.append(sample)
+        self.append_history(sample)
+        return sample
+
+    def append_history(self, record, history_file=None):
+        history_file = history_file or self.history_file
+        if not history_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(history_file), exist_ok=True)
+            if os.path.exists(history_file) and os.path.getsize(history_file) > self.HISTORY_MAX_BYTES:
+                os.replace(history_file, history_file + ".1")
+            with open(history_file, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
+
+    def read_history(self, since=None):
+        samples = []
+        for history_file in (self.history_file + ".1", self.history_file) if self.history_file else ():
+            try:
+                with open(history_file, 'r') as f:
+                    for line in f:
+                        try:
+                            sample = json.loads(line)
+                        except ValueError:
+                            continue
+                        if since is None or sample.get("ts", 0) >= since:
+                            samples.append(sample)
+            except OSError:
+                continue
+        return samples
+
+    def update_probes(self, results):
+        with self.lock:
+            for result in results:
+                self.probes[result["target"]] = result
+                history = self.probe_history.setdefault(result["target"], deque(maxlen=2880))
+                history.append((result["ts"], result["latency_ms"], result["players"], result["map"]))
+        if self.history_file:
+            probe_file = os.path.join(os.path.dirname(self.history_file), "a2s.jsonl")
+            for result in results:
+                self.append_history(result, probe_file)
+
+    def update_network(self, sample):
+        with self.lock:
+            self.network = sample
+
+    def primary_probe(self):
+        with self.lock:
+            return next(iter(self.probes.values()), None)
+
+    def clear_probes(self):
+        with self.lock:
+            self.probes = {}
+
+    def summary(self):
+        with self.lock:
+            unit, process, stats = dict(self.unit), dict(self.process), dict(self.stats)
+        parts = [f"State: {unit['state']}"]
+        if process["cpu_percent"] is not None:
+            parts.append(f"CPU: {process['cpu_percent']:.1f}%")
+        if process["rss_bytes"] is not None:
+            parts.append(f"RSS: {process['rss_bytes'] / 1048576:.0f} MB")
+        if stats["fps"] is not None:
+            parts.append(f"FPS: {stats['fps']:.1f}")
+        if stats["players"] is not None:
+            parts.append(f"Players: {stats['players']}")
+        parts.append(f"Restarts: {unit['restarts']}")
+        probe = self.primary_probe()
+        if probe:
+            parts.append(A2SProbe.describe(probe))
+        return " | ".join(parts)
+
+    def render(self, openmetrics=False):
+        with self.lock:
+            unit, process, stats, mods = dict(self.unit), dict(self.process), dict(self.stats), dict(self.mods)
+            control_restarts = self.control_restarts
+            probes = list(self.probes.values())
+            network = self.network
+        lines = []
+
+        def escape(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        def metric(name, metric_type, help_text, values):
+            family = name[:-len("_total")] if openmetrics and name.endswith("_total") else name
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {metric_type}")
+            for labels, value in values:
+                label_text = ",".join(f'{key}="{escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        metric("arma_unit_up", "gauge", "Whether the systemd unit is active.",
+               [({}, 1 if unit["state"] == "active" else 0)])
+        metric("arma_unit_state", "gauge", "Current systemd ActiveState of the unit.",
+               [({"state": state}, 1 if unit["state"] == state else 0) for state in self.UNIT_STATES])
+        metric("arma_unit_restarts_total", "counter", "Automatic restarts performed by systemd (NRestarts).",
+               [({}, unit["restarts"])])
+        metric("arma_control_restarts_total", "counter", "Restarts requested through this control tool.",
+               [({}, control_restarts)])
+        if process["cpu_seconds"] is not None:
+            metric("arma_process_cpu_seconds_total", "counter", "CPU time consumed by the server processes.",
+                   [({}, round(process["cpu_seconds"], 3))])
+        if process["rss_bytes"] is not None:
+            metric("arma_process_resident_memory_bytes", "gauge", "Resident memory of the server processes.",
+                   [({}, process["rss_bytes"])])
+        if stats["fps"] is not None:
+            metric("arma_server_fps", "gauge", "Server FPS reported by -logStats.", [({}, stats["fps"])])
+            metric("arma_server_stats_timestamp_seconds", "gauge", "Time the last -logStats line was read.",
+                   [({}, round(stats["timestamp"], 3))])
+        if stats["players"] is not None:
+            metric("arma_server_players", "gauge", "Connected players reported by -logStats.", [({}, stats["players"])])
+        if stats["ai"] is not None:
+            metric("arma_server_ai", "gauge", "AI characters reported by -logStats.", [({}, stats["ai"])])
+        metric("arma_mods_active", "gauge", "Mods enabled in server.json.", [({}, mods["active"])])
+        metric("arma_mods_installed", "gauge", "Mods installed in the addons directory.", [({}, mods["installed"])])
+        metric("arma_addons_disk_bytes", "gauge", "Disk space used by the addons directory.", [({}, mods["disk_bytes"])])
+        if network:
+            open_ports = [(port, socket) for port, socket in sorted(network["ports"].items()) if socket["open"]]
+            if open_ports:
+                metric("arma_udp_receive_queue_bytes", "gauge", "Bytes waiting in the receive queue of the server's UDP socket.",
+                       [({"port": port}, socket["rx_queue"]) for port, socket in open_ports])
+                metric("arma_udp_socket_drops_total", "counter", "Packets dropped by the server's UDP socket.",
+                       [({"port": port}, socket["drops_total"]) for port, socket in open_ports])
+            if network.get("rcvbuf_errors_total") is not None:
+                metric("arma_udp_rcvbuf_errors_total", "counter", "UDP receive buffer errors on the host (RcvbufErrors).",
+                       [({}, network["rcvbuf_errors_total"])])
+        if probes:
+            metric("arma_a2s_up", "gauge", "Whether the last A2S query was answered.",
+                   [({"target": probe["target"]}, 1 if probe["ok"] else 0) for probe in probes])
+            answered = [probe for probe in probes if probe["ok"]]
+            if answered:
+                metric("arma_a2s_latency_seconds", "gauge", "Round trip time of the last A2S query.",
+                       [({"target": probe["target"]}, round(probe["latency_ms"] / 1000, 6)) for probe in answered])
+                metric("arma_a2s_players", "gauge", "Players reported by A2S.",
+                       [({"target": probe["target"]}, probe["players"]) for probe in answered])
+                metric("arma_a2s_max_players", "gauge", "Player slots reported by A2S.",
+                       [({"target": probe["target"]}, probe["max_players"]) for probe in answered])
+                metric("arma_a2s_info", "gauge", "Map reported by A2S.",
+                       [({"target": probe["target"], "map": probe["map"]}, 1) for probe in answered])
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+class DiskUsageThread(QThread):
+    # A full walk of the addons tree takes seconds with a few hundred mods.
+    measured = pyqtSignal(object)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+
+    def run(self):
+        self.measured.emit(MetricsCollector.disk_usage(self.path))
+
+class NetworkSampler:
+    # UDP socket health of the server ports from /proc, plus the unit's IP
+    # accounting counters when systemd provides them (IPAccounting=yes, system
+    # units only). The last hour of samples is kept so lag reports can be lined up with drops.
+    SYSCTLS = ("net.core.rmem_max", "net.core.rmem_default", "net.core.wmem_max", "net.core.netdev_max_backlog")
+    IP_PROPERTIES = ("IPIngressBytes", "IPEgressBytes", "IPIngressPackets", "IPEgressPackets")
+    MIN_BUFFER = 4 * 1048576
+
+    def __init__(self, proc_dir="/proc", max_samples=240):
+        self.proc_dir = proc_dir
+        self.samples = deque(maxlen=max_samples)
+        self.last = None
+
+    def read_sockets(self, ports):
+        sockets = {port: {"rx_queue": 0, "tx_queue": 0, "drops": 0, "count": 0} for port in ports}
+        for name in ("udp", "udp6"):
+            try:
+                with open(os.path.join(self.proc_dir, "net", name)) as f:
+                    next(f, None)
+                    for line in f:
+                        fields = line.split()
+                        try:
+                            port = int(fields[1].rsplit(":", 1)[1], 16)
+                            if port not in sockets:
+                                continue
+                            tx_queue, rx_queue = (int(value, 16) for value in fields[4].split(":"))
+                            drops = int(fields[12])
+                        except (IndexError, ValueError):
+                            continue
+                        socket = sockets[port]
+                        socket["rx_queue"] = max(socket["rx_queue"], rx_queue)
+                        socket["tx_queue"] = max(socket["tx_queue"], tx_queue)
+                        socket["drops"] += drops
+                        socket["count"] += 1
+            except OSError:
+                continue
+        return sockets
+
+    def read_snmp(self):
+        try:
+            with open(os.path.join(self.proc_dir, "net", "snmp")) as f:
+                rows = [line.split() for line in f if line.startswith("Udp:")]
+            return {key: int(value) for key, value in zip(rows[0][1:], rows[1][1:])}
+        except (OSError, IndexError, ValueError):
+            return {}
+
+    def read_softnet_drops(self):
+        # Second column of softnet_stat: packets dropped because the backlog queue was full.
+        try:
+            with open(os.path.join(self.proc_dir, "net", "softnet_stat")) as f:
+                return sum(int(line.split()[1], 16) for line in f if line.strip())
+        except (OSError, IndexError, ValueError):
+            return None
+
+    def read_sysctls(self):
+        values = {}
+        for name in self.SYSCTLS:
+            try:
+                with open(os.path.join(self.proc_dir, "sys", *name.split("."))) as f:
+                    values[name] = int(f.read().split()[0])
+            except (OSError, IndexError, ValueError):
+                continue
+        return values
+
+    @classmethod
+    def parse_ip_accounting(cls, show_output):
+        props = {}
+        for line in show_output.splitlines():
+            key, sep, value = line.partition("=")
+            if sep and key.strip() in cls.IP_PROPERTIES:
+                try:
+                    props[key.strip()] = int(value)
+                except ValueError:
+                    return None
+        # Unset counters read as [not set] or UINT64_MAX.
+        if len(props) != len(cls.IP_PROPERTIES) or any(value >= 2 ** 64 - 1 for value in props.values()):
+            return None
+        return props
+
+    def sample(self, ports, ip_accounting=None):
+        now = time.monotonic()
+        current = {
+            "sockets": self.read_sockets(ports),
+            "snmp": self.read_snmp(),
+            "softnet_drops": self.read_softnet_drops(),
+            "ip": ip_accounting,
+        }
+        sample = {"ts": round(time.time(), 3), "ports": {}, "alerts": [], "source": "unit" if ip_accounting else "host"}
+        last, elapsed = self.last, None
+        if last and now > last["time"]:
+            elapsed = now - last["time"]
+
+        def delta(new, old):
+            return new - old if new is not None and old is not None and new >= old else None
+
+        def rate(new, old):
+            change = delta(new, old)
+            return change / elapsed if change is not None and elapsed else None
+
+        if ip_accounting:
+            old_ip = last["ip"] if last and last["ip"] else {}
+            sample["rx_pps"] = rate(ip_accounting["IPIngressPackets"], old_ip.get("IPIngressPackets"))
+            sample["tx_pps"] = rate(ip_accounting["IPEgressPackets"], old_ip.get("IPEgressPackets"))
+            sample["rx_bps"] = rate(ip_accounting["IPIngressBytes"], old_ip.get("IPIngressBytes"))
+            sample["tx_bps"] = rate(ip_accounting["IPEgressBytes"], old_ip.get("IPEgressBytes"))
+        else:
+            old_snmp = last["snmp"] if last else {}
+            sample["rx_pps"] = rate(current["snmp"].get("InDatagrams"), old_snmp.get("InDatagrams"))
+            sample["tx_pps"] = rate(current["snmp"].get("OutDatagrams"), old_snmp.get("OutDatagrams"))
+        old_snmp = last["snmp"] if last else {}
+        sample["rcvbuf_errors"] = delta(current["snmp"].get("RcvbufErrors"), old_snmp.get("RcvbufErrors"))
+        sample["rcvbuf_errors_total"] = current["snmp"].get("RcvbufErrors")
+        sample["sndbuf_errors"] = delta(current["snmp"].get("SndbufErrors"), old_snmp.get("SndbufErrors"))
+        sample["softnet_drops"] = delta(current["softnet_drops"], last["softnet_drops"] if last else None)
+        for port, socket in current["sockets"].items():
+            old_socket = last["sockets"].get(port) if last else None
+            drops = delta(socket["drops"], old_socket["drops"]) if old_socket and old_socket["count"] else None
+            sample["ports"][port] = {"open": socket["count"] > 0, "rx_queue": socket["rx_queue"],
+                                     "tx_queue": socket["tx_queue"], "drops": drops, "drops_total": socket["drops"]}
+            if drops:
+                sample["alerts"].append(f"UDP port {port} dropped {drops} packet(s), its receive buffer was full.")
+        if sample["rcvbuf_errors"]:
+            sample["alerts"].append(f"{sample['rcvbuf_errors']} UDP receive buffer error(s) on this host (RcvbufErrors).")
+        if sample["softnet_drops"]:
+            sample["alerts"].append(f"{sample['softnet_drops']} packet(s) dropped by the kernel backlog (netdev_max_backlog).")
+        current["time"] = now
+        self.last = current
+        self.samples.append(sample)
+        return sample
+
+    def suggestions(self):
+        # Size the receive buffer to hold a quarter second of the busiest ingress
+        # seen, doubled because the kernel counts packet overhead against it.
+        sysctls = self.read_sysctls()
+        samples = list(self.samples)
+        peak_bps = max((sample.get("rx_bps") or 0 for sample in samples), default=0)
+        peak_pps = max((sample.get("rx_pps") or 0 for sample in samples), default=0)
+        if not peak_bps and peak_pps:
+            peak_bps = peak_pps * 1400
+        # Socket drops are also counted in the host's RcvbufErrors, take the larger one.
+        drops = sum(max(sample.get("rcvbuf_errors") or 0, sum(port["drops"] or 0 for port in sample["ports"].values()))
+                    for sample in samples)
+        peak_queue = max((port["rx_queue"] for sample in samples for port in sample["ports"].values()), default=0)
+        backlog_drops = sum(sample.get("softnet_drops") or 0 for sample in samples)
+        wanted = max(self.MIN_BUFFER, int(peak_bps * 0.25 * 2))
+        wanted = -(-wanted // 1048576) * 1048576
+        advice = []
+        default = sysctls.get("net.core.rmem_default")
+        if default is not None and (drops or peak_queue > default / 2) and default < wanted:
+            reason = (f"{drops} packet(s) were dropped" if drops else f"the receive queue reached {peak_queue // 1024} KB, over half the buffer")
+            advice.append(("net.core.rmem_default", default, wanted,
+                           f"{reason} in the last {len(samples)} samples. The server does not ask for a bigger socket buffer, "
+                           f"so it gets rmem_default. {wanted // 1048576} MB holds a quarter second of the peak ingress "
+                           f"({peak_bps / 1048576:.1f} MB/s, {peak_pps:.0f} packets/s) with room for kernel overhead."))
+        maximum = sysctls.get("net.core.rmem_max")
+        if maximum is not None and advice and maximum < wanted:
+            advice.append(("net.core.rmem_max", maximum, wanted,
+                           "rmem_max caps what any socket can be given, it has to be at least rmem_default."))
+        backlog = sysctls.get("net.core.netdev_max_backlog")
+        if backlog is not None and backlog_drops:
+            advice.append(("net.core.netdev_max_backlog", backlog, max(backlog * 2, 5000),
+                           f"{backlog_drops} packet(s) were dropped before reaching any socket because the per-CPU "
+                           "backlog queue was full; a longer queue absorbs bursts from many clients."))
+        return advice
+
+    @staticmethod
+    def describe(sample):
+        if not sample:
+            return "No network samples yet."
+        parts = []
+        scope = "server" if sample["source"] == "unit" else "host UDP"
+        if sample.get("rx_pps") is not None:
+            parts.append(f"{scope} in {sample['rx_pps']:.0f} pkt/s, out {sample['tx_pps']:.0f} pkt/s")
+        if sample.get("rx_bps") is not None:
+            parts.append(f"{sample['rx_bps'] / 1024:.0f} KB/s in, {sample['tx_bps'] / 1024:.0f} KB/s out")
+        for port, socket in sorted(sample["ports"].items()):
+            if socket["open"]:
+                parts.append(f"port {port}: queue {socket['rx_queue'] // 1024} KB, drops {socket['drops_total']}")
+            else:
+                parts.append(f"port {port}: not listening")
+        if sample.get("rcvbuf_errors") is not None:
+            parts.append(f"RcvbufErrors +{sample['rcvbuf_errors']}")
+        return " | ".join(parts)
+
+    @staticmethod
+    def sysctl_file(advice):
+        lines = ["# /etc/sysctl.d/60-arma-reforger.conf, apply with: sudo sysctl --system"]
+        lines += [f"{name} = {value}" for name, _, value, _ in advice]
+        return "\n".join(lines) + "\n"
+
+class LogFilter:
+    # Severity of a journal line and the filter bar settings, compiled once.
+    # Reforger tags lines "(E)" / "(W)"; systemd and the engine also print ERROR/WARNING.
+    LEVELS = ("error", "warning", "info", "stats")
+    ERROR_PATTERN = re.compile(r'\((?:E|F)\)|\b(?:ERROR|FATAL|Segmentation fault|core dumped)\b|Failed with result')
+    WARNING_PATTERN = re.compile(r'\(W\)|\bWARNING\b')
+    STATS_PATTERN = MetricsCollector.FPS_PATTERN
+
+    def __init__(self, levels=LEVELS, pattern="", mod_terms=()):
+        self.levels = frozenset(levels)
+        self.regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+        terms = [re.escape(term) for term in mod_terms if term]
+        self.mod_regex = re.compile("|".join(terms), re.IGNORECASE) if terms else None
+
+    @classmethod
+    def level(cls, line):
+        if cls.ERROR_PATTERN.search(line):
+            return "error"
+        if cls.WARNING_PATTERN.search(line):
+            return "warning"
+        if cls.STATS_PATTERN.search(line):
+            return "stats"
+        return "info"
+
+    def is_all(self):
+        return self.regex is None and self.mod_regex is None and len(self.levels) == len(self.LEVELS)
+
+    def matches(self, line, level):
+        return (level in self.levels
+                and (self.regex is None or self.regex.search(line) is not None)
+                and (self.mod_regex is None or self.mod_regex.search(line) is not None))
+
+    def select(self, lines, levels, start, end, cancelled=lambda: False):
+        if self.is_all():
+            return list(range(start, end))
+        matches = self.matches
+        selected = []
+        for index in range(start, end):
+            if matches(lines[index], levels[index]):
+                selected.append(index)
+            if index % 65536 == 0 and cancelled():
+                return None
+        return selected
+
+class LogFilterThread(QThread):
+    filtered = pyqtSignal(int, object, int)
+
+    def __init__(self, log_filter, lines, levels, end, generation, parent=None):
+        super().__init__(parent)
+        self.log_filter = log_filter
+        self.lines = lines
+        self.levels = levels
+        self.end = end
+        self.generation = generation
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        selected = self.log_filter.select(self.lines, self.levels, 0, self.end, lambda: self.cancelled)
+        if selected is not None:
+            self.filtered.emit(self.generation, selected, self.end)
+
+class LogModel(QAbstractListModel):
+    # Keeps every journal line but only exposes the rows that pass the filter;
+    # the list view asks for the rows on screen, so a long log stays cheap to show.
+    # Refiltering runs on a LogFilterThread, lines that arrive meanwhile are caught up after.
+    MAX_LINES = 1000000
+    COLORS = {"error": QColor(230, 60, 60), "warning": QColor(230, 150, 0)}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.lines = []
+        self.levels = []
+        self.visible = []
+        self.log_filter = LogFilter()
+        self.generation = 0
+        self.filter_thread = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.visible[index.row()]
+        if role == Qt.DisplayRole:
+            return self.lines[row]
+        if role == Qt.ForegroundRole:
+            return self.COLORS.get(self.levels[row])
+        return None
+
+    def append_lines(self, lines):
+        start = len(self.lines)
+        self.lines.extend(lines)
+        self.levels.extend(LogFilter.level(line) for line in lines)
+        if len(self.lines) > self.MAX_LINES:
+            self.trim(len(self.lines) - self.MAX_LINES + self.MAX_LINES // 10)
+            return
+        if self.filter_thread and self.filter_thread.generation == self.generation and self.filter_thread.isRunning():
+            return
+        self.show_rows(self.log_filter.select(self.lines, self.levels, start, len(self.lines)))
+
+    def show_rows(self, rows):
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.visible), len(self.visible) + len(rows) - 1)
+            self.visible.extend(rows)
+            self.endInsertRows()
+
+    def trim(self, count):
+        # Rows point into self.lines, shift them with it before the view asks for data again.
+        self.beginResetModel()
+        self.lines = self.lines[count:]
+        self.levels = self.levels[count:]
+        self.visible = [row - count for row in self.visible if row >= count]
+        self.endResetModel()
+        self.set_filter(self.log_filter)
+
+    def clear(self):
+        self.stop()
+        self.beginResetModel()
+        self.generation += 1
+        self.lines = []
+        self.levels = []
+        self.visible = []
+        self.endResetModel()
+
+    def set_filter(self, log_filter):
+        self.log_filter = log_filter
+        self.generation += 1
+        if self.filter_thread and self.filter_thread.isRunning():
+            self.filter_thread.cancel()
+        self.filter_thread = LogFilterThread(log_filter, self.lines, self.levels, len(self.lines), self.generation, self)
+        self.filter_thread.filtered.connect(self.filter_done)
+        self.filter_thread.start()
+
+    def filter_done(self, generation, rows, end):
+        if generation != self.generation:
+            return
+        self.beginResetModel()
+        self.visible = rows
+        self.endResetModel()
+        self.show_rows(self.log_filter.select(self.lines, self.levels, end, len(self.lines)))
+
+    def stop(self):
+        if self.filter_thread and self.filter_thread.isRunning():
+            self.filter_thread.cancel()
+            self.filter_thread.wait(2000)
+
+class TrendWatchdog:
+    # Fits a least-squares line to the RSS and FPS samples of the current run
+    # and projects it forward, so a restart can be planned before the limit is hit.
+    def __init__(self, rss_limit_mb=12000, fps_floor=20, window_minutes=120, horizon_minutes=60, min_points=20):
+        self.rss_limit_bytes = rss_limit_mb * 1048576
+        self.fps_floor = fps_floor
+        self.window_seconds = window_minutes * 60
+        self.horizon_seconds = horizon_minutes * 60
+        self.min_points = min_points
+
+    @staticmethod
+    def linear_fit(points):
+        n = len(points)
+        mean_x = sum(x for x, _ in points) / n
+        mean_y = sum(y for _, y in points) / n
+        var_x = sum((x - mean_x) ** 2 for x, _ in points)
+        if var_x == 0:
+            return 0.0, mean_y
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+        return slope, mean_y - slope * mean_x
+
+    @staticmethod
+    def restarted(previous, sample):
+        # arma.service uses Restart=always, so systemd brings the server back after
+        # any exit; when that happens between two samples no inactive sample is
+        # recorded, a new main PID or start time still ends the run.
+        return any(previous.get(key) and sample.get(key) and previous[key] != sample[key] for key in ("pid", "started"))
+
+    def current_run(self, samples):
+        # Only samples since the server last came up belong to the same trend.
+        run = []
+        for sample in samples:
+            if sample.get("state") != "active":
+                run = []
+            else:
+                if run and self.restarted(run[-1], sample):
+                    run = []
+                run.append(sample)
+        if run:
+            window_start = run[-1]["ts"] - self.window_seconds
+            run = [sample for sample in run if sample["ts"] >= window_start]
+        return run
+
+    def project(self, run, key):
+        points = [(sample["ts"], sample[key]) for sample in run if sample.get(key) is not None]
+        if len(points) < self.min_points:
+            return None
+        origin = points[0][0]
+        slope, intercept = self.linear_fit([(x - origin, y) for x, y in points])
+        last_x = points[-1][0] - origin
+        return slope, intercept + slope * last_x, intercept + slope * (last_x + self.horizon_seconds)
+
+    def evaluate(self, samples):
+        run = self.current_run(samples)
+        reasons = []
+        horizon = self.horizon_seconds // 60
+        rss = self.project(run, "rss")
+        if rss and rss[0] > 0 and rss[2] >= self.rss_limit_bytes:
+            reasons.append(
+                f"RSS growing {rss[0] * 3600 / 1048576:.0f} MB/h, now {rss[1] / 1048576:.0f} MB, "
+                f"projected {rss[2] / 1048576:.0f} MB in {horizon} min (limit {self.rss_limit_bytes / 1048576:.0f} MB)"
+            )
+        fps = self.project(run, "fps")
+        if fps and fps[0] < 0 and fps[2] <= self.fps_floor:
+            reasons.append(
+                f"FPS falling {-fps[0] * 3600:.1f}/h, now {fps[1]:.1f}, "
+                f"projected {fps[2]:.1f} in {horizon} min (floor {self.fps_floor})"
+            )
+        return reasons
+
+    def replay(self, samples):
+        # Feeds recorded samples one at a time and reports the first trigger of each run.
+        triggers = []
+        seen = []
+        triggered_run = False
+        for sample in samples:
+            if sample.get("state") != "active":
+                seen = []
+                triggered_run = False
+                continue
+            if seen and self.restarted(seen[-1], sample):
+                seen = []
+                triggered_run = False
+            seen.append(sample)
+            while seen[0]["ts"] < sample["ts"] - self.window_seconds:
+                seen.pop(0)
+            if triggered_run:
+                continue
+            reasons = self.evaluate(seen)
+            if reasons:
+                triggers.append((sample["ts"], reasons))
+                triggered_run = True
+        return triggers
+
+class CapacityPlanner:
+    # Joins every -logStats sample with the server.json/start.sh that was running
+    # at the time, fits FPS as a linear function of load and settings, and walks
+    # the settings to the values that keep the predicted FPS at peak load above a target.
+    # CPU is fitted the same way and keeps a recommendation below saturation.
+    # Only values that were actually run are recommended, the model does not extrapolate.
+    TERMS = [
+        ("players", "players"),
+        ("ai", "AI"),
+        ("view_km", "Max View Distance (per 1000 m)"),
+        ("network_km", "Network View Distance (per 1000 m)"),
+        ("network_players", "Network View Distance x players"),
+        ("long_jobs", "-rplEncodeAsLongJobs"),
+        ("navmesh", "-disableNavmeshStreaming"),
+    ]
+    DISTANCE_STEP = 250
+    RIDGE = 1e-3
+    MIN_SAMPLES = 30
+
+    def __init__(self, target_fps=30, peak_players=None, margin=1.0, cpu_limit=None):
+        self.target_fps = target_fps
+        self.peak_players = peak_players
+        self.margin = margin
+        # Percent of one core like the recorded samples, default 90% of every core.
+        self.cpu_limit = cpu_limit or (os.cpu_count() or 1) * 90
+
+    @staticmethod
+    def settings_from(config, start_params):
+        game_properties = (config or {}).get("game", {}).get("gameProperties", {})
+        start_params = start_params or {}
+
+        def number(value):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+        return {
+            "serverMaxViewDistance": number(game_properties.get("serverMaxViewDistance")) or 1600,
+            "networkViewDistance": number(game_properties.get("networkViewDistance")) or 1500,
+            "maxPlayers": number((config or {}).get("game", {}).get("maxPlayers")),
+            "maxFPS": number(start_params.get("maxFPS")),
+            "aiLimit": number(start_params.get("aiLimit")),
+            "rplEncodeAsLongJobs": start_params.get("rplEncodeAsLongJobs") is True,
+            "disableNavmeshStreaming": start_params.get("disableNavmeshStreaming") is True,
+        }
+
+    @staticmethod
+    def features(settings, players, ai):
+        return {
+            "players": players,
+            "ai": ai,
+            "view_km": settings["serverMaxViewDistance"] / 1000,
+            "network_km": settings["networkViewDistance"] / 1000,
+            "network_players": settings["networkViewDistance"] / 1000 * players,
+            "long_jobs": 1.0 if settings["rplEncodeAsLongJobs"] else 0.0,
+            "navmesh": 1.0 if settings["disableNavmeshStreaming"] else 0.0,
+        }
+
+    def build_rows(self, samples, timeline):
+        # Samples at the -maxFPS cap say nothing about cost, the server was idling.
+        changes = sorted(timeline, key=lambda change: change[0])
+        current = {"server.json": None, "start.sh": None}
+        settings = None
+        position = 0
+        rows = []
+        capped = 0
+        for sample in sorted(samples, key=lambda sample: sample.get("ts", 0)):
+            if position < len(changes) and changes[position][0] <= sample["ts"]:
+                while position < len(changes) and changes[position][0] <= sample["ts"]:
+                    _, file_name, doc = changes[position]
+                    current[file_name] = StartScript.parse(doc) if file_name == "start.sh" else doc
+                    position += 1
+                if current["server.json"] is not None and current["start.sh"] is not None:
+                    settings = self.settings_from(current["server.json"], current["start.sh"])
+            # Samples from before the history knew both files cannot be tied to settings.
+            if settings is None or sample.get("state") != "active" or sample.get("fps") is None or sample.get("players") is None:
+                continue
+            if settings["maxFPS"] and sample["fps"] >= settings["maxFPS"] * 0.95:
+                capped += 1
+                continue
+            rows.append((settings, sample))
+        return rows, capped
+
+    @staticmethod
+    def solve(matrix, vector):
+        size = len(vector)
+        rows = [matrix[i][:] + [vector[i]] for i in range(size)]
+        for column in range(size):
+            pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+            if abs(rows[pivot][column]) < 1e-12:
+                return None
+            rows[column], rows[pivot] = rows[pivot], rows[column]
+            for row in range(size):
+                if row != column:
+                    factor = rows[row][column] / rows[column][column]
+                    rows[row] = [a - factor * b for a, b in zip(rows[row], rows[column])]
+        return [rows[i][size] / rows[i][i] for i in range(size)]
+
+    def fit(self, rows, key="fps"):
+        # Ridge regression on standardized terms; terms that never varied in the
+        # data cannot be told apart from the intercept and are left out.
+        points = [(self.features(settings, sample["players"], sample.get("ai") or 0), sample[key])
+                  for settings, sample in rows if sample.get(key) is not None]
+        if len(points) < self.MIN_SAMPLES:
+            return None
+        count = len(points)
+        stats = {}
+        for name, _ in self.TERMS:
+            values = [x[name] for x, _ in points]
+            mean = sum(values) / count
+            spread = (sum((value - mean) ** 2 for value in values) / count) ** 0.5
+            if spread > 1e-9:
+                stats[name] = (mean, spread)
+        names = list(stats)
+        mean_y = sum(y for _, y in points) / count
+        scaled = [([(x[name] - stats[name][0]) / stats[name][1] for name in names], y - mean_y) for x, y in points]
+        size = len(names)
+        matrix = [[sum(row[i] * row[j] for row, _ in scaled) + (self.RIDGE * count if i == j else 0) for j in range(size)]
+                  for i in range(size)]
+        vector = [sum(row[i] * y for row, y in scaled) for i in range(size)]
+        solution = self.solve(matrix, vector) if size else []
+        if solution is None:
+            return None
+        coefficients = {name: solution[i] / stats[name][1] for i, name in enumerate(names)}
+        intercept = mean_y - sum(coefficients[name] * stats[name][0] for name in names)
+        model = {"intercept": intercept, "coefficients": coefficients, "samples": count,
+                 "configs": len({tuple(sorted(settings.items())) for settings, _ in rows})}
+        residual = sum((y - self.predict(model, x)) ** 2 for x, y in points)
+        total = sum((y - mean_y) ** 2 for _, y in points)
+        model["r2"] = 1 - residual / total if total else 0.0
+        model["error"] = (residual / count) ** 0.5
+        return model
+
+    @staticmethod
+    def predict(model, features):
+        return model["intercept"] + sum(value * features[name] for name, value in model["coefficients"].items())
+
+    def effects(self, model, players, settings):
+        coefficients = model["coefficients"]
+        effects = []
+        network_km = settings["networkViewDistance"] / 1000
+        if "players" in coefficients or "network_players" in coefficients:
+            effects.append(f"Each extra player: {coefficients.get('players', 0) + coefficients.get('network_players', 0) * network_km:+.2f} FPS "
+                           f"(at {settings['networkViewDistance']} m network view distance)")
+        if "ai" in coefficients:
+            effects.append(f"Every 10 AI: {coefficients['ai'] * 10:+.2f} FPS")
+        if "view_km" in coefficients:
+            effects.append(f"Max View Distance +500 m: {coefficients['view_km'] * 0.5:+.2f} FPS")
+        if "network_km" in coefficients or "network_players" in coefficients:
+            per_km = coefficients.get("network_km", 0) + coefficients.get("network_players", 0) * players
+            effects.append(f"Network View Distance +500 m: {per_km * 0.5:+.2f} FPS at {players} players")
+        if "long_jobs" in coefficients:
+            effects.append(f"-rplEncodeAsLongJobs on: {coefficients['long_jobs']:+.2f} FPS")
+        if "navmesh" in coefficients:
+            effects.append(f"-disableNavmeshStreaming on: {coefficients['navmesh']:+.2f} FPS")
+        unknown = [label for name, label in self.TERMS if name not in coefficients and name != "network_players"]
+        if unknown:
+            effects.append("Not varied in the recorded data, effect unknown: " + ", ".join(unknown))
+        return effects
+
+    @staticmethod
+    def percentile(values, fraction):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(fraction * len(values)))] if values else None
+
+    def plan(self, samples, timeline, current_settings):
+        rows, capped = self.build_rows(samples, timeline)
+        plan = {"rows": len(rows), "capped": capped, "model": None, "cpu_model": None, "changes": [], "notes": [], "effects": []}
+        model = self.fit(rows)
+        if model is None:
+            plan["notes"].append(f"Not enough uncapped -logStats samples to plan ({len(rows)}, need {self.MIN_SAMPLES}). "
+                                 "Keep the Monitoring tab running with -logStats enabled while people play.")
+            return plan
+        plan["model"] = model
+        cpu_model = self.fit(rows, "cpu")
+        plan["cpu_model"] = cpu_model
+        player_counts = [sample["players"] for _, sample in rows]
+        peak = self.peak_players or int(self.percentile(player_counts, 0.95))
+        busy = [sample.get("ai") or 0 for _, sample in rows if sample["players"] >= peak * 0.8]
+        peak_ai = int(self.percentile(busy or [sample.get("ai") or 0 for _, sample in rows], 0.5))
+        plan.update({"peak_players": peak, "peak_ai": peak_ai, "effects": self.effects(model, peak, current_settings)})
+        seen = {key: sorted({settings[key] for settings, _ in rows}) for key in ("serverMaxViewDistance", "networkViewDistance")}
+        seen["rplEncodeAsLongJobs"] = sorted({settings["rplEncodeAsLongJobs"] for settings, _ in rows})
+        seen["disableNavmeshStreaming"] = sorted({settings["disableNavmeshStreaming"] for settings, _ in rows})
+
+        def fps(settings, players=peak, ai=None):
+            return self.predict(model, self.features(settings, players, peak_ai if ai is None else ai))
+
+        def cpu(settings, players=peak, ai=None):
+            return self.predict(cpu_model, self.features(settings, players, peak_ai if ai is None else ai)) if cpu_model else None
+
+        def cpu_ok(settings, players=peak, ai=None):
+            return cpu_model is None or cpu(settings, players, ai) <= self.cpu_limit
+
+        settings = dict(current_settings)
+        ai = peak_ai
+        plan["predicted_now"] = fps(settings)
+        plan["cpu_now"] = cpu(settings)
+        goal = self.target_fps + self.margin
+
+        def candidates(settings, ai, lower):
+            # One step of each knob, towards cheaper (lower=True) or nicer settings, within what was run.
+            steps = []
+            for key in ("serverMaxViewDistance", "networkViewDistance"):
+                low, high = seen[key][0], seen[key][-1]
+                value = settings[key] + (-self.DISTANCE_STEP if lower else self.DISTANCE_STEP)
+                if low <= value <= high and low != high:
+                    changed = dict(settings, **{key: value})
+                    if changed["networkViewDistance"] <= changed["serverMaxViewDistance"]:
+                        steps.append((changed, ai))
+            for key in ("rplEncodeAsLongJobs", "disableNavmeshStreaming"):
+                if len(seen[key]) == 2 and settings[key] != lower:
+                    steps.append((dict(settings, **{key: lower}), ai))
+            if lower and "ai" in model["coefficients"] and ai > peak_ai // 2:
+                steps.append((settings, max(peak_ai // 2, ai - max(10, peak_ai // 10))))
+            return steps
+
+        while fps(settings, ai=ai) < goal:
+            options = [(fps(changed, ai=changed_ai), changed, changed_ai) for changed, changed_ai in candidates(settings, ai, True)]
+            options = [option for option in options if option[0] > fps(settings, ai=ai) + 0.05]
+            if not options:
+                break
+            _, settings, ai = max(options, key=lambda option: option[0])
+        while not cpu_ok(settings, ai=ai):
+            options = [(cpu(changed, ai=changed_ai), changed, changed_ai) for changed, changed_ai in candidates(settings, ai, True)]
+            options = [option for option in options if option[0] < cpu(settings, ai=ai) - 0.5]
+            if not options:
+                break
+            _, settings, ai = min(options, key=lambda option: option[0])
+        if fps(settings, ai=ai) >= goal and cpu_ok(settings, ai=ai):
+            while True:
+                options = [(fps(changed, ai=changed_ai), changed, changed_ai) for changed, changed_ai in candidates(settings, ai, False)
+                           if changed["rplEncodeAsLongJobs"] == settings["rplEncodeAsLongJobs"]
+                           and changed["disableNavmeshStreaming"] == settings["disableNavmeshStreaming"]]
+                options = [option for option in options if option[0] >= goal and cpu_ok(option[1], ai=option[2])]
+                if not options:
+                    break
+                _, settings, ai = max(options, key=lambda option: option[0])
+        elif not cpu_ok(settings, ai=ai):
+            plan["notes"].append(f"No combination of the settings you have run keeps CPU below {self.cpu_limit:.0f}% at {peak} players; "
+                                 "this is the closest. Fewer players or lighter missions are the remaining levers.")
+        else:
+            plan["notes"].append(f"No combination of the settings you have run reaches {self.target_fps} FPS at {peak} players; "
+                                 "this is the closest. Fewer players or lighter missions are the remaining levers.")
+        plan["predicted_after"] = fps(settings, ai=ai)
+        plan["cpu_after"] = cpu(settings, ai=ai)
+
+        supported = None
+        for players in range(max(player_counts), 0, -1):
+            if fps(settings, players, ai) >= goal and cpu_ok(settings, players, ai):
+                supported = players
+                break
+        if ai < peak_ai:
+            settings["aiLimit"] = ai
+        if settings.get("maxFPS") is None or settings["maxFPS"] < self.target_fps:
+            settings["maxFPS"] = max(60, self.target_fps)
+        if supported is not None and settings.get("maxPlayers") and settings["maxPlayers"] > supported and supported < max(player_counts):
+            settings["maxPlayers"] = supported
+        plan["supported_players"] = supported
+        def distance_reason(key, cost):
+            if settings[key] > current_settings[key]:
+                return f"there is FPS headroom at {peak} players for a longer distance"
+            if not cpu_ok(current_settings):
+                return cost + f", and CPU at peak is predicted above {self.cpu_limit:.0f}%"
+            return cost
+        reasons = {
+            "serverMaxViewDistance": distance_reason("serverMaxViewDistance", "view distance has a measured FPS cost"),
+            "networkViewDistance": distance_reason("networkViewDistance", "replication range costs FPS with every player"),
+            "rplEncodeAsLongJobs": "moves replication encoding off the main thread",
+            "disableNavmeshStreaming": "measured effect on FPS in your runs",
+            "aiLimit": f"caps AI near what {self.target_fps} FPS can carry at {peak} players",
+            "maxFPS": f"a cap at or above the {self.target_fps} FPS target, without an uncapped busy loop",
+            "maxPlayers": f"about {supported} players keep the predicted FPS above {self.target_fps}"
+                          + ("" if cpu_model is None else f" and CPU below {self.cpu_limit:.0f}%"),
+        }
+        for key, reason in reasons.items():
+            if settings.get(key) != current_settings.get(key):
+                plan["changes"].append((key, current_settings.get(key), settings[key], reason))
+        if model["r2"] < 0.3:
+            plan["notes"].append(f"The model explains only {model['r2'] * 100:.0f}% of the FPS variation; "
+                                 "treat the numbers as a rough guide.")
+        if cpu_model is None:
+            plan["notes"].append("Not enough CPU samples to model CPU use; the plan only checks FPS.")
+        if model["configs"] < 2:
+            plan["notes"].append("All samples come from one configuration, so only the player and AI effects could be measured. "
+                                 "Run a few sessions with different settings to let the planner compare them.")
+        if capped and capped > len(rows):
+            plan["notes"].append(f"{capped} samples sat at the -maxFPS cap; the server had headroom most of the time.")
+        return plan
+
+    def describe(self, plan):
+        lines = []
+        model = plan["model"]
+        if model:
+            lines.append(f"Model: {model['samples']} samples from {model['configs']} configuration(s), "
+                         f"R² {model['r2']:.2f}, typical error ±{model['error']:.1f} FPS "
+                         f"({plan['capped']} samples at the -maxFPS cap left out).")
+            lines.append(f"Peak load: {plan['peak_players']} players, {plan['peak_ai']} AI. Target: {self.target_fps} FPS.")
+            lines += ["", "Estimated effects:"] + [f"  {effect}" for effect in plan["effects"]]
+            lines += ["", f"Predicted FPS at peak with the current settings: {plan['predicted_now']:.1f}",
+                      f"Predicted FPS at peak with the recommended settings: {plan['predicted_after']:.1f}"]
+            if plan["cpu_model"]:
+                lines.append(f"Predicted CPU at peak: {plan['cpu_now']:.0f}% now, {plan['cpu_after']:.0f}% recommended "
+                             f"(limit {self.cpu_limit:.0f}%, R² {plan['cpu_model']['r2']:.2f}).")
+            if plan["supported_players"]:
+                lines.append(f"Players supported at {self.target_fps} FPS with the recommended settings: {plan['supported_players']}")
+        if plan["changes"]:
+            lines += ["", "Recommended changes:"]
+            for key, current, value, reason in plan["changes"]:
+                lines.append(f"  {key}: {'not set' if current is None else current} -> {value} ({reason})")
+        elif model:
+            lines += ["", "No changes recommended."]
+        if plan["notes"]:
+            lines += [""] + plan["notes"]
+        return "\n".join(lines)
+
+class CapacityPlanThread(QThread):
+    planned = pyqtSignal(object, str)
+
+    def __init__(self, planner, metrics, history, current_settings, parent=None):
+        super().__init__(parent)
+        self.planner = planner
+        self.metrics = metrics
+        self.history = history
+        self.current_settings = current_settings
+
+    def run(self):
+        try:
+            plan = self.planner.plan(self.metrics.read_history(), self.history.timeline(), self.current_settings)
+            self.planned.emit(plan, "")
+        except Exception as e:
+            self.planned.emit(None, str(e))
+
+class CrashLoopDetector:
+    # Rebuilds the unit's runs from the systemd manager messages in the journal
+    # and flags a loop when several runs in a row die shortly after starting.
+    START_PATTERN = re.compile(r'^Started ')
+    STOPPING_PATTERN = re.compile(r'^Stopping ')
+    EXIT_PATTERN = re.compile(r'Main process exited|Failed with result|Deactivated successfully')
+
+    def __init__(self, max_fast_exits=3, min_uptime=120, window_seconds=900):
+        self.max_fast_exits = max_fast_exits
+        self.min_uptime = min_uptime
+        self.window_seconds = window_seconds
+
+    @staticmethod
+    def parse_journal(json_output):
+        events = []
+        for line in json_output.splitlines():
+            try:
+                entry = json.loads(line)
+                ts = int(entry["__REALTIME_TIMESTAMP"]) / 1000000
+            except (ValueError, KeyError, TypeError):
+                continue
+            message = entry.get("MESSAGE")
+            if isinstance(message, str):
+                events.append((ts, message))
+        return events
+
+    def runs(self, events):
+        runs = []
+        started = None
+        requested_stop = False
+        for ts, message in events:
+            if self.START_PATTERN.match(message):
+                started = ts
+                requested_stop = False
+            elif self.STOPPING_PATTERN.match(message):
+                requested_stop = True
+            elif self.EXIT_PATTERN.search(message) and started is not None:
+                if not requested_stop:
+                    runs.append((started, ts))
+                started = None
+        return runs
+
+    def fast_exits(self, events, now=None):
+        runs = self.runs(events)
+        if not runs:
+            return []
+        now = now if now is not None else runs[-1][1]
+        recent = [run for run in runs if run[1] >= now - self.window_seconds]
+        fast = []
+        for started, exited in reversed(recent):
+            if exited - started >= self.min_uptime:
+                break
+            fast.append((started, exited))
+        return list(reversed(fast))
+
+    def is_crash_loop(self, events, now=None):
+        return len(self.fast_exits(events, now)) >= self.max_fast_exits
+
+    def last_stable_start(self, events):
+        for started, exited in reversed(self.runs(events)):
+            if exited - started >= self.min_uptime:
+                return started
+        return None
+
+    @staticmethod
+    def backoff_dropin(restart_sec=10, max_delay_sec=300, steps=5, burst=5, interval_sec=900):
+        # RestartSteps/RestartMaxDelaySec need systemd 254+, older versions ignore them
+        # and still get the fixed RestartSec delay and the start rate limit.
+        return "\n".join([
+            "# Generated by armar-sc-gui.py - crash-loop backoff for arma.service",
+            "[Unit]",
+            f"StartLimitIntervalSec={interval_sec}",
+            f"StartLimitBurst={burst}",
+            "",
+            "[Service]",
+            f"RestartSec={restart_sec}",
+            f"RestartSteps={steps}",
+            f"RestartMaxDelaySec={max_delay_sec}",
+            "",
+        ])
+
+class A2SProtocol(asyncio.DatagramProtocol):
+    def __init__(self, responses):
+        self.responses = responses
+
+    def datagram_received(self, data, addr):
+        self.responses.put_nowait(data)
+
+    def error_received(self, exc):
+        self.responses.put_nowait(exc)
+
+class A2SProbe:
+    # Steam A2S_INFO query, the same one the server browser uses on the a2s port.
+    INFO_REQUEST = b"\xFF\xFF\xFF\xFFTSource Engine Query\x00"
+    CHALLENGE = 0x41
+    INFO = 0x49
+
+    def __init__(self, timeout=2.0):
+        self.timeout = timeout
+
+    @classmethod
+    def parse_info(cls, data):
+        if len(data) < 6 or data[:4] != b"\xFF\xFF\xFF\xFF" or data[4] != cls.INFO:
+            raise ValueError("unexpected A2S response")
+        pos = 6
+        fields = []
+        for _ in range(4):
+            end = data.index(b"\x00", pos)
+            fields.append(data[pos:end].decode("utf-8", "replace"))
+            pos = end + 1
+        _, players, max_players, bots = struct.unpack_from("<HBBB", data, pos)
+        return {"name": fields[0], "map": fields[1], "players": players, "max_players": max_players, "bots": bots}
+
+    async def query(self, host, port):
+        result = {"target": f"{host}:{port}", "ts": round(time.time(), 3), "ok": False, "latency_ms": None,
+                  "players": None, "max_players": None, "map": None, "name": None, "error": None}
+        loop = asyncio.get_running_loop()
+        responses = asyncio.Queue()
+        transport = None
+        try:
+            transport, _ = await loop.create_datagram_endpoint(lambda: A2SProtocol(responses), remote_addr=(host, port))
+            request = self.INFO_REQUEST
+            for _ in range(3):
+                started = time.perf_counter()
+                transport.sendto(request)
+                data = await asyncio.wait_for(responses.get(), self.timeout)
+                if isinstance(data, Exception):
+                    raise data
+                if len(data) >= 9 and data[4] == self.CHALLENGE:
+                    request = self.INFO_REQUEST + data[5:9]
+                    continue
+                result.update(self.parse_info(data))
+                result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+                result["ok"] = True
+                break
+            else:
+                result["error"] = "challenge not accepted"
+        except asyncio.TimeoutError:
+            result["error"] = "timeout"
+        except (OSError, ValueError, struct.error) as e:
+            result["error"] = str(e) or type(e).__name__
+        finally:
+            if transport:
+                transport.close()
+        return result
+
+    async def probe_all(self, targets):
+        return await asyncio.gather(*(self.query(host, port) for host, port in targets))
+
+    @staticmethod
+    def parse_target(text):
+        host, sep, port = text.strip().rpartition(":")
+        if not sep or not host or not port.isdigit() or not 1 <= int(port) <= 65535:
+            raise ValueError(f"Invalid query target '{text.strip()}' (expected host:port)")
+        return host, int(port)
+
+    @staticmethod
+    def describe(probe):
+        if not probe["ok"]:
+            return f"Query {probe['target']}: no answer ({probe['error']})"
+        return (f"Query {probe['target']}: {probe['latency_ms']:.1f} ms, "
+                f"{probe['players']}/{probe['max_players']} players, {probe['map']}")
+
+class A2SProbeWorker(threading.Thread):
+    def __init__(self, collector, targets, interval=30, timeout=2.0):
+        super().__init__(daemon=True)
+        self.collector = collector
+        self.targets = targets
+        self.interval = interval
+        self.probe = A2SProbe(timeout)
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            results = asyncio.run(self.probe.probe_all(self.targets))
+            if not self.stop_event.is_set():
+                self.collector.update_probes(results)
+            self.stop_event.wait(self.interval)
+
+    def stop(self):
+        self.stop_event.set()
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    collector = None
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+        body = self.collector.render(openmetrics).encode()
+        content_type = ("application/openmetrics-text; version=1.0.0; charset=utf-8" if openmetrics
+                        else "text/plain; version=0.0.4; charset=utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsExporter:
+    def __init__(self, collector, port, address="127.0.0.1"):
+        handler = type("BoundMetricsRequestHandler", (MetricsRequestHandler,), {"collector": collector})
+        self.server = ThreadingHTTPServer((address, port), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class ArmaServerControlApp(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Arma Reforger Server Control")
+        self.setGeometry(100, 100, 600, 600)
+        self.is_dark_theme = False
+        self.config_file = os.path.expanduser("~/arma/server.json")
+        self.addons_dir = os.path.expanduser("~/arma/profile/addons")
+        self.game_addons_dir = os.path.expanduser("~/arma/addons")
+        self.start_script = os.path.expanduser("~/arma/start.sh")
+        self.service_name = "arma.service"  # Confirmed correct
+        self.state_dir = os.path.expanduser("~/.arsc")
+        self.settings_file = os.path.join(self.state_dir, "gui-settings.json")
+        self.settings = self.load_settings()
+        self.telemetry = Telemetry(os.path.join(self.state_dir, "trace.jsonl"))
+        self.commands = CommandRunner(self.telemetry)
+        self.command_threads = []
+        # ARSC_PROFILE=cpu,memory starts the captures right away, e.g. to profile startup.
+        profile_env = os.environ.get("ARSC_PROFILE", "").lower().split(",")
+        if "cpu" in profile_env:
+            self.telemetry.start_cpu_profile()
+        if "memory" in profile_env:
+            self.telemetry.start_memory_trace()
+        self.metrics = MetricsCollector(os.path.join(self.state_dir, "metrics.jsonl"))
+        self.disk_usage_thread = None
+        self.disk_usage_measured = None
+        self.network = NetworkSampler()
+        self.last_network_alert = 0
+        self.metrics_exporter = None
+        self.probe_worker = None
+        self.meta_paths = {}
+        self.mod_catalog = ModCatalog(os.path.join(self.state_dir, "mod-catalog.json"), self.addons_dir, self.game_addons_dir)
+        self.scenario_index_thread = None
+        self.mod_stage_thread = None
+        self.validator = ConfigValidator()
+        self.config_history = ConfigHistory(os.path.join(self.state_dir, "history"))
+        self.history_paths = {"server.json": self.config_file, "start.sh": self.start_script}
+        self.save_index = SaveIndex(os.path.join(self.state_dir, "save-index.json"), os.path.expanduser("~/arma/profile/.save"))
+        self.snapshots = ProfileSnapshots(os.path.join(self.state_dir, "snapshots"), os.path.expanduser("~/arma/profile"))
+        self.last_server_start = None
+
+        # Vanilla missions with friendly names; also used when the game data cannot be indexed.
+        self.builtin_scenarios = [
+            ("{ECC61978EDCC2B5A}Missions/23_Campaign.conf", "Conflict - Everon"),
+            ("{59AD59368755F41A}Missions/21_GM_Eden.conf", "Game Master - Everon"),
+            ("{2BBBE828037C6F4B}Missions/22_GM_Arland.conf", "Game Master - Arland"),
+            ("{C700DB41F0C546E1}Missions/23_Campaign_NorthCentral.conf", "Conflict - Northern Everon"),
+            ("{28802845ADA64D52}Missions/23_Campaign_SWCoast.conf", "Conflict - Southern Everon"),
+            ("{94992A3D7CE4FF8A}Missions/23_Campaign_Western.conf", "Conflict - Western Everon"),
+            ("{FDE33AFE2ED7875B}Missions/23_Campaign_Montignac.conf", "Conflict - Montignac"),
+            ("{DAA03C6E6099D50F}Missions/24_CombatOps.conf", "Combat Ops - Arland"),
+            ("{C41618FD18E9D714}Missions/23_Campaign_Arland.conf", "Conflict - Arland"),
+            ("{DFAC5FABD11F2390}Missions/26_CombatOpsEveron.conf", "Combat Ops - Everon"),
+            ("{3F2E005F43DBD2F8}Missions/CAH_Briars_Coast.conf", "Capture & Hold: Briars"),
+            ("{F1A1BEA67132113E}Missions/CAH_Castle.conf", "Capture & Hold: Montfort Castle"),
+            ("{589945FB9FA7B97D}Missions/CAH_Concrete_Plant.conf", "Capture & Hold: Concrete Plant"),
+            ("{9405201CBD22A30C}Missions/CAH_Factory.conf", "Capture & Hold: Almara Factory"),
+            ("{1CD06B409C6FAE56}Missions/CAH_Forest.conf", "Capture & Hold: Simon's Wood"),
+            ("{7C491B1FCC0FF0E1}Missions/CAH_LeMoule.conf", "Capture & Hold: Le Moule"),
+            ("{6EA2E454519E5869}Missions/CAH_Military_Base.conf", "Capture & Hold: Camp Blake"),
+            ("{2B4183DF23E88249}Missions/CAH_Morton.conf", "Capture & Hold: Morton"),
+            ("{0220741028718E7F}Missions/23_Campaign_HQC_Everon.conf", "Conflict: HQ Commander - Everon"),
+			("{68D1240A11492545}Missions/23_Campaign_HQC_Arland.conf", "Conflict: HQ Commander - Arland"),
+            ("{BB5345C22DD2B655}Missions/23_Campaign_HQC_Cain.conf", "Conflict: HQ Commander - Kolguyev"),
+			("{CB347F2F10065C9C}Missions/CombatOpsCain.conf", "Combat Ops - Kolguyev"),
+			("{F45C6C15D31252E6}Missions/27_GM_Cain.conf", "Game Master - Kolguyev"),
+        ]
+        self.scenarios = list(self.builtin_scenarios)
+
+        debug_menu = self.menuBar().addMenu("Debug")
+        self.cpu_profile_action = QAction("CPU Profile (cProfile)", self, checkable=True)
+        self.cpu_profile_action.setChecked(self.telemetry.profiler is not None)
+        self.cpu_profile_action.toggled.connect(self.toggle_cpu_profile)
+        self.memory_trace_action = QAction("Memory Tracing (tracemalloc)", self, checkable=True)
+        self.memory_trace_action.setChecked(tracemalloc.is_tracing())
+        self.memory_trace_action.toggled.connect(self.toggle_memory_trace)
+        slowest_action = QAction("Slowest Operations...", self)
+        slowest_action.triggered.connect(self.show_slowest_operations)
+        debug_menu.addAction(self.cpu_profile_action)
+        debug_menu.addAction(self.memory_trace_action)
+        debug_menu.addAction(slowest_action)
+
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)
+        self.layout = QVBoxLayout(self.central_widget)
+
+        self.theme_button = QPushButton("Switch to Dark Theme")
+        self.theme_button.clicked.connect(self.traced(self.toggle_theme))
+        self.layout.addWidget(self.theme_button)
+
+        self.tabs = QTabWidget()
+        self.layout.addWidget(self.tabs)
+
+        # Service Management Tab
+        self.service_tab = QWidget()
+        self.service_layout = QVBoxLayout(self.service_tab)
+        status_layout = QHBoxLayout()
+        self.status_button = QPushButton("Status")
+        self.status_button.setFixedSize(100, 30)
+        font = QFont()
+        font.setPointSize(8)
+        self.status_button.setFont(font)
+        self.status_button.clicked.connect(self.traced(self.show_status))
+        status_layout.addStretch()
+        status_layout.addWidget(self.status_button)
+        status_layout.addStretch()
+        self.service_layout.addLayout(status_layout)
+        self.log_model = LogModel(self)
+        self.log_window = QListView()
+        self.log_window.setModel(self.log_model)
+        self.log_window.setUniformItemSizes(True)
+        self.log_window.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.log_window.setFont(QFont("Monospace", 9))
+        self.service_layout.addWidget(QLabel("Service Logs:"))
+        log_filter_layout = QHBoxLayout()
+        log_filter_layout.addWidget(QLabel("Show:"))
+        self.log_level_checkboxes = {}
+        for level, label in (("error", "Errors"), ("warning", "Warnings"), ("info", "Info"), ("stats", "Stats")):
+            checkbox = QCheckBox(label)
+            checkbox.setChecked(True)
+            checkbox.toggled.connect(self.traced(self.schedule_log_filter))
+            self.log_level_checkboxes[level] = checkbox
+            log_filter_layout.addWidget(checkbox)
+        self.log_regex_input = QLineEdit()
+        self.log_regex_input.setPlaceholderText("Regex, e.g. disconnect|kick")
+        self.log_regex_input.textChanged.connect(self.schedule_log_filter)
+        log_filter_layout.addWidget(self.log_regex_input)
+        self.log_mod_input = QComboBox()
+        self.log_mod_input.setEditable(True)
+        self.log_mod_input.setMinimumWidth(160)
+        self.log_mod_input.lineEdit().setPlaceholderText("Mod name or ID")
+        self.log_mod_input.editTextChanged.connect(self.schedule_log_filter)
+        log_filter_layout.addWidget(self.log_mod_input)
+        self.log_count_label = QLabel("")
+        log_filter_layout.addWidget(self.log_count_label)
+        self.service_layout.addLayout(log_filter_layout)
+        self.service_layout.addWidget(self.log_window)
+        self.log_filter_timer = QTimer(self)
+        self.log_filter_timer.setSingleShot(True)
+        self.log_filter_timer.setInterval(250)
+        self.log_filter_timer.timeout.connect(self.traced(self.apply_log_filter, "timer"))
+        self.log_model.rowsInserted.connect(self.update_log_count)
+        self.log_model.modelReset.connect(self.update_log_count)
+        self.start_button = QPushButton("Start Service")
+        self.stop_button = QPushButton("Stop Service")
+        self.restart_button = QPushButton("Restart Service")
+        self.start_button.clicked.connect(self.traced(self.start_service))
+        self.stop_button.clicked.connect(self.traced(self.stop_service))
+        self.restart_button.clicked.connect(self.traced(self.restart_service))
+        self.start_button.setStyleSheet("background-color: #00FF00;")
+        self.stop_button.setStyleSheet("background-color: #FF0000;")
+        self.restart_button.setStyleSheet("background-color: #FFFF00;")
+        self.update_status_button_color()
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.start_button)
+        button_layout.addWidget(self.stop_button)
+        button_layout.addWidget(self.restart_button)
+        self.service_layout.addLayout(button_layout)
+        self.service_layout.addWidget(QLabel("Profile Snapshots (saves and profile data, without addons and logs):"))
+        self.snapshot_list = QListWidget()
+        self.snapshot_list.setMaximumHeight(120)
+        self.service_layout.addWidget(self.snapshot_list)
+        self.snapshot_keep_input = QLineEdit(str(self.settings["snapshot_keep"]))
+        self.snapshot_keep_input.setPlaceholderText("1-365")
+        snapshot_layout = QHBoxLayout()
+        snapshot_layout.addWidget(QLabel("Keep:"))
+        snapshot_layout.addWidget(self.snapshot_keep_input)
+        self.snapshot_button = QPushButton("Snapshot Now")
+        self.restore_snapshot_button = QPushButton("Restore Selected")
+        self.snapshot_button.clicked.connect(self.traced(self.create_snapshot))
+        self.restore_snapshot_button.clicked.connect(self.traced(self.restore_snapshot))
+        snapshot_layout.addWidget(self.snapshot_button)
+        snapshot_layout.addWidget(self.restore_snapshot_button)
+        self.service_layout.addLayout(snapshot_layout)
+        self.snapshot_process = QProcess(self)
+        self.snapshot_process.setProcessChannelMode(QProcess.MergedChannels)
+        self.snapshot_process.finished.connect(self.snapshot_finished)
+        self.update_snapshot_list()
+        self.tabs.addTab(self.service_tab, "Service Control")
+        self.log_process = QProcess(self)
+        self.log_process.readyReadStandardOutput.connect(self.handle_log_output)
+        self.log_process.readyReadStandardError.connect(self.handle_log_output)
+        self.start_logging()
+
+        # Server Configuration Tab
+        self.config_tab = QWidget()
+        self.config_scroll = QScrollArea()
+        self.config_scroll.setWidgetResizable(True)
+        self.config_scroll.setWidget(self.config_tab)
+        self.config_layout = QVBoxLayout(self.config_tab)
+        self.config_layout.addWidget(QLabel("Server Configuration:"))
+
+        # Inline: Public IP Address
+        self.ip_input = QLineEdit()
+        ip_layout = QHBoxLayout()
+        ip_layout.addWidget(QLabel("Public IP Address:"))
+        ip_layout.addWidget(self.ip_input)
+        self.config_layout.addLayout(ip_layout)
+
+        # Inline: Public Port
+        self.port_input = QLineEdit()
+        self.port_input.setPlaceholderText("1024-65535")
+        port_layout = QHBoxLayout()
+        port_layout.addWidget(QLabel("Public Port:"))
+        port_layout.addWidget(self.port_input)
+        self.config_layout.addLayout(port_layout)
+
+        # Inline: Server Name
+        self.name_input = QLineEdit()
+        name_layout = QHBoxLayout()
+        name_layout.addWidget(QLabel("Server Name:"))
+        name_layout.addWidget(self.name_input)
+        self.config_layout.addLayout(name_layout)
+
+        # Inline: Game Password
+        self.game_password_input = QLineEdit()
+        game_password_layout = QHBoxLayout()
+        game_password_layout.addWidget(QLabel("Game Password:"))
+        game_password_layout.addWidget(self.game_password_input)
+        self.config_layout.addLayout(game_password_layout)
+
+        # Inline: Admin Password
+        self.admin_password_input = QLineEdit()
+        admin_password_layout = QHBoxLayout()
+        admin_password_layout.addWidget(QLabel("Admin Password:"))
+        admin_password_layout.addWidget(self.admin_password_input)
+        self.config_layout.addLayout(admin_password_layout)
+
+        # Stacked: Admins
+        self.admins_input = QTextEdit()
+        self.admins_input.setPlaceholderText("Enter up to 20 Player IdentityIds, one per line (e.g., 3690a2f4-edb0-434e-ab2e-758906631a38)")
+        self.admins_input.setFixedHeight(100)
+        self.config_layout.addWidget(QLabel("Admins (up to 20 Player IdentityIds):"))
+        self.config_layout.addWidget(self.admins_input)
+
+        # Inline: Scenario
+        self.scenario_combo = QComboBox()
+        self.scenario_combo.addItems([desc for _, desc in self.scenarios])
+        scenario_layout = QHBoxLayout()
+        scenario_layout.addWidget(QLabel("Scenario:"))
+        scenario_layout.addWidget(self.scenario_combo)
+        self.rescan_scenarios_button = QPushButton("Rescan")
+        self.rescan_scenarios_button.clicked.connect(self.traced(self.index_scenarios))
+        scenario_layout.addWidget(self.rescan_scenarios_button)
+        self.config_layout.addLayout(scenario_layout)
+
+        # Stacked: Custom Scenario
+        self.custom_scenario_input = QLineEdit()
+        self.custom_scenario_input.setPlaceholderText("e.g., {ECC61978EDCC2B5A}Missions/23_Campaign.conf")
+        self.config_layout.addWidget(QLabel("Custom Scenario ID (optional, overrides dropdown):"))
+        self.config_layout.addWidget(self.custom_scenario_input)
+
+        # Inline: Max Players
+        self.max_players_input = QLineEdit()
+        self.max_players_input.setPlaceholderText("2-128")
+        max_players_layout = QHBoxLayout()
+        max_players_layout.addWidget(QLabel("Max Players:"))
+        max_players_layout.addWidget(self.max_players_input)
+        self.config_layout.addLayout(max_players_layout)
+
+        # Inline: Max View Distance
+        self.view_distance_input = QLineEdit()
+        self.view_distance_input.setPlaceholderText("500-10000")
+        view_distance_layout = QHBoxLayout()
+        view_distance_layout.addWidget(QLabel("Max View Distance:"))
+        view_distance_layout.addWidget(self.view_distance_input)
+        self.config_layout.addLayout(view_distance_layout)
+
+        # Inline: Min Grass Distance
+        self.grass_distance_input = QLineEdit()
+        self.grass_distance_input.setPlaceholderText("50-150")
+        grass_distance_layout = QHBoxLayout()
+        grass_distance_layout.addWidget(QLabel("Min Grass Distance:"))
+        grass_distance_layout.addWidget(self.grass_distance_input)
+        self.config_layout.addLayout(grass_distance_layout)
+
+        # Inline: Network View Distance
+        self.network_view_distance_input = QLineEdit()
+        self.network_view_distance_input.setPlaceholderText("500-5000")
+        network_view_distance_layout = QHBoxLayout()
+        network_view_distance_layout.addWidget(QLabel("Network View Distance:"))
+        network_view_distance_layout.addWidget(self.network_view_distance_input)
+        self.config_layout.addLayout(network_view_distance_layout)
+
+        # Checkboxes
+        self.crossplay_checkbox = QCheckBox("Enable Crossplay")
+        crossplay_layout = QHBoxLayout()
+        crossplay_layout.addWidget(self.crossplay_checkbox)
+        crossplay_layout.addWidget(QLabel("(Default: False)"))
+        crossplay_layout.addStretch()
+        self.config_layout.addLayout(crossplay_layout)
+
+        self.disable_3rd_person_checkbox = QCheckBox("Disable Third Person")
+        third_person_layout = QHBoxLayout()
+        third_person_layout.addWidget(self.disable_3rd_person_checkbox)
+        third_person_layout.addWidget(QLabel("(Default: False)"))
+        third_person_layout.addStretch()
+        self.config_layout.addLayout(third_person_layout)
+
+        self.battleye_checkbox = QCheckBox("Enable BattlEye")
+        battleye_layout = QHBoxLayout()
+        battleye_layout.addWidget(self.battleye_checkbox)
+        battleye_layout.addWidget(QLabel("(Default: True)"))
+        battleye_layout.addStretch()
+        self.config_layout.addLayout(battleye_layout)
+
+        self.von_disable_ui_checkbox = QCheckBox("Disable VON UI")
+        von_ui_layout = QHBoxLayout()
+        von_ui_layout.addWidget(self.von_disable_ui_checkbox)
+        von_ui_layout.addWidget(QLabel("(Default: False)"))
+        von_ui_layout.addStretch()
+        self.config_layout.addLayout(von_ui_layout)
+
+        self.von_disable_direct_speech_checkbox = QCheckBox("Disable Direct Speech UI")
+        von_direct_speech_layout = QHBoxLayout()
+        von_direct_speech_layout.addWidget(self.von_disable_direct_speech_checkbox)
+        von_direct_speech_layout.addWidget(QLabel("(Default: False)"))
+        von_direct_speech_layout.addStretch()
+        self.config_layout.addLayout(von_direct_speech_layout)
+
+        self.von_transmit_cross_faction_checkbox = QCheckBox("Allow Cross-Faction VON Transmit")
+        von_transmit_layout = QHBoxLayout()
+        von_transmit_layout.addWidget(self.von_transmit_cross_faction_checkbox)
+        von_transmit_layout.addWidget(QLabel("(Default: False)"))
+        von_transmit_layout.addStretch()
+        self.config_layout.addLayout(von_transmit_layout)
+
+        # Inline: Join Queue Max Size
+        self.join_queue_size_input = QLineEdit()
+        self.join_queue_size_input.setPlaceholderText("0-50")
+        join_queue_layout = QHBoxLayout()
+        join_queue_layout.addWidget(QLabel("Join Queue Max Size:"))
+        join_queue_layout.addWidget(self.join_queue_size_input)
+        self.config_layout.addLayout(join_queue_layout)
+
+        # server.json path, widget, kind, default when missing, label
+        self.config_fields = [
+            ("publicAddress", self.ip_input, "text", "", "Public IP Address"),
+            ("publicPort", self.port_input, "int", 2001, "Public Port"),
+            ("game.name", self.name_input, "text", "", "Server Name"),
+            ("game.password", self.game_password_input, "secret", "", "Game Password"),
+            ("game.passwordAdmin", self.admin_password_input, "secret", "", "Admin Password"),
+            ("game.admins", self.admins_input, "lines", [], "Admins"),
+            ("game.scenarioId", None, "scenario", "", "Scenario"),
+            ("game.maxPlayers", self.max_players_input, "int", 6, "Max Players"),
+            ("game.crossPlatform", self.crossplay_checkbox, "bool", False, "Crossplay"),
+            ("game.gameProperties.serverMaxViewDistance", self.view_distance_input, "int", 1600, "Max View Distance"),
+            ("game.gameProperties.serverMinGrassDistance", self.grass_distance_input, "int", 50, "Min Grass Distance"),
+            ("game.gameProperties.networkViewDistance", self.network_view_distance_input, "int", 1500, "Network View Distance"),
+            ("game.gameProperties.disableThirdPerson", self.disable_3rd_person_checkbox, "bool", False, "Disable Third Person"),
+            ("game.gameProperties.battlEye", self.battleye_checkbox, "bool", False, "BattlEye"),
+            ("game.gameProperties.VONDisableUI", self.von_disable_ui_checkbox, "bool", False, "Disable VON UI"),
+            ("game.gameProperties.VONDisableDirectSpeechUI", self.von_disable_direct_speech_checkbox, "bool", False, "Disable Direct Speech UI"),
+            ("game.gameProperties.VONCanTransmitCrossFaction", self.von_transmit_cross_faction_checkbox, "bool", False, "Cross-Faction VON Transmit"),
+            ("operating.joinQueue.maxSize", self.join_queue_size_input, "int", 0, "Join Queue Max Size"),
+        ]
+        self.config_base = {}
+        self.config_seen_digest = None
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        self.save_config_button = QPushButton("Save Configuration")
+        self.review_config_button = QPushButton("Review Config")
+        self.save_config_button.clicked.connect(self.traced(self.save_config))
+        self.review_config_button.clicked.connect(self.traced(self.review_config))
+        button_layout.addWidget(self.save_config_button)
+        button_layout.addWidget(self.review_config_button)
+        self.config_layout.addLayout(button_layout)
+        self.config_layout.addStretch()
+        self.tabs.addTab(self.config_scroll, "Server Config")
+
+        # Mod Management Tab
+        self.mods_tab = QWidget()
+        self.mods_layout = QVBoxLayout(self.mods_tab)
+        self.mods_scroll = QScrollArea()
+        self.mods_scroll.setWidgetResizable(True)
+        self.mods_container = QWidget()
+        self.mods_container_layout = QVBoxLayout(self.mods_container)
+        self.mods_scroll.setWidget(self.mods_container)
+        self.mods_layout.addWidget(QLabel("Mod Management:"))
+        self.mods_layout.addWidget(self.mods_scroll)
+        button_layout = QHBoxLayout()
+        self.add_mod_button = QPushButton("Add Mod")
+        self.apply_mods_button = QPushButton("Apply Mod Changes")
+        self.sync_mods_button = QPushButton("Sync Mod Names")
+        self.disable_mods_button = QPushButton("Disable All Mods")
+        self.enable_mods_button = QPushButton("Enable All Mods")
+        self.add_mod_button.clicked.connect(self.traced(self.add_mod))
+        self.apply_mods_button.clicked.connect(self.traced(self.apply_mod_changes))
+        self.sync_mods_button.clicked.connect(self.traced(self.sync_mods))
+        self.disable_mods_button.clicked.connect(self.traced(self.disable_mods))
+        self.enable_mods_button.clicked.connect(self.traced(self.enable_mods))
+        button_layout.addWidget(self.add_mod_button)
+        button_layout.addWidget(self.apply_mods_button)
+        button_layout.addWidget(self.sync_mods_button)
+        button_layout.addWidget(self.disable_mods_button)
+        button_layout.addWidget(self.enable_mods_button)
+        self.mods_layout.addLayout(button_layout)
+        self.mods_layout.addWidget(QLabel("Pre-download new and updated mods from your own mirror while the server runs, then restart "
+                                          "(the mirror layout is described in the README):"))
+        self.mod_source_input = QLineEdit(self.settings["mod_source_url"])
+        self.mod_source_input.setPlaceholderText("http://host:port of a self-hosted mod mirror")
+        self.mod_source_input.setToolTip("Serves mods/<modId>/manifest.json and mods/<modId>/<version>/<file>, see the README.")
+        self.mod_source_input.textChanged.connect(self.update_stage_button)
+        self.mod_workers_input = QLineEdit(str(self.settings["mod_download_workers"]))
+        self.mod_workers_input.setPlaceholderText("1-16")
+        stage_layout = QHBoxLayout()
+        stage_layout.addWidget(QLabel("Self-hosted Mirror:"))
+        stage_layout.addWidget(self.mod_source_input)
+        stage_layout.addWidget(QLabel("Parallel Downloads:"))
+        stage_layout.addWidget(self.mod_workers_input)
+        self.mods_layout.addLayout(stage_layout)
+        self.stage_mods_button = QPushButton("Stage Mods and Restart")
+        self.stage_mods_button.clicked.connect(self.traced(self.stage_mods))
+        self.mods_layout.addWidget(self.stage_mods_button)
+        self.mod_staging = False
+        self.update_stage_button()
+        self.mod_stage_status_label = QLabel("")
+        self.mod_stage_status_label.setWordWrap(True)
+        self.mods_layout.addWidget(self.mod_stage_status_label)
+        self.mod_review_button = QPushButton("Review Config")
+        self.mod_review_button.clicked.connect(self.traced(self.review_config))
+        self.mods_layout.addWidget(self.mod_review_button)
+        self.tabs.addTab(self.mods_tab, "Mod Management")
+
+        # Start Parameters Tab
+        self.start_params_tab = QWidget()
+        self.start_params_layout = QVBoxLayout(self.start_params_tab)
+        self.start_params_layout.addWidget(QLabel("Start Parameters (modifies ~/arma/start.sh):"))
+        self.install_update_checkbox = QCheckBox("Enable Install/Update ($HOME/arma/install.sh)")
+        self.start_params_layout.addWidget(self.install_update_checkbox)
+        self.max_fps_checkbox = QCheckBox("Enable Max FPS")
+        self.max_fps_input = QLineEdit()
+        self.max_fps_input.setPlaceholderText(f"e.g., 60 (1-{SERVER_FPS_BUDGET})")
+        self.log_stats_checkbox = QCheckBox("Enable Log Stats")
+        self.log_stats_input = QLineEdit()
+        self.log_stats_input.setPlaceholderText("e.g., 60000 (ms, 1000-3600000)")
+        self.keep_num_logs_checkbox = QCheckBox("Enable Keep Number of Logs")
+        self.keep_num_logs_input = QLineEdit()
+        self.keep_num_logs_input.setPlaceholderText("e.g., 5 (1-100)")
+        self.ai_limit_checkbox = QCheckBox("Enable AI Limit")
+        self.ai_limit_input = QLineEdit()
+        self.ai_limit_input.setPlaceholderText("e.g., 150 (0-1000)")
+        self.auto_reload_checkbox = QCheckBox("Enable Auto Reload")
+        self.auto_reload_input = QLineEdit()
+        self.auto_reload_input.setPlaceholderText("e.g., 30 (seconds, 10-120)")
+        self.auto_shutdown_checkbox = QCheckBox("Enable Auto Shutdown")
+        self.load_session_save_checkbox = QCheckBox("Enable Load Session Save")
+        self.load_session_save_input = QLineEdit()
+        self.load_session_save_input.setPlaceholderText("e.g., MySaveFile (optional)")
+        self.browse_saves_button = QPushButton("Browse...")
+        self.browse_saves_button.clicked.connect(self.traced(self.browse_saves))
+        self.log_voting_checkbox = QCheckBox("Enable Log Voting")
+        self.disable_ai_checkbox = QCheckBox("Enable Disable AI")
+        self.encode_as_long_jobs_checkbox = QCheckBox("Enable rplEncodeAsLongJobs (Can Help With Performance)")
+        self.disable_nav_mesh_checkbox = QCheckBox("Enable disableNavmeshStreaming (Can Help With Performance)")
+        param_widgets = [
+            (self.max_fps_checkbox, self.max_fps_input, f"Max FPS (1-{SERVER_FPS_BUDGET}):"),
+            (self.log_stats_checkbox, self.log_stats_input, "Log Stats (ms, 1000-3600000):"),
+            (self.keep_num_logs_checkbox, self.keep_num_logs_input, "Keep Number of Logs (1-100):"),
+            (self.ai_limit_checkbox, self.ai_limit_input, "AI Limit (0-1000):"),
+            (self.auto_reload_checkbox, self.auto_reload_input, "Auto Reload (seconds, 10-120):"),
+            (self.auto_shutdown_checkbox, None, ""),
+            (self.load_session_save_checkbox, self.load_session_save_input, "Load Session Save (optional):"),
+            (self.log_voting_checkbox, None, ""),
+            (self.disable_ai_checkbox, None, ""),
+            (self.encode_as_long_jobs_checkbox, None, ""),
+            (self.disable_nav_mesh_checkbox, None, ""),
+        ]
+        for checkbox, input_field, label_text in param_widgets:
+            layout = QHBoxLayout()
+            layout.addWidget(checkbox)
+            if input_field:
+                layout.addWidget(QLabel(label_text))
+                layout.addWidget(input_field)
+                if input_field is self.load_session_save_input:
+                    layout.addWidget(self.browse_saves_button)
+            else:
+                layout.addStretch()
+            self.start_params_layout.addLayout(layout)
+        # start.sh parameter, checkbox, value input, label
+        self.start_param_fields = [
+            ("install", self.install_update_checkbox, None, "Install/Update"),
+            ("maxFPS", self.max_fps_checkbox, self.max_fps_input, "Max FPS"),
+            ("logStats", self.log_stats_checkbox, self.log_stats_input, "Log Stats"),
+            ("keepNumOfLogs", self.keep_num_logs_checkbox, self.keep_num_logs_input, "Keep Number of Logs"),
+            ("aiLimit", self.ai_limit_checkbox, self.ai_limit_input, "AI Limit"),
+            ("autoReload", self.auto_reload_checkbox, self.auto_reload_input, "Auto Reload"),
+            ("autoShutdown", self.auto_shutdown_checkbox, None, "Auto Shutdown"),
+            ("loadSessionSave", self.load_session_save_checkbox, self.load_session_save_input, "Load Session Save"),
+            ("logVoting", self.log_voting_checkbox, None, "Log Voting"),
+            ("disableAI", self.disable_ai_checkbox, None, "Disable AI"),
+            ("rplEncodeAsLongJobs", self.encode_as_long_jobs_checkbox, None, "rplEncodeAsLongJobs"),
+            ("disableNavmeshStreaming", self.disable_nav_mesh_checkbox, None, "disableNavmeshStreaming"),
+        ]
+        self.start_base = {}
+        self.start_seen_digest = None
+        button_layout = QHBoxLayout()
+        self.save_start_params_button = QPushButton("Save Start Parameters")
+        self.review_start_params_button = QPushButton("Review Start Script")
+        self.save_start_params_button.clicked.connect(self.traced(self.save_start_params))
+        self.review_start_params_button.clicked.connect(self.traced(self.review_start_params))
+        button_layout.addWidget(self.save_start_params_button)
+        button_layout.addWidget(self.review_start_params_button)
+        self.start_params_layout.addLayout(button_layout)
+        self.start_params_layout.addStretch()
+        self.tabs.addTab(self.start_params_tab, "Start Parameters")
+
+        # Monitoring Tab
+        self.monitoring_tab = QWidget()
+        self.monitoring_layout = QVBoxLayout(self.monitoring_tab)
+        self.monitoring_layout.addWidget(QLabel("Server Metrics:"))
+        self.metrics_summary_label = QLabel("No samples collected yet.")
+        self.metrics_summary_label.setWordWrap(True)
+        self.monitoring_layout.addWidget(self.metrics_summary_label)
+        self.monitoring_layout.addWidget(QLabel("Network (game, A2S and RCON ports):"))
+        self.network_summary_label = QLabel(NetworkSampler.describe(None))
+        self.network_summary_label.setWordWrap(True)
+        self.monitoring_layout.addWidget(self.network_summary_label)
+        self.network_advice_button = QPushButton("Socket Buffer Advice")
+        self.network_advice_button.clicked.connect(self.traced(self.show_network_advice))
+        self.monitoring_layout.addWidget(self.network_advice_button)
+        self.exporter_checkbox = QCheckBox("Enable Prometheus Exporter (localhost only)")
+        self.exporter_checkbox.setChecked(self.settings["metrics_exporter_enabled"])
+        self.exporter_port_input = QLineEdit(str(self.settings["metrics_exporter_port"]))
+        self.exporter_port_input.setPlaceholderText("1024-65535")
+        exporter_layout = QHBoxLayout()
+        exporter_layout.addWidget(self.exporter_checkbox)
+        exporter_layout.addWidget(QLabel("Port:"))
+        exporter_layout.addWidget(self.exporter_port_input)
+        self.monitoring_layout.addLayout(exporter_layout)
+        self.apply_exporter_button = QPushButton("Apply Exporter Settings")
+        self.apply_exporter_button.clicked.connect(self.traced(self.apply_exporter_settings))
+        self.monitoring_layout.addWidget(self.apply_exporter_button)
+
+        self.monitoring_layout.addWidget(QLabel("A2S Query Probe (checks the server answers on its query port):"))
+        self.probe_checkbox = QCheckBox("Enable A2S Query Probe")
+        self.probe_checkbox.setChecked(self.settings["a2s_probe_enabled"])
+        self.monitoring_layout.addWidget(self.probe_checkbox)
+        self.probe_targets_input = QLineEdit(self.settings["a2s_probe_targets"])
+        self.probe_targets_input.setPlaceholderText("host:port, host:port (empty = a2s port from server.json on 127.0.0.1)")
+        probe_targets_layout = QHBoxLayout()
+        probe_targets_layout.addWidget(QLabel("Targets:"))
+        probe_targets_layout.addWidget(self.probe_targets_input)
+        self.monitoring_layout.addLayout(probe_targets_layout)
+        self.probe_interval_input = QLineEdit(str(self.settings["a2s_probe_interval"]))
+        self.probe_interval_input.setPlaceholderText("5-3600")
+        probe_interval_layout = QHBoxLayout()
+        probe_interval_layout.addWidget(QLabel("Probe Interval (seconds, 5-3600):"))
+        probe_interval_layout.addWidget(self.probe_interval_input)
+        self.monitoring_layout.addLayout(probe_interval_layout)
+        self.apply_probe_button = QPushButton("Apply Probe Settings")
+        self.apply_probe_button.clicked.connect(self.traced(self.apply_probe_settings))
+        self.monitoring_layout.addWidget(self.apply_probe_button)
+
+        self.monitoring_layout.addWidget(QLabel("Restart Watchdog (restarts the server before memory or FPS trends hit a limit):"))
+        self.watchdog_checkbox = QCheckBox("Enable Restart Watchdog")
+        self.watchdog_checkbox.setChecked(self.settings["watchdog_enabled"])
+        self.monitoring_layout.addWidget(self.watchdog_checkbox)
+        self.watchdog_rss_limit_input = QLineEdit(str(self.settings["watchdog_rss_limit_mb"]))
+        self.watchdog_rss_limit_input.setPlaceholderText("512-262144")
+        self.watchdog_fps_floor_input = QLineEdit(str(self.settings["watchdog_fps_floor"]))
+        self.watchdog_fps_floor_input.setPlaceholderText("1-120")
+        self.watchdog_window_input = QLineEdit(str(self.settings["watchdog_window_minutes"]))
+        self.watchdog_window_input.setPlaceholderText("10-1440")
+        self.watchdog_horizon_input = QLineEdit(str(self.settings["watchdog_horizon_minutes"]))
+        self.watchdog_horizon_input.setPlaceholderText("5-1440")
+        self.watchdog_grace_input = QLineEdit(str(self.settings["watchdog_grace_minutes"]))
+        self.watchdog_grace_input.setPlaceholderText("0-120")
+        watchdog_widgets = [
+            (self.watchdog_rss_limit_input, "Memory Limit (MB, 512-262144):"),
+            (self.watchdog_fps_floor_input, "FPS Floor (1-120):"),
+            (self.watchdog_window_input, "Trend Window (minutes, 10-1440):"),
+            (self.watchdog_horizon_input, "Projection Horizon (minutes, 5-1440):"),
+            (self.watchdog_grace_input, "Restart Grace Period (minutes, 0-120):"),
+        ]
+        for input_field, label_text in watchdog_widgets:
+            layout = QHBoxLayout()
+            layout.addWidget(QLabel(label_text))
+            layout.addWidget(input_field)
+            self.monitoring_layout.addLayout(layout)
+        self.watchdog_status_label = QLabel("No restart scheduled.")
+        self.watchdog_status_label.setWordWrap(True)
+        self.monitoring_layout.addWidget(self.watchdog_status_label)
+        button_layout = QHBoxLayout()
+        self.apply_watchdog_button = QPushButton("Apply Watchdog Settings")
+        self.cancel_watchdog_button = QPushButton("Cancel Scheduled Restart")
+        self.apply_watchdog_button.clicked.connect(self.traced(self.apply_watchdog_settings))
+        self.cancel_watchdog_button.clicked.connect(self.traced(self.cancel_watchdog_restart))
+        button_layout.addWidget(self.apply_watchdog_button)
+        button_layout.addWidget(self.cancel_watchdog_button)
+        self.monitoring_layout.addLayout(button_layout)
+        self.watchdog = self.build_watchdog()
+        self.watchdog_restart_timer = QTimer(self)
+        self.watchdog_restart_timer.setSingleShot(True)
+        self.watchdog_restart_timer.timeout.connect(self.traced(self.run_watchdog_restart, "timer"))
+
+        self.monitoring_layout.addWidget(QLabel("Crash-Loop Protection:"))
+        self.safe_mode_checkbox = QCheckBox("Disable recently changed mods and restart when a crash loop is detected")
+        self.safe_mode_checkbox.setChecked(self.settings["crash_loop_auto_safe_mode"])
+        self.safe_mode_checkbox.toggled.connect(self.traced(self.toggle_auto_safe_mode))
+        self.monitoring_layout.addWidget(self.safe_mode_checkbox)
+        self.crash_loop_status_label = QLabel("No crash loop detected.")
+        self.crash_loop_status_label.setWordWrap(True)
+        self.monitoring_layout.addWidget(self.crash_loop_status_label)
+        button_layout = QHBoxLayout()
+        self.install_backoff_button = QPushButton("Install Restart Backoff")
+        self.safe_mode_button = QPushButton("Start in Safe Mode")
+        self.restore_mods_button = QPushButton("Restore Disabled Mods")
+        self.install_backoff_button.clicked.connect(self.traced(self.install_restart_backoff))
+        self.safe_mode_button.clicked.connect(self.traced(self.start_safe_mode))
+        self.restore_mods_button.clicked.connect(self.traced(self.restore_safe_mode_mods))
+        button_layout.addWidget(self.install_backoff_button)
+        button_layout.addWidget(self.safe_mode_button)
+        button_layout.addWidget(self.restore_mods_button)
+        self.monitoring_layout.addLayout(button_layout)
+        self.crash_loop_detector = CrashLoopDetector()
+        self.last_unit_state = None
+        self.crash_loop_reported = None
+
+        self.monitoring_layout.addWidget(QLabel("Capacity Planner (recommends settings from the recorded FPS, players and config history):"))
+        self.planner_target_input = QLineEdit(str(self.settings["planner_target_fps"]))
+        self.planner_target_input.setPlaceholderText(f"5-{SERVER_FPS_BUDGET}")
+        self.planner_peak_input = QLineEdit(str(self.settings["planner_peak_players"] or ""))
+        self.planner_peak_input.setPlaceholderText("empty = busiest 5% of recorded samples")
+        planner_layout = QHBoxLayout()
+        planner_layout.addWidget(QLabel("Target FPS:"))
+        planner_layout.addWidget(self.planner_target_input)
+        planner_layout.addWidget(QLabel("Peak Players:"))
+        planner_layout.addWidget(self.planner_peak_input)
+        self.plan_button = QPushButton("Plan Settings")
+        self.plan_button.clicked.connect(self.traced(self.plan_capacity))
+        planner_layout.addWidget(self.plan_button)
+        self.monitoring_layout.addLayout(planner_layout)
+        self.plan_thread = None
+        self.monitoring_layout.addStretch()
+        self.tabs.addTab(self.monitoring_tab, "Monitoring")
+
+        # Config History Tab
+        self.history_tab = QWidget()
+        self.history_layout = QVBoxLayout(self.history_tab)
+        self.history_layout.addWidget(QLabel("Saved versions of server.json and start.sh, newest first. Select one to see what it changed, or two of the same file to compare them:"))
+        self.history_list = QListWidget()
+        self.history_list.setSelectionMode(QListWidget.ExtendedSelection)
+        self.history_list.itemSelectionChanged.connect(self.traced(self.show_history_diff))
+        self.history_layout.addWidget(self.history_list)
+        self.history_diff_view = QTextEdit()
+        self.history_diff_view.setReadOnly(True)
+        self.history_diff_view.setFont(QFont("Monospace"))
+        self.history_layout.addWidget(self.history_diff_view)
+        button_layout = QHBoxLayout()
+        self.rollback_button = QPushButton("Roll Back to Selected")
+        self.refresh_history_button = QPushButton("Refresh")
+        self.rollback_button.clicked.connect(self.traced(self.rollback_revision))
+        self.refresh_history_button.clicked.connect(self.traced(self.update_history_list))
+        button_layout.addWidget(self.rollback_button)
+        button_layout.addWidget(self.refresh_history_button)
+        self.history_layout.addLayout(button_layout)
+        self.tabs.addTab(self.history_tab, "History")
+
+        self.load_config()
+        self.update_mods_display()
+        self.load_start_params()
+        self.apply_light_theme()
+        self.update_scenarios()
+        self.index_scenarios()
+        self.update_history_list()
+
+        # inotify (through QFileSystemWatcher) on the files and their directory,
+        # the directory watch catches editors and jq scripts that replace the file.
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(self.watched_file_changed)
+        self.file_watcher.directoryChanged.connect(self.watched_file_changed)
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setSingleShot(True)
+        self.watch_timer.timeout.connect(self.traced(self.check_external_changes, "timer"))
+        self.watch_files()
+
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.traced(self.sample_metrics, "timer"))
+        self.metrics_timer.start(15000)
+        self.sample_metrics()
+        if self.settings["metrics_exporter_enabled"]:
+            self.start_metrics_exporter(show_errors=False)
+        if self.settings["a2s_probe_enabled"]:
+            try:
+                self.start_probe_worker()
+            except ValueError as e:
+                self.log_event("a2s", str(e))
+
+    def load_settings(self):
+        settings = {
+            "metrics_exporter_enabled": False,
+            "metrics_exporter_port": 9307,
+            "watchdog_enabled": False,
+            "watchdog_rss_limit_mb": 12000,
+            "watchdog_fps_floor": 20,
+            "watchdog_window_minutes": 120,
+            "watchdog_horizon_minutes": 60,
+            "watchdog_grace_minutes": 5,
+            "crash_loop_auto_safe_mode": False,
+            "a2s_probe_enabled": False,
+            "a2s_probe_targets": "",
+            "a2s_probe_interval": 30,
+            "snapshot_keep": 14,
+            "mod_source_url": "",
+            "mod_download_workers": 4,
+            "planner_target_fps": 30,
+            "planner_peak_players": 0,
+        }
+        try:
+            with open(self.settings_file, 'r') as f:
+                settings.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        return settings
+
+    def save_settings(self):
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            with open(self.settings_file, 'w') as f:
+                json.dump(self.settings, f, indent=2)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to save settings: {e}")
+
+    def sample_metrics(self):
+        self.run_async([["systemctl", "--user", "show", self.service_name,
+                         "-p", "ActiveState", "-p", "MainPID", "-p", "ExecMainStartTimestamp", "-p", "NRestarts", "-p", "ControlGroup",
+                         *[arg for name in NetworkSampler.IP_PROPERTIES for arg in ("-p", name)]]],
+                       self.traced(self.metrics_sampled, "command"), timeout=10)
+
+    def metrics_sampled(self, success, output):
+        if success:
+            previous_restarts = self.metrics.unit["restarts"]
+            self.metrics.update_unit(output)
+            state = self.metrics.unit["state"]
+            if self.metrics.unit["restarts"] > previous_restarts or (state == "failed" and self.last_unit_state != "failed"):
+                self.check_crash_loop()
+            self.last_unit_state = state
+        self.sample_network(output if success else "")
+        self.sample_disk_usage()
+        self.metrics.record_sample()
+        self.metrics_summary_label.setText(self.metrics.summary())
+        self.tag_revisions()
+        if success:
+            self.paint_status_button(self.metrics.unit["state"] == "active")
+        self.check_watchdog()
+
+    def current_plan_settings(self):
+        with open(self.config_file, 'r') as f:
+            config = json.load(f)
+        with open(self.start_script, 'r') as f:
+            start_params = StartScript.parse(f.read())
+        return CapacityPlanner.settings_from(config, start_params)
+
+    def plan_capacity(self):
+        if self.plan_thread and self.plan_thread.isRunning():
+            return
+        is_valid, error_msg = self.validate_integer_input(self.planner_target_input.text(), "Target FPS", 5, SERVER_FPS_BUDGET)
+        if not is_valid:
+            QMessageBox.critical(self, "Error", error_msg)
+            return
+        peak_text = self.planner_peak_input.text().strip()
+        if peak_text:
+            is_valid, error_msg = self.validate_integer_input(peak_text, "Peak Players", 1, 128)
+            if not is_valid:
+                QMessageBox.critical(self, "Error", error_msg)
+                return
+        self.settings["planner_target_fps"] = int(self.planner_target_input.text())
+        self.settings["planner_peak_players"] = int(peak_text) if peak_text else 0
+        self.save_settings()
+        try:
+            current_settings = self.current_plan_settings()
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Failed to read the current settings: {e}")
+            return
+        planner = CapacityPlanner(self.settings["planner_target_fps"], self.settings["planner_peak_players"] or None)
+        self.plan_thread = CapacityPlanThread(planner, self.metrics, self.config_history, current_settings, self)
+        self.plan_thread.planned.connect(self.capacity_planned)
+        self.plan_button.setEnabled(False)
+        self.plan_button.setText("Planning...")
+        self.plan_thread.start()
+
+    def capacity_planned(self, plan, error):
+        self.plan_button.setEnabled(True)
+        self.plan_button.setText("Plan Settings")
+        if error:
+            QMessageBox.critical(self, "Error", f"Capacity planning failed: {error}")
+            return
+        dialog = ConfigDialog(self.plan_thread.planner.describe(plan), "Capacity Plan", self)
+        dialog.setGeometry(100, 100, 800, 500)
+        dialog.exec_()
+        if not plan["changes"]:
+            return
+        reply = QMessageBox.question(
+            self,
+            "Capacity Plan",
+            "Fill the recommended values into the Server Config and Start Parameters tabs?\n"
+            "Nothing is written until you save them there.",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        config_paths = {
+            "serverMaxViewDistance": "game.gameProperties.serverMaxViewDistance",
+            "networkViewDistance": "game.gameProperties.networkViewDistance",
+            "maxPlayers": "game.maxPlayers",
+        }
+        for key, _, value, _ in plan["changes"]:
+            if key in config_paths:
+                self.set_config_field(config_paths[key], value)
+            elif isinstance(value, bool):
+                self.set_start_field(key, value or None)
+            else:
+                self.set_start_field(key, str(value))
+
+    def network_ports(self):
+        try:
+            with open(self.config_file, 'r') as f:
+                config = json.load(f)
+            ports = {config.get("bindPort") or config.get("publicPort"),
+                     config.get("a2s", {}).get("port"), config.get("rcon", {}).get("port")}
+            return sorted(port for port in ports if isinstance(port, int))
+        except (OSError, ValueError, AttributeError):
+            return []
+
+    def sample_network(self, show_output):
+        sample = self.network.sample(self.network_ports(), NetworkSampler.parse_ip_accounting(show_output))
+        self.metrics.update_network(sample)
+        self.network_summary_label.setText(NetworkSampler.describe(sample))
+        # Drops usually come in bursts, one log line per five minutes is enough.
+        if sample["alerts"] and time.time() - self.last_network_alert > 300:
+            self.last_network_alert = time.time()
+            self.log_event("network", " ".join(sample["alerts"]) + " See Socket Buffer Advice on the Monitoring tab.")
+
+    def show_network_advice(self):
+        advice = self.network.suggestions()
+        if advice:
+            lines = ["Suggested changes:", ""]
+            for name, current, value, reason in advice:
+                lines += [f"{name}: {current} -> {value}", f"  {reason}", ""]
+            lines += ["Put this in a file and apply it as root:", "", NetworkSampler.sysctl_file(advice)]
+        else:
+            lines = ["No changes suggested. No UDP drops were seen and the receive queues stayed well below the buffer size.", ""]
+        sysctls = self.network.read_sysctls()
+        lines += ["Current values:"] + [f"  {name} = {value}" for name, value in sysctls.items()]
+        lines += ["", "Recent samples (newest first):"]
+        for sample in reversed(list(self.network.samples)[-20:]):
+            lines.append(time.strftime('%H:%M:%S', time.localtime(sample["ts"])) + "  " + NetworkSampler.describe(sample))
+        dialog = ConfigDialog("\n".join(lines), "Socket Buffer Advice", self)
+        dialog.setGeometry(100, 100, 900, 500)
+        dialog.exec_()
+
+    def read_unit_journal(self, since, callback):
+        self.run_async([["journalctl", "--user", "-u", self.service_name, "-o", "json", "--no-pager", f"--since={since}"]],
+                       lambda success, output: callback(self.crash_loop_detector.parse_journal(output) if success else []))
+
+    def check_crash_loop(self):
+        self.read_unit_journal(f"-{self.crash_loop_detector.window_seconds // 60}min", self.crash_loop_journal_read)
+
+    def crash_loop_journal_read(self, events):
+        detector = self.crash_loop_detector
+        fast_exits = detector.fast_exits(events, time.time())
+        if len(fast_exits) < detector.max_fast_exits or fast_exits[-1] == self.crash_loop_reported:
+            return
+        self.crash_loop_reported = fast_exits[-1]
+        message = (f"Crash loop detected: {len(fast_exits)} exits within {detector.min_uptime}s of starting "
+                   f"in the last {detector.window_seconds // 60} min.")
+        self.crash_loop_status_label.setText(self.log_event("crash-loop", message))
+        if self.settings["crash_loop_auto_safe_mode"]:
+            self.enter_safe_mode()
+
+    def toggle_auto_safe_mode(self, checked):
+        self.settings["crash_loop_auto_safe_mode"] = checked
+        self.save_settings()
+
+    def install_restart_backoff(self):
+        dropin_dir = os.path.expanduser(f"~/.config/systemd/user/{self.service_name}.d")
+        dropin_file = os.path.join(dropin_dir, "backoff.conf")
+        content = self.crash_loop_detector.backoff_dropin()
+        reply = QMessageBox.question(
+            self,
+            "Install Restart Backoff",
+            f"This will write {dropin_file} with:\n\n{content}\nand reload systemd. Continue?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        try:
+            os.makedirs(dropin_dir, exist_ok=True)
+            with open(dropin_file, 'w') as f:
+                f.write(content)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to write {dropin_file}: {e}")
+            return
+        self.run_async([["systemctl", "--user", "daemon-reload"]], self.restart_backoff_installed)
+
+    def restart_backoff_installed(self, success, output):
+        if success:
+            QMessageBox.information(self, "Success", "Restart backoff installed. It applies from the next start of the service.")
+        else:
+            QMessageBox.critical(self, "Error", f"Failed to reload systemd: {output}")
+
+    def recently_changed_mods(self, current_mods, since):
+        # Mods that are configured but not downloaded yet count as changed, they
+        # are fetched on every start and are the usual cause of a bad restart.
+        changed = []
+        newest = None
+        for mod in current_mods:
+            addon_path = self.meta_paths.get(mod.get("modId", ""))
+            if not addon_path:
+                changed.append(mod)
+                continue
+            try:
+                mtime = max(os.path.getmtime(addon_path), os.path.getmtime(os.path.join(addon_path, "meta")))
+            except OSError:
+                continue
+            if since is not None and mtime > since:
+                changed.append(mod)
+            if newest is None or mtime > newest[0]:
+                newest = (mtime, mod)
+        if not changed and since is None and newest:
+            changed.append(newest[1])
+        return changed
+
+    def enter_safe_mode(self, callback=None):
+        # The journal read runs in the background, callback gets whether safe mode was entered.
+        callback = callback or (lambda entered: None)
+        self.read_unit_journal("-1day", lambda events: callback(self.disable_suspect_mods(events)))
+
+    def disable_suspect_mods(self, events):
+        try:
+            with open(self.config_file, 'r') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            self.crash_loop_status_label.setText(self.log_event("crash-loop", f"Safe mode failed, cannot read {self.config_file}: {e}"))
+            return False
+        current_mods = config.get("game", {}).get("mods", [])
+        since = self.crash_loop_detector.last_stable_start(events)
+        suspects = self.recently_changed_mods(current_mods, since)
+        if not suspects:
+            self.crash_loop_status_label.setText(self.log_event("crash-loop", "Safe mode skipped, no recently changed mods found."))
+            return False
+        suspect_ids = {mod.get("modId") for mod in suspects}
+        safe_mode_file = os.path.join(self.state_dir, "safe-mode.json")
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            disabled = []
+            if os.path.exists(safe_mode_file):
+                with open(safe_mode_file, 'r') as f:
+                    disabled = json.load(f).get("mods", [])
+            with open(safe_mode_file, 'w') as f:
+                # A mod re-enabled by hand and caught again is listed once, with its latest entry.
+                mods = list({mod.get("modId"): mod for mod in disabled + suspects}.values())
+                json.dump({"timestamp": time.time(), "mods": mods}, f, indent=2)
+        except (OSError, ValueError) as e:
+            self.crash_loop_status_label.setText(self.log_event("crash-loop", f"Safe mode failed: {e}"))
+            return False
+        success, output = self.update_config_mods(lambda mods: [mod for mod in mods if mod.get("modId") not in suspect_ids])
+        if not success:
+            self.crash_loop_status_label.setText(self.log_event("crash-loop", f"Safe mode failed to write {self.config_file}: {output}"))
+            return False
+        names = ", ".join(f"{mod.get('modId')} ({mod.get('name', 'Unknown')})" for mod in suspects)
+        self.crash_loop_status_label.setText(self.log_event("crash-loop", f"Safe mode: disabled {names}, restarting."))
+        # reset-failed may fail when the unit is not in a failed state, restart either way.
+        self.run_async(self.systemctl_commands("reset-failed"), lambda success, output: self.restart_unit())
+        self.update_mods_display()
+        return True
+
+    def start_safe_mode(self):
+        reply = QMessageBox.question(
+            self,
+            "Confirm Safe Mode",
+            "Disable the mods that changed since the server last ran stable and restart the service?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self.enter_safe_mode(lambda entered: entered or QMessageBox.warning(self, "Safe Mode", self.crash_loop_status_label.text()))
+
+    def restore_safe_mode_mods(self):
+        safe_mode_file = os.path.join(self.state_dir, "safe-mode.json")
+        if not os.path.exists(safe_mode_file):
+            QMessageBox.information(self, "Safe Mode", "No mods were disabled by safe mode.")
+            return
+        try:
+            with open(safe_mode_file, 'r') as f:
+                disabled = json.load(f).get("mods", [])
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Failed to read {safe_mode_file}: {e}")
+            return
+        restored = []
+
+        def restore(mods):
+            # Mods put back by hand in the meantime are already there and not counted.
+            present = {mod.get("modId") for mod in mods}
+            restored[:] = list({mod.get("modId"): mod for mod in disabled if mod.get("modId") not in present}.values())
+            return mods + restored
+        success, output = self.update_config_mods(restore)
+        if success:
+            os.remove(safe_mode_file)
+            self.log_event("crash-loop", f"Restored {len(restored)} mod(s) disabled by safe mode.")
+            QMessageBox.information(self, "Success", f"Restored {len(restored)} mod(s). Restart service to apply changes.")
+            self.update_mods_display()
+        else:
+            QMessageBox.critical(self, "Error", f"Failed to restore mods: {output}")
+
+    def build_watchdog(self):
+        return TrendWatchdog(
+            rss_limit_mb=self.settings["watchdog_rss_limit_mb"],
+            fps_floor=self.settings["watchdog_fps_floor"],
+            window_minutes=self.settings["watchdog_window_minutes"],
+            horizon_minutes=self.settings["watchdog_horizon_minutes"],
+        )
+
+    def apply_watchdog_settings(self):
+        validations = [
+            (self.watchdog_rss_limit_input, "watchdog_rss_limit_mb", "Memory Limit", 512, 262144),
+            (self.watchdog_fps_floor_input, "watchdog_fps_floor", "FPS Floor", 1, SERVER_FPS_BUDGET),
+            (self.watchdog_window_input, "watchdog_window_minutes", "Trend Window", 10, 1440),
+            (self.watchdog_horizon_input, "watchdog_horizon_minutes", "Projection Horizon", 5, 1440),
+            (self.watchdog_grace_input, "watchdog_grace_minutes", "Restart Grace Period", 0, 120),
+        ]
+        for input_field, key, field_name, min_val, max_val in validations:
+            is_valid, error_msg = self.validate_integer_input(input_field.text(), field_name, min_val, max_val)
+            if not is_valid:
+                QMessageBox.critical(self, "Error", error_msg)
+                return
+        for input_field, key, _, _, _ in validations:
+            self.settings[key] = int(input_field.text())
+        self.settings["watchdog_enabled"] = self.watchdog_checkbox.isChecked()
+        self.save_settings()
+        self.watchdog = self.build_watchdog()
+        if not self.settings["watchdog_enabled"]:
+            self.cancel_watchdog_restart()
+        QMessageBox.information(self, "Watchdog", "Watchdog settings saved.")
+
+    def check_watchdog(self):
+        if not self.settings["watchdog_enabled"] or self.watchdog_restart_timer.isActive():
+            return
+        reasons = self.watchdog.evaluate(self.metrics.samples)
+        if reasons:
+            grace = self.settings["watchdog_grace_minutes"]
+            self.log_watchdog(f"Graceful restart scheduled in {grace} min: " + "; ".join(reasons))
+            self.watchdog_restart_timer.start(grace * 60000)
+
+    def cancel_watchdog_restart(self):
+        if self.watchdog_restart_timer.isActive():
+            self.watchdog_restart_timer.stop()
+            self.log_watchdog("Scheduled restart cancelled.")
+
+    def run_watchdog_restart(self):
+        self.restart_unit(lambda success, output: self.log_watchdog("Restart completed." if success else f"Restart failed: {output.strip()}"))
+
+    def log_watchdog(self, message):
+        self.watchdog_status_label.setText(self.log_event("watchdog", message))
+
+    def log_event(self, source, message):
+        line = f"{time.strftime('%Y-%m-%d %H:%M:%S')} {source}: {message}"
+        self.append_log_lines([line])
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            with open(os.path.join(self.state_dir, "events.log"), 'a') as f:
+                f.write(line + "\n")
+        except OSError:
+            pass
+        return line
+
+    def start_metrics_exporter(self, show_errors=True):
+        self.stop_metrics_exporter()
+        try:
+            self.metrics_exporter = MetricsExporter(self.metrics, self.settings["metrics_exporter_port"])
+            self.metrics_exporter.start()
+        except OSError as e:
+            self.metrics_exporter = None
+            if show_errors:
+                QMessageBox.critical(self, "Error", f"Failed to start metrics exporter: {e}")
+            return False
+        return True
+
+    def stop_metrics_exporter(self):
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
+
+    def apply_exporter_settings(self):
+        is_valid, error_msg = self.validate_integer_input(self.exporter_port_input.text(), "Exporter Port", 1024, 65535)
+        if not is_valid:
+            QMessageBox.critical(self, "Error", error_msg)
+            return
+        self.settings["metrics_exporter_enabled"] = self.exporter_checkbox.isChecked()
+        self.settings["metrics_exporter_port"] = int(self.exporter_port_input.text())
+        self.save_settings()
+        if not self.settings["metrics_exporter_enabled"]:
+            self.stop_metrics_exporter()
+            QMessageBox.information(self, "Exporter", "Metrics exporter disabled.")
+        elif self.start_metrics_exporter():
+            QMessageBox.information(
+                self, "Exporter",
+                f"Metrics exporter listening on http://127.0.0.1:{self.metrics_exporter.port}/metrics"
+            )
+
+    def probe_targets(self):
+        text = self.settings["a2s_probe_targets"].strip()
+        if text:
+            return [A2SProbe.parse_target(target) for target in text.split(",") if target.strip()]
+        port = 17777
+        try:
+            with open(self.config_file, 'r') as f:
+                port = int(json.load(f).get("a2s", {}).get("port", port))
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+        return [("127.0.0.1", port)]
+
+    def start_probe_worker(self):
+        self.stop_probe_worker()
+        self.probe_worker = A2SProbeWorker(self.metrics, self.probe_targets(), self.settings["a2s_probe_interval"])
+        self.probe_worker.start()
+
+    def stop_probe_worker(self):
+        if self.probe_worker:
+            self.probe_worker.stop()
+            self.probe_worker = None
+        self.metrics.clear_probes()
+
+    def apply_probe_settings(self):
+        is_valid, error_msg = self.validate_integer_input(self.probe_interval_input.text(), "Probe Interval", 5, 3600)
+        if not is_valid:
+            QMessageBox.critical(self, "Error", error_msg)
+            return
+        previous_targets = self.settings["a2s_probe_targets"]
+        self.settings["a2s_probe_targets"] = self.probe_targets_input.text().strip()
+        try:
+            targets = self.probe_targets()
+        except ValueError as e:
+            self.settings["a2s_probe_targets"] = previous_targets
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        self.settings["a2s_probe_enabled"] = self.probe_checkbox.isChecked()
+        self.settings["a2s_probe_interval"] = int(self.probe_interval_input.text())
+        self.save_settings()
+        if self.settings["a2s_probe_enabled"]:
+            self.start_probe_worker()
+            QMessageBox.information(self, "A2S Probe", "Probing " + ", ".join(f"{host}:{port}" for host, port in targets))
+        else:
+            self.stop_probe_worker()
+            QMessageBox.information(self, "A2S Probe", "A2S probe disabled.")
+
+    def update_snapshot_list(self):
+        self.snapshot_list.clear()
+        for name in reversed(self.snapshots.names()):
+            try:
+                text = ProfileSnapshots.describe(name, self.snapshots.load(name))
+            except (OSError, ValueError, KeyError):
+                text = f"{name}  (unreadable)"
+            item = QListWidgetItem(text)
+            item.setData(Qt.UserRole, name)
+            self.snapshot_list.addItem(item)
+
+    def create_snapshot(self):
+        is_valid, error_msg = self.validate_integer_input(self.snapshot_keep_input.text(), "Snapshots to Keep", 1, 365)
+        if not is_valid:
+            QMessageBox.critical(self, "Error", error_msg)
+            return
+        self.settings["snapshot_keep"] = int(self.snapshot_keep_input.text())
+        self.save_settings()
+        if self.snapshot_process.state() != QProcess.NotRunning:
+            return
+        # Same low priority job the restart timer runs, so it never competes with the server.
+        self.snapshot_button.setEnabled(False)
+        self.snapshot_started = time.perf_counter()
+        self.snapshot_process.start("nice", ["-n", "19", "ionice", "-c", "3", sys.executable, os.path.abspath(__file__),
+                                             "--snapshot", "--keep-snapshots", str(self.settings["snapshot_keep"])])
+
+    def snapshot_finished(self, exit_code, exit_status):
+        self.snapshot_button.setEnabled(True)
+        self.telemetry.record("process", "snapshot", time.perf_counter() - self.snapshot_started, exit_code == 0)
+        output = bytes(self.snapshot_process.readAllStandardOutput()).decode(errors="replace").strip()
+        self.log_event("snapshot", output or f"Snapshot exited with code {exit_code}.")
+        self.update_snapshot_list()
+        if exit_code != 0:
+            QMessageBox.critical(self, "Error", f"Snapshot failed: {output}")
+
+    def restore_snapshot(self):
+        item = self.snapshot_list.currentItem()
+        if not item:
+            QMessageBox.warning(self, "Warning", "Select a snapshot to restore.")
+            return
+        name = item.data(Qt.UserRole)
+        target_dir = os.path.expanduser(f"~/arma/profile-restore-{name}")
+        reply = QMessageBox.question(
+            self,
+            "Confirm Restore",
+            f"Restore snapshot {name} to {target_dir}?\nYour current profile is not touched; stop the server and copy back the files you need.",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        try:
+            count = self.snapshots.restore(name, target_dir)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to restore snapshot: {e}")
+            return
+        self.log_event("snapshot", f"Restored {count} files from {name} to {target_dir}.")
+        QMessageBox.information(self, "Success", f"Restored {count} files to {target_dir}.")
+
+    def record_revision(self, file_name, data, source):
+        try:
+            if self.config_history.record(file_name, data, source):
+                self.update_history_list()
+        except (OSError, ValueError) as e:
+            self.log_event("history", f"Could not record {file_name}: {e}")
+
+    def update_history_list(self):
+        if not hasattr(self, "history_list"):
+            return
+        self.history_list.clear()
+        for revision in reversed(self.config_history.revisions[-500:]):
+            text = (f"r{revision['rev']}  {time.strftime('%Y-%m-%d %H:%M', time.localtime(revision['ts']))}  "
+                    f"{revision['file']} ({revision['source']}): {self.config_history.changes(revision['rev'])}")
+            metrics = ConfigHistory.describe_metrics(revision.get("metrics"))
+            if metrics:
+                text += f"  |  after applying: {metrics}"
+            item = QListWidgetItem(text)
+            item.setData(Qt.UserRole, revision["rev"])
+            self.history_list.addItem(item)
+
+    def show_history_diff(self):
+        revs = sorted(item.data(Qt.UserRole) for item in self.history_list.selectedItems())
+        try:
+            if len(revs) == 1:
+                previous = self.config_history.previous(revs[0])
+                if previous is None:
+                    self.history_diff_view.setPlainText(self.config_history.render(revs[0]))
+                    return
+                revs.insert(0, previous["rev"])
+            if len(revs) != 2:
+                self.history_diff_view.clear()
+                return
+            self.history_diff_view.setPlainText(self.config_history.diff(revs[0], revs[1]))
+        except (KeyError, ValueError, IndexError) as e:
+            self.history_diff_view.setPlainText(f"Cannot compare: {e}")
+
+    def rollback_revision(self):
+        items = self.history_list.selectedItems()
+        if len(items) != 1:
+            QMessageBox.warning(self, "Warning", "Select the one revision to roll back to.")
+            return
+        rev = items[0].data(Qt.UserRole)
+        revision = self.config_history.get(rev)
+        file_name = revision["file"]
+        reply = QMessageBox.question(
+            self,
+            "Confirm Rollback",
+            f"Replace {file_name} with r{rev} from {time.strftime('%Y-%m-%d %H:%M', time.localtime(revision['ts']))}?\n"
+            "Unsaved changes on the form are discarded.",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        path = self.history_paths[file_name]
+        try:
+            content = self.config_history.render(rev)
+            _, digest = ConfigFile.read(path)
+            if not ConfigFile.write_if_unchanged(path, digest, content, mode=0o755 if file_name == "start.sh" else None):
+                QMessageBox.critical(self, "Error", f"{file_name} changed while rolling back. Please try again.")
+                return
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to roll back {file_name}: {e}")
+            return
+        self.record_revision(file_name, content, f"rollback to r{rev}")
+        if file_name == "server.json":
+            self.load_config()
+            self.update_mods_display()
+        else:
+            self.load_start_params()
+        self.log_event("history", f"Rolled back {file_name} to r{rev}.")
+        QMessageBox.information(self, "Success", f"{file_name} rolled back to r{rev}. Restart service to apply changes.")
+
+    def tag_revisions(self):
+        # A revision is applied when the server process starts after it was
+        # written; older unapplied revisions of the same file never ran.
+        history = self.config_history
+        started_at = self.metrics.process["started_at"]
+        changed = False
+        if started_at and started_at != self.last_server_start:
+            self.last_server_start = started_at
+            pending = history.untagged(since=started_at)
+            applied = history.latest_per_file(pending)
+            for revision in pending:
+                history.tag(revision["rev"], {"applied": started_at if revision in applied else None})
+                changed = True
+        now = time.time()
+        for revision in history.revisions:
+            if not revision.get("applied") or "metrics" in revision:
+                continue
+            if now < revision["applied"] + history.TAG_DELAY + history.TAG_WINDOW:
+                continue
+            since = revision["applied"] + history.TAG_DELAY
+            samples = [sample for sample in self.metrics.samples if sample["ts"] >= since]
+            if not samples or samples[0]["ts"] > since + 60:
+                samples = self.metrics.read_history(since)
+            history.tag(revision["rev"], {"metrics": history.summarize_samples(samples, revision["applied"])})
+            changed = True
+        if changed:
+            self.update_history_list()
+
+    def index_scenarios(self):
+        if self.scenario_index_thread and self.scenario_index_thread.isRunning():
+            return
+        self.rescan_scenarios_button.setEnabled(False)
+        self.scenario_index_thread = ScenarioIndexThread(self.mod_catalog, self)
+        self.scenario_index_thread.indexed.connect(self.scenarios_indexed)
+        self.scenario_index_thread.start()
 
-        # Inline: Join Queue Max Size
-        self.join_queue_size_input = QLineEdit()
-        self.join_queue_size_input.setPlaceholderText("0-50")
-        join_queue_layout = QHBoxLayout()
-        join_queue_layout.addWidget(QLabel("Join Queue Max Size:"))
-        join_queue_layout.addWidget(self.join_queue_size_input)
-        self.config_layout.addLayout(join_queue_layout)
+    def scenarios_indexed(self, scanned):
+        self.rescan_scenarios_button.setEnabled(True)
+        if scanned:
+            self.update_scenarios()
 
-        # Buttons
-        button_layout = QHBoxLayout()
-        self.save_config_button = QPushButton("Save Configuration")
-        self.review_config_button = QPushButton("Review Config")
-        self.save_config_button.clicked.connect(self.save_config)
-        self.review_config_button.clicked.connect(self.review_config)
-        button_layout.addWidget(self.save_config_button)
-        button_layout.addWidget(self.review_config_button)
-        self.config_layout.addLayout(button_layout)
-        self.config_layout.addStretch()
-        self.tabs.addTab(self.config_scroll, "Server Config")
+    def update_scenarios(self):
+        vanilla_ids = {scenario_id for scenario_id, _ in self.builtin_scenarios}
+        vanilla = []
+        modded = []
+        for scenario_id, description, mod_name in self.mod_catalog.scenarios():
+            if mod_name:
+                modded.append((scenario_id, f"{description} [{mod_name}]"))
+            elif scenario_id not in vanilla_ids:
+                vanilla.append((scenario_id, description))
+        scenarios = []
+        seen = set()
+        for scenario in self.builtin_scenarios + sorted(vanilla, key=lambda s: s[1]) + sorted(modded, key=lambda s: s[1]):
+            if scenario[0] not in seen:
+                seen.add(scenario[0])
+                scenarios.append(scenario)
+        if scenarios == self.scenarios:
+            return
+        current = self.custom_scenario_input.text().strip() or self.scenarios[self.scenario_combo.currentIndex()][0]
+        self.scenarios = scenarios
+        self.scenario_combo.clear()
+        self.scenario_combo.addItems([desc for _, desc in self.scenarios])
+        self.select_scenario(current)
 
-        # Mod Management Tab
-        self.mods_tab = QWidget()
-        self.mods_layout = QVBoxLayout(self.mods_tab)
-        self.mods_scroll = QScrollArea()
-        self.mods_scroll.setWidgetResizable(True)
-        self.mods_container = QWidget()
-        self.mods_container_layout = QVBoxLayout(self.mods_container)
-        self.mods_scroll.setWidget(self.mods_container)
-        self.mods_layout.addWidget(QLabel("Mod Management:"))
-        self.mods_layout.addWidget(self.mods_scroll)
-        button_layout = QHBoxLayout()
-        self.add_mod_button = QPushButton("Add Mod")
-        self.apply_mods_button = QPushButton("Apply Mod Changes")
-        self.sync_mods_button = QPushButton("Sync Mod Names")
-        self.disable_mods_button = QPushButton("Disable All Mods")
-        self.enable_mods_button = QPushButton("Enable All Mods")
-        self.add_mod_button.clicked.connect(self.add_mod)
-        self.apply_mods_button.clicked.connect(self.apply_mod_changes)
-        self.sync_mods_button.clicked.connect(self.sync_mods)
-        self.disable_mods_button.clicked.connect(self.disable_mods)
-        self.enable_mods_button.clicked.connect(self.enable_mods)
-        button_layout.addWidget(self.add_mod_button)
-        button_layout.addWidget(self.apply_mods_button)
-        button_layout.addWidget(self.sync_mods_button)
-        button_layout.addWidget(self.disable_mods_button)
-        button_layout.addWidget(self.enable_mods_button)
-        self.mods_layout.addLayout(button_layout)
-        self.mod_review_button = QPushButton("Review Config")
-        self.mod_review_button.clicked.connect(self.review_config)
-        self.mods_layout.addWidget(self.mod_review_button)
-        self.tabs.addTab(self.mods_tab, "Mod Management")
+    def select_scenario(self, current_scenario):
+        for i, (scenario_id, desc) in enumerate(self.scenarios):
+            if scenario_id == current_scenario:
+                self.scenario_combo.setCurrentIndex(i)
+                self.custom_scenario_input.clear()
+                return True
+        self.custom_scenario_input.setText(current_scenario)
+        return False
 
-        # Start Parameters Tab
-        self.start_params_tab = QWidget()
-        self.start_params_layout = QVBoxLayout(self.start_params_tab)
-        self.start_params_layout.addWidget(QLabel("Start Parameters (modifies ~/arma/start.sh):"))
-        self.install_update_checkbox = QCheckBox("Enable Install/Update ($HOME/arma/install.sh)")
-        self.start_params_layout.addWidget(self.install_update_checkbox)
-        self.max_fps_checkbox = QCheckBox("Enable Max FPS")
-        self.max_fps_input = QLineEdit()
-        self.max_fps_input.setPlaceholderText("e.g., 60 (1-240)")
-        self.log_stats_checkbox = QCheckBox("Enable Log Stats")
-        self.log_stats_input = QLineEdit()
-        self.log_stats_input.setPlaceholderText("e.g., 60000 (ms, 1000-3600000)")
-        self.keep_num_logs_checkbox = QCheckBox("Enable Keep Number of Logs")
-        self.keep_num_logs_input = QLineEdit()
-        self.keep_num_logs_input.setPlaceholderText("e.g., 5 (1-100)")
-        self.ai_limit_checkbox = QCheckBox("Enable AI Limit")
-        self.ai_limit_input = QLineEdit()
-        self.ai_limit_input.setPlaceholderText("e.g., 150 (0-1000)")
-        self.auto_reload_checkbox = QCheckBox("Enable Auto Reload")
-        self.auto_reload_input = QLineEdit()
-        self.auto_reload_input.setPlaceholderText("e.g., 30 (seconds, 10-120)")
-        self.auto_shutdown_checkbox = QCheckBox("Enable Auto Shutdown")
-        self.load_session_save_checkbox = QCheckBox("Enable Load Session Save")
-        self.load_session_save_input = QLineEdit()
-        self.load_session_save_input.setPlaceholderText("e.g., MySaveFile (optional)")
-        self.log_voting_checkbox = QCheckBox("Enable Log Voting")
-        self.disable_ai_checkbox = QCheckBox("Enable Disable AI")
-        self.encode_as_long_jobs_checkbox = QCheckBox("Enable rplEncodeAsLongJobs (Can Help With Performance)")
-        self.disable_nav_mesh_checkbox = QCheckBox("Enable disableNavmeshStreaming (Can Help With Performance)")
-        param_widgets = [
-            (self.max_fps_checkbox, self.max_fps_input, "Max FPS (1-240):"),
-            (self.log_stats_checkbox, self.log_stats_input, "Log Stats (ms, 1000-3600000):"),
-            (self.keep_num_logs_checkbox, self.keep_num_logs_input, "Keep Number of Logs (1-100):"),
-            (self.ai_limit_checkbox, self.ai_limit_input, "AI Limit (0-1000):"),
-            (self.auto_reload_checkbox, self.auto_reload_input, "Auto Reload (seconds, 10-120):"),
-            (self.auto_shutdown_checkbox, None, ""),
-            (self.load_session_save_checkbox, self.load_session_save_input, "Load Session Save (optional):"),
-            (self.log_voting_checkbox, None, ""),
-            (self.disable_ai_checkbox, None, ""),
-            (self.encode_as_long_jobs_checkbox, None, ""),
-            (self.disable_nav_mesh_checkbox, None, ""),
-        ]
-        for checkbox, input_field, label_text in param_widgets:
-            layout = QHBoxLayout()
-            layout.addWidget(checkbox)
-            if input_field:
-                layout.addWidget(QLabel(label_text))
-                layout.addWidget(input_field)
-            else:
-                layout.addStretch()
-            self.start_params_layout.addLayout(layout)
-        button_layout = QHBoxLayout()
-        self.save_start_params_button = QPushButton("Save Start Parameters")
-        self.review_start_params_button = QPushButton("Review Start Script")
-        self.save_start_params_button.clicked.connect(self.save_start_params)
-        self.review_start_params_button.clicked.connect(self.review_start_params)
-        button_layout.addWidget(self.save_start_params_button)
-        button_layout.addWidget(self.review_start_params_button)
-        self.start_params_layout.addLayout(button_layout)
-        self.start_params_layout.addStretch()
-        self.tabs.addTab(self.start_params_tab, "Start Parameters")
+    def sample_disk_usage(self):
+        # Remeasured every 10 minutes, or on the next sample after the mods changed.
+        if self.disk_usage_thread and self.disk_usage_thread.isRunning():
+            return
+        if self.disk_usage_measured is not None and time.monotonic() - self.disk_usage_measured < 600:
+            return
+        self.disk_usage_thread = DiskUsageThread(self.addons_dir, self)
+        self.disk_usage_thread.measured.connect(self.disk_usage_sampled)
+        self.disk_usage_thread.start()
 
-        self.load_config()
-        self.update_mods_display()
-        self.load_start_params()
-        self.apply_light_theme()
+    def disk_usage_sampled(self, disk_bytes):
+        self.disk_usage_measured = time.monotonic()
+        self.metrics.update_disk_usage(disk_bytes)
 
     def apply_light_theme(self):
         palette = QPalette()
@@ -475,70 +4004,220 @@ class ArmaServerControlApp(QMainWindow):
             self.theme_button.setText("Switch to Dark Theme")
 
     def start_logging(self):
-        self.log_window.clear()
-        self.log_process.start(f"journalctl --user -u {self.service_name} -f")
-        if not self.log_process.waitForStarted():
+        self.log_model.clear()
+        with self.telemetry.span("process", "journalctl -f start") as span:
+            self.log_process.start("journalctl", ["--user", "-u", self.service_name, "-f"])
+            span["ok"] = self.log_process.waitForStarted()
+        if not span["ok"]:
             error = self.log_process.errorString()
-            self.log_window.append(f"Error: Failed to start journalctl for {self.service_name}. "
-                                  f"QProcess error: {error}. "
-                                  "Ensure the service exists and you have permission to access logs. "
-                                  "Try running 'journalctl --user -u arma.service -f' manually to verify.")
+            self.append_log_lines([f"Error: Failed to start journalctl for {self.service_name}. "
+                                   f"QProcess error: {error}. "
+                                   "Ensure the service exists and you have permission to access logs. "
+                                   "Try running 'journalctl --user -u arma.service -f' manually to verify."])
 
     def handle_log_output(self):
-        data = self.log_process.readAllStandardOutput().data().decode()
-        self.log_window.append(data.strip())
-        self.log_window.verticalScrollBar().setValue(self.log_window.verticalScrollBar().maximum())
+        with self.telemetry.span("process", "journalctl output"):
+            self.append_log_output(self.log_process.readAllStandardOutput().data().decode())
+
+    def append_log_output(self, data):
+        lines = data.strip().splitlines()
+        for line in lines:
+            self.metrics.ingest_log_line(line)
+        self.append_log_lines(lines)
+
+    def append_log_lines(self, lines):
+        scrollbar = self.log_window.verticalScrollBar()
+        follow = scrollbar.value() >= scrollbar.maximum()
+        self.log_model.append_lines(lines)
+        if follow:
+            self.log_window.scrollToBottom()
+
+    def schedule_log_filter(self):
+        self.log_filter_timer.start()
+
+    def apply_log_filter(self):
+        levels = [level for level, checkbox in self.log_level_checkboxes.items() if checkbox.isChecked()]
+        mod = self.log_mod_input.currentText().strip()
+        # A known mod name also matches its ID, the engine logs either one.
+        mod_terms = [mod] + [mod_id for mod_id, (name, _) in getattr(self, "meta_data", {}).items() if mod and name.lower() == mod.lower()]
+        try:
+            log_filter = LogFilter(levels, self.log_regex_input.text(), mod_terms)
+        except re.error as e:
+            self.log_regex_input.setStyleSheet("color: #FF0000;")
+            self.log_count_label.setText(f"Invalid regex: {e}")
+            return
+        self.log_regex_input.setStyleSheet("")
+        self.log_count_label.setText("Filtering...")
+        self.log_model.set_filter(log_filter)
+
+    def update_log_count(self):
+        self.log_count_label.setText(f"{self.log_model.rowCount():,} of {len(self.log_model.lines):,} lines")
+
+    def update_log_mod_names(self):
+        current = self.log_mod_input.currentText()
+        self.log_mod_input.blockSignals(True)
+        self.log_mod_input.clear()
+        self.log_mod_input.addItems([""] + sorted({name for name, _ in self.meta_data.values() if name != "Unknown"}, key=str.lower))
+        self.log_mod_input.setEditText(current)
+        self.log_mod_input.blockSignals(False)
 
     def closeEvent(self, event):
+        self.metrics_timer.stop()
+        self.commands.cancel()
+        for thread in list(self.command_threads):
+            thread.wait(2000)
+        self.log_model.stop()
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        self.telemetry.stop_cpu_profile(os.path.join(self.state_dir, f"profile-{stamp}.prof"))
+        self.telemetry.stop_memory_trace(os.path.join(self.state_dir, f"tracemalloc-{stamp}.txt"))
+        self.stop_metrics_exporter()
+        self.stop_probe_worker()
+        if self.mod_stage_thread and self.mod_stage_thread.isRunning():
+            self.mod_stage_thread.stager.cancel()
+            self.mod_stage_thread.wait(5000)
+        if self.snapshot_process.state() != QProcess.NotRunning:
+            # A killed snapshot leaves no manifest, its chunks are pruned by the next one.
+            if not self.snapshot_process.waitForFinished(30000):
+                self.snapshot_process.kill()
+        if self.scenario_index_thread and self.scenario_index_thread.isRunning():
+            self.mod_catalog.cancel()
+            self.scenario_index_thread.wait(2000)
+        if self.plan_thread and self.plan_thread.isRunning():
+            self.plan_thread.wait()
+        if self.disk_usage_thread and self.disk_usage_thread.isRunning():
+            self.disk_usage_thread.wait()
         if self.log_process.state() != QProcess.NotRunning:
             self.log_process.terminate()
             if not self.log_process.waitForFinished(2000):
                 self.log_process.kill()
         event.accept()
 
-    def run_command(self, command):
+    def run_async(self, commands, callback, timeout=None):
+        thread = CommandThread(self.commands, commands, timeout, self)
+        self.command_threads.append(thread)
+
+        def finished(success, output):
+            self.command_threads.remove(thread)
+            callback(success, output)
+        thread.done.connect(finished)
+        thread.start()
+        return thread
+
+    def systemctl_commands(self, *args):
+        return [["systemctl", "--user", *args, self.service_name], ["systemctl", *args, self.service_name]]
+
+    def update_config_mods(self, change):
+        # Rewrites game.mods on top of the file as it is now, like save_config,
+        # so edits made elsewhere in server.json while we were busy are kept.
         try:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True)
-            return result.returncode == 0, result.stdout + result.stderr
-        except Exception as e:
+            for attempt in range(3):
+                data, digest = ConfigFile.read(self.config_file)
+                config = json.loads(data)
+                game = config.setdefault("game", {})
+                mods = []
+                seen = set()
+                for mod in change(game.get("mods", [])):
+                    if mod.get("modId") not in seen:
+                        seen.add(mod.get("modId"))
+                        mods.append(mod)
+                game["mods"] = mods
+                content = json.dumps(config, indent=2, ensure_ascii=False) + "\n"
+                if ConfigFile.write_if_unchanged(self.config_file, digest, content):
+                    self.record_revision("server.json", content, "gui")
+                    return True, ""
+            return False, "server.json kept changing while saving. Please try again."
+        except (OSError, ValueError) as e:
             return False, str(e)
 
+    def read_config_mods(self):
+        with open(self.config_file, 'r') as f:
+            return json.load(f).get("game", {}).get("mods", [])
+
+    def traced(self, handler, kind="action"):
+        # Qt passes signal arguments (e.g. clicked's checked flag) the handler may not take.
+        accepted = len(inspect.signature(handler).parameters)
+
+        @functools.wraps(handler)
+        def wrapper(*args):
+            with self.telemetry.span(kind, handler.__name__):
+                return handler(*args[:accepted])
+        return wrapper
+
+    def toggle_cpu_profile(self, checked):
+        if checked:
+            self.telemetry.start_cpu_profile()
+            self.log_event("debug", "CPU profiling started.")
+            return
+        report = self.telemetry.stop_cpu_profile(os.path.join(self.state_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}.prof"))
+        ConfigDialog(report, "CPU Profile", self).exec_()
+
+    def toggle_memory_trace(self, checked):
+        if checked:
+            self.telemetry.start_memory_trace()
+            self.log_event("debug", "Memory tracing started.")
+            return
+        report = self.telemetry.stop_memory_trace(os.path.join(self.state_dir, f"tracemalloc-{time.strftime('%Y%m%d-%H%M%S')}.txt"))
+        ConfigDialog(report, "Memory Trace", self).exec_()
+
+    def show_slowest_operations(self):
+        dialog = ConfigDialog(Telemetry.summary(self.telemetry.read()), "Slowest Operations", self)
+        dialog.setGeometry(100, 100, 900, 500)
+        dialog.exec_()
+
     def update_status_button_color(self):
-        success, output = self.run_command(f"systemctl --user is-active --quiet {self.service_name} && echo 'active' || echo 'inactive'")
-        if not success:
-            success, output = self.run_command(f"systemctl is-active --quiet {self.service_name} && echo 'active' || echo 'inactive'")
-        if success and output.strip() == "active":
+        # is-active exits non-zero when the unit is not running, so the system
+        # instance is only asked when the user unit is not active.
+        self.run_async(self.systemctl_commands("is-active"),
+                       lambda success, output: self.paint_status_button(success and output.strip() == "active"), timeout=10)
+
+    def paint_status_button(self, active):
+        # Orange means systemd says active but the server does not answer queries.
+        probe = self.metrics.primary_probe()
+        if active and probe and not probe["ok"]:
+            self.status_button.setStyleSheet("background-color: #FFA500; color: #000000; font-size: 8pt;")
+        elif active:
             self.status_button.setStyleSheet("background-color: #00FF00; color: #000000; font-size: 8pt;")
         else:
             self.status_button.setStyleSheet("background-color: #FF0000; color: #000000; font-size: 8pt;")
 
+    def control_service(self, action, message, callback=None):
+        # Stopping the server can take a while, the buttons come back when systemctl returns.
+        for button in (self.start_button, self.stop_button, self.restart_button):
+            button.setEnabled(False)
+
+        def finished(success, output):
+            for button in (self.start_button, self.stop_button, self.restart_button):
+                button.setEnabled(True)
+            if success and action in ("start", "restart"):
+                self.metrics.record_control_restart()
+            self.update_status_button_color()
+            if callback:
+                callback(success, output)
+            else:
+                QMessageBox.information(self, "Service", message if success else f"Error: {output}")
+        self.run_async(self.systemctl_commands(action), finished, timeout=180)
+
     def start_service(self):
-        success, output = self.run_command(f"systemctl --user start {self.service_name}")
-        if not success:
-            success, output = self.run_command(f"systemctl start {self.service_name}")
-        QMessageBox.information(self, "Service", "Service started" if success else f"Error: {output}")
-        self.update_status_button_color()
+        self.control_service("start", "Service started")
 
     def stop_service(self):
-        success, output = self.run_command(f"systemctl --user stop {self.service_name}")
-        if not success:
-            success, output = self.run_command(f"systemctl stop {self.service_name}")
-        QMessageBox.information(self, "Service", "Service stopped" if success else f"Error: {output}")
-        self.update_status_button_color()
+        self.control_service("stop", "Service stopped")
+
+    def restart_unit(self, callback=None):
+        self.control_service("restart", "Service restarted", callback or (lambda success, output: None))
 
     def restart_service(self):
-        success, output = self.run_command(f"systemctl --user restart {self.service_name}")
-        if not success:
-            success, output = self.run_command(f"systemctl restart {self.service_name}")
-        QMessageBox.information(self, "Service", "Service restarted" if success else f"Error: {output}")
-        self.update_status_button_color()
+        self.control_service("restart", "Service restarted")
 
     def show_status(self):
-        success, output = self.run_command(f"systemctl --user is-active --quiet {self.service_name} && echo 'Running' || echo 'Stopped'")
-        if not success:
-            success, output = self.run_command(f"systemctl is-active --quiet {self.service_name} && echo 'Running' || echo 'Stopped'")
-        if success:
-            QMessageBox.information(self, "Service Status", output.strip())
+        self.run_async(self.systemctl_commands("is-active"), self.status_received, timeout=10)
+
+    def status_received(self, success, output):
+        state = output.strip()
+        if success or state in ("inactive", "failed", "activating", "deactivating", "reloading", "unknown"):
+            probe = self.metrics.primary_probe()
+            status = ("Running" if success else "Stopped") + (f"\n{A2SProbe.describe(probe)}" if probe else "")
+            QMessageBox.information(self, "Service Status", status)
         else:
             QMessageBox.critical(self, "Service Status", f"Error: {output}")
 
@@ -547,55 +4226,165 @@ class ArmaServerControlApp(QMainWindow):
             QMessageBox.critical(self, "Error", f"Config file {self.config_file} not found.")
             return
         try:
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
-            self.ip_input.setText(config.get("publicAddress", ""))
-            self.port_input.setText(str(config.get("publicPort", 2001)))
-            self.name_input.setText(config.get("game", {}).get("name", ""))
-            self.game_password_input.setText(config.get("game", {}).get("password", ""))
-            self.admin_password_input.setText(config.get("game", {}).get("passwordAdmin", ""))
-            admins = config.get("game", {}).get("admins", [])
-            self.admins_input.setText("\n".join(admins))
-            current_scenario = config.get("game", {}).get("scenarioId", "")
-            scenario_found = False
-            for i, (scenario_id, desc) in enumerate(self.scenarios):
-                if scenario_id == current_scenario:
-                    self.scenario_combo.setCurrentIndex(i)
-                    scenario_found = True
-                    break
-            if not scenario_found:
-                self.custom_scenario_input.setText(current_scenario)
-            else:
-                self.custom_scenario_input.clear()
-            self.max_players_input.setText(str(config.get("game", {}).get("maxPlayers", 6)))
-            self.crossplay_checkbox.setChecked(config.get("game", {}).get("crossPlatform", False))
-            game_props = config.get("game", {}).get("gameProperties", {})
-            self.view_distance_input.setText(str(game_props.get("serverMaxViewDistance", 1600)))
-            self.grass_distance_input.setText(str(game_props.get("serverMinGrassDistance", 50)))
-            self.network_view_distance_input.setText(str(game_props.get("networkViewDistance", 1500)))
-            self.disable_3rd_person_checkbox.setChecked(game_props.get("disableThirdPerson", False))
-            self.battleye_checkbox.setChecked(game_props.get("battlEye", False))
-            self.von_disable_ui_checkbox.setChecked(game_props.get("VONDisableUI", False))
-            self.von_disable_direct_speech_checkbox.setChecked(game_props.get("VONDisableDirectSpeechUI", False))
-            self.von_transmit_cross_faction_checkbox.setChecked(game_props.get("VONCanTransmitCrossFaction", False))
-            operating = config.get("operating", {}).get("joinQueue", {})
-            self.join_queue_size_input.setText(str(operating.get("maxSize", 0)))
+            data, self.config_seen_digest = ConfigFile.read(self.config_file)
+            self.config_base = self.config_field_values(json.loads(data))
+            self.record_revision("server.json", data, "disk")
+            for path in self.config_base:
+                self.set_config_field(path, self.config_base[path])
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load config: {e}")
 
-    def validate_ip(self, ip):
-        if not ip:
-            return False
+    def config_field(self, path):
+        for field in self.config_fields:
+            if field[0] == path:
+                return field
+        raise KeyError(path)
+
+    def config_field_values(self, config):
+        values = {}
+        for path, widget, kind, default, label in self.config_fields:
+            value = ConfigFile.get_path(config, path, default)
+            if kind == "int":
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    pass
+            elif kind == "bool":
+                value = bool(value)
+            elif kind == "lines":
+                value = list(value) if isinstance(value, list) else []
+            else:
+                value = "" if value is None else str(value)
+            values[path] = value
+        return values
+
+    def get_config_field(self, path):
+        _, widget, kind, _, _ = self.config_field(path)
+        if kind == "int":
+            try:
+                return int(widget.text())
+            except ValueError:
+                return widget.text()
+        if kind == "bool":
+            return widget.isChecked()
+        if kind == "lines":
+            return [line.strip() for line in widget.toPlainText().split('\n') if line.strip()]
+        if kind == "scenario":
+            return self.custom_scenario_input.text().strip() or self.scenarios[self.scenario_combo.currentIndex()][0]
+        return widget.text()
+
+    def set_config_field(self, path, value):
+        _, widget, kind, _, _ = self.config_field(path)
+        if kind == "bool":
+            widget.setChecked(value)
+        elif kind == "lines":
+            widget.setText("\n".join(value))
+        elif kind == "scenario":
+            self.select_scenario(value)
+        else:
+            widget.setText(str(value))
+
+    def describe_conflicts(self, keys, mine, theirs, labels, secret=()):
+        lines = []
+        for key in keys:
+            if key in secret:
+                lines.append(f"{labels[key]}: changed in both places")
+            else:
+                lines.append(f"{labels[key]}: yours = {mine[key]}, file = {theirs[key]}")
+        return "\n".join(lines)
+
+    def resolve_conflicts(self, file_name, details, allow_cancel=True):
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Warning)
+        box.setWindowTitle("File Changed")
+        box.setText(f"{file_name} was changed outside the GUI. These fields were changed both here and in the file:")
+        box.setInformativeText(details)
+        keep_mine = box.addButton("Keep Mine", QMessageBox.AcceptRole)
+        use_file = box.addButton("Use File Version", QMessageBox.DestructiveRole)
+        if allow_cancel:
+            box.addButton(QMessageBox.Cancel)
+        box.exec_()
+        if box.clickedButton() == keep_mine:
+            return "mine"
+        if box.clickedButton() == use_file:
+            return "theirs"
+        return None if allow_cancel else "mine"
+
+    def watch_files(self):
+        watched = set(self.file_watcher.files() + self.file_watcher.directories())
+        paths = {self.config_file, self.start_script, os.path.dirname(self.config_file), os.path.dirname(self.start_script)}
+        missing = [path for path in paths if path not in watched and os.path.exists(path)]
+        if missing:
+            self.file_watcher.addPaths(missing)
+
+    def watched_file_changed(self, path):
+        self.watch_timer.start(300)
+
+    def check_external_changes(self):
+        self.watch_files()
+        self.reload_external_config()
+        self.reload_external_start_params()
+
+    def reload_external_config(self):
         try:
-            octets = ip.split('.')
-            if len(octets) != 4:
-                return False
-            for octet in octets:
-                if not octet.isdigit() or int(octet) < 0 or int(octet) > 255:
-                    return False
-            return True
-        except:
-            return False
+            data, digest = ConfigFile.read(self.config_file)
+            if digest == self.config_seen_digest:
+                return
+            config = json.loads(data)
+        except (OSError, ValueError):
+            # Missing or half written, the next change event will bring us back here.
+            return
+        self.config_seen_digest = digest
+        self.record_revision("server.json", data, "disk")
+        if config.get("game", {}).get("mods", []) != getattr(self, "active_mods", None):
+            self.update_mods_display()
+        theirs = self.config_field_values(config)
+        changed = [path for path in theirs if theirs[path] != self.config_base.get(path)]
+        if not changed:
+            return
+        mine = {path: self.get_config_field(path) for path in changed}
+        edited = [path for path in changed if mine[path] != self.config_base.get(path) and mine[path] != theirs[path]]
+        reload_paths = [path for path in changed if path not in edited]
+        labels = {field[0]: field[4] for field in self.config_fields}
+        if edited:
+            secret = [field[0] for field in self.config_fields if field[2] == "secret"]
+            details = self.describe_conflicts(edited, mine, theirs, labels, secret)
+            if self.resolve_conflicts("server.json", details, allow_cancel=False) == "theirs":
+                reload_paths += edited
+        for path in changed:
+            if path in reload_paths:
+                self.set_config_field(path, theirs[path])
+            self.config_base[path] = theirs[path]
+        if reload_paths:
+            self.log_event("config", "server.json changed on disk, reloaded: " + ", ".join(labels[path] for path in reload_paths))
+
+    def reload_external_start_params(self):
+        try:
+            data, digest = ConfigFile.read(self.start_script)
+        except OSError:
+            return
+        if digest == self.start_seen_digest:
+            return
+        self.start_seen_digest = digest
+        self.record_revision("start.sh", data, "disk")
+        theirs = StartScript.parse(data.decode())
+        changed = [name for name in theirs if theirs[name] != self.start_base.get(name)]
+        if not changed:
+            return
+        mine = {name: self.get_start_field(name) for name in changed}
+        edited = [name for name in changed if mine[name] != self.start_base.get(name) and mine[name] != theirs[name]]
+        reload_names = [name for name in changed if name not in edited]
+        labels = {field[0]: field[3] for field in self.start_param_fields}
+        if edited:
+            details = self.describe_conflicts(edited, mine, theirs, labels)
+            if self.resolve_conflicts("start.sh", details, allow_cancel=False) == "theirs":
+                reload_names += edited
+        for name in changed:
+            if name in reload_names:
+                self.set_start_field(name, theirs[name])
+            self.start_base[name] = theirs[name]
+        if reload_names:
+            self.log_event("config", "start.sh changed on disk, reloaded: " + ", ".join(labels[name] for name in reload_names))
 
     def validate_integer_input(self, value, field_name, min_val, max_val):
         try:
@@ -606,101 +4395,82 @@ class ArmaServerControlApp(QMainWindow):
         except ValueError:
             return False, f"{field_name} must be a valid integer."
 
-    def validate_admins(self, admins_text):
-        uuid_pattern = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
-        guids = [guid.strip() for guid in admins_text.split('\n') if guid.strip()]
-        if len(guids) > 20:
-            return False, "Maximum 20 Player IdentityIds allowed."
-        invalid_guids = []
-        for guid in guids:
-            if not uuid_pattern.match(guid):
-                invalid_guids.append(guid)
-        if invalid_guids:
-            return False, f"Invalid Player IdentityIds (must be 36-character UUIDs): {', '.join(invalid_guids)}"
-        return True, guids
-
-    def validate_scenario_id(self, scenario_id):
-        if not scenario_id:
-            return True, ""
-        pattern = re.compile(r'^\{[0-9A-Fa-f]{16}\}Missions/[\w-]+\.conf$')
-        if pattern.match(scenario_id):
-            return True, ""
-        return False, "Invalid Scenario ID format. Expected: {16-character hex UUID}Missions/<name>.conf"
+    def new_problems(self, config, start_params, current_config, current_start_params):
+        # Only problems this change introduces count, values already on disk in
+        # fields the GUI doesn't edit must not block saving the ones it does.
+        errors, warnings = self.validator.validate(config, start_params)
+        current_errors, current_warnings = self.validator.validate(current_config, current_start_params)
+        return ([error for error in errors if error not in current_errors],
+                [warning for warning in warnings if warning not in current_warnings])
 
-    def validate_save_file_name(self, name):
-        if not name:
-            return True, ""
-        pattern = re.compile(r'^[\w-]{1,50}$')
-        if pattern.match(name):
-            return True, ""
-        return False, "Save file name must be 1-50 alphanumeric characters, underscores, or hyphens."
+    def confirm_valid(self, config, start_params, current_config, current_start_params):
+        new_errors, new_warnings = self.new_problems(config, start_params, current_config, current_start_params)
+        if new_errors:
+            QMessageBox.critical(self, "Error", "Please fix the following:\n\n" + "\n".join(new_errors))
+            return False
+        if not new_warnings:
+            return True
+        reply = QMessageBox.question(
+            self,
+            "Performance Warning",
+            "\n\n".join(new_warnings) + "\n\nSave anyway?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        return reply == QMessageBox.Yes
 
     def save_config(self):
         if not os.path.exists(self.config_file):
             QMessageBox.critical(self, "Error", f"Config file {self.config_file} not found.")
             return
-        if not self.validate_ip(self.ip_input.text()):
-            QMessageBox.critical(self, "Error", "Invalid IP address format (e.g., 123.123.123.123).")
-            return
-        if not self.admin_password_input.text():
-            QMessageBox.critical(self, "Error", "Admin password cannot be empty.")
-            return
-        validations = [
-            (self.port_input.text(), "Public Port", 1024, 65535),
-            (self.max_players_input.text(), "Max Players", 2, 128),
-            (self.view_distance_input.text(), "Max View Distance", 500, 10000),
-            (self.grass_distance_input.text(), "Min Grass Distance", 50, 150),
-            (self.network_view_distance_input.text(), "Network View Distance", 500, 5000),
-            (self.join_queue_size_input.text(), "Join Queue Max Size", 0, 50),
-        ]
-        for value, field_name, min_val, max_val in validations:
-            is_valid, error_msg = self.validate_integer_input(value, field_name, min_val, max_val)
-            if not is_valid:
-                QMessageBox.critical(self, "Error", error_msg)
-                return
-        is_valid, result = self.validate_admins(self.admins_input.toPlainText())
-        if not is_valid:
-            QMessageBox.critical(self, "Error", result)
-            return
-        admin_guids = result
-        custom_scenario = self.custom_scenario_input.text().strip()
-        is_valid, error_msg = self.validate_scenario_id(custom_scenario)
-        if custom_scenario and not is_valid:
-            QMessageBox.critical(self, "Error", error_msg)
-            return
         try:
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
-            config["publicAddress"] = self.ip_input.text()
-            config["publicPort"] = int(self.port_input.text())
-            config.setdefault("game", {})
-            config["game"]["name"] = self.name_input.text() or "Default Server"
-            config["game"]["password"] = self.game_password_input.text()
-            config["game"]["passwordAdmin"] = self.admin_password_input.text()
-            config["game"]["admins"] = admin_guids
-            config["game"]["scenarioId"] = custom_scenario if custom_scenario else self.scenarios[self.scenario_combo.currentIndex()][0]
-            config["game"]["maxPlayers"] = int(self.max_players_input.text())
-            config["game"]["crossPlatform"] = self.crossplay_checkbox.isChecked()
-            config["game"].setdefault("gameProperties", {})
-            config["game"]["gameProperties"]["serverMaxViewDistance"] = int(self.view_distance_input.text())
-            config["game"]["gameProperties"]["serverMinGrassDistance"] = int(self.grass_distance_input.text())
-            config["game"]["gameProperties"]["networkViewDistance"] = int(self.network_view_distance_input.text())
-            config["game"]["gameProperties"]["disableThirdPerson"] = self.disable_3rd_person_checkbox.isChecked()
-            config["game"]["gameProperties"]["battlEye"] = self.battleye_checkbox.isChecked()
-            config["game"]["gameProperties"]["VONDisableUI"] = self.von_disable_ui_checkbox.isChecked()
-            config["game"]["gameProperties"]["VONDisableDirectSpeechUI"] = self.von_disable_direct_speech_checkbox.isChecked()
-            config["game"]["gameProperties"]["VONCanTransmitCrossFaction"] = self.von_transmit_cross_faction_checkbox.isChecked()
-            config.setdefault("operating", {})
-            config["operating"].setdefault("joinQueue", {})
-            config["operating"]["joinQueue"]["maxSize"] = int(self.join_queue_size_input.text())
-            tmp_file = "/tmp/server.json.tmp"
-            with open(tmp_file, 'w') as f:
-                json.dump(config, f)
-            success, output = self.run_command(f"jq . {tmp_file} > {self.config_file}")
-            if success:
-                QMessageBox.information(self, "Success", "Configuration saved. Restart service to apply changes.")
+            mine = {field[0]: self.get_config_field(field[0]) for field in self.config_fields}
+            mine["game.name"] = mine["game.name"] or "Default Server"
+            current_config = json.loads(ConfigFile.read(self.config_file)[0])
+            config = json.loads(json.dumps(current_config))
+            for path, value in mine.items():
+                ConfigFile.set_path(config, path, value)
+            if not self.confirm_valid(config, self.start_base, current_config, self.start_base):
+                return
+            labels = {field[0]: field[4] for field in self.config_fields}
+            secret = [field[0] for field in self.config_fields if field[2] == "secret"]
+            for attempt in range(3):
+                data, digest = ConfigFile.read(self.config_file)
+                current_config = json.loads(data)
+                config = json.loads(data)
+                theirs = self.config_field_values(config)
+                merged, conflicts, from_theirs = ConfigFile.merge(self.config_base, mine, theirs)
+                if conflicts:
+                    choice = self.resolve_conflicts("server.json", self.describe_conflicts(conflicts, mine, theirs, labels, secret))
+                    if choice is None:
+                        return
+                    if choice == "theirs":
+                        for path in conflicts:
+                            merged[path] = theirs[path]
+                        from_theirs += conflicts
+                for path, value in merged.items():
+                    ConfigFile.set_path(config, path, value)
+                # Edits picked up from disk can combine with ours into something invalid.
+                merged_errors, _ = self.new_problems(config, self.start_base, current_config, self.start_base)
+                if merged_errors:
+                    QMessageBox.critical(self, "Error", "server.json changed while saving and the merged result is invalid:\n\n"
+                                         + "\n".join(merged_errors))
+                    return
+                content = json.dumps(config, indent=2, ensure_ascii=False) + "\n"
+                if ConfigFile.write_if_unchanged(self.config_file, digest, content):
+                    break
             else:
-                QMessageBox.critical(self, "Error", f"Failed to save config: {output}")
+                QMessageBox.critical(self, "Error", "server.json kept changing while saving. Please try again.")
+                return
+            self.config_base = merged
+            self.config_seen_digest = ConfigFile.digest(content.encode())
+            self.record_revision("server.json", content, "gui")
+            for path in from_theirs:
+                self.set_config_field(path, merged[path])
+            message = "Configuration saved. Restart service to apply changes."
+            if from_theirs:
+                message += "\n\nKept changes made outside the GUI to: " + ", ".join(labels[path] for path in from_theirs)
+            QMessageBox.information(self, "Success", message)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save config: {e}")
 
@@ -708,12 +4478,14 @@ class ArmaServerControlApp(QMainWindow):
         if not os.path.exists(self.config_file):
             QMessageBox.critical(self, "Error", f"Config file {self.config_file} not found.")
             return
-        success, output = self.run_command(f"cat {self.config_file}")
-        if success:
-            dialog = ConfigDialog(output, "Server Configuration", self)
-            dialog.exec_()
-        else:
-            QMessageBox.critical(self, "Error", f"Failed to read config: {output}")
+        try:
+            with open(self.config_file, 'r') as f:
+                output = f.read()
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to read config: {e}")
+            return
+        dialog = ConfigDialog(output, "Server Configuration", self)
+        dialog.exec_()
 
     def update_mods_display(self):
         for i in reversed(range(self.mods_container_layout.count())):
@@ -727,27 +4499,20 @@ class ArmaServerControlApp(QMainWindow):
             self.mods_container_layout.addWidget(QLabel("Warning: Addons directory not found."))
             return
         try:
-            success, output = self.run_command(f"jq -c '.game.mods // []' {self.config_file}")
-            if not success:
-                self.mods_container_layout.addWidget(QLabel(f"Error loading mods: {output}"))
+            try:
+                current_mods = self.read_config_mods()
+            except (OSError, ValueError) as e:
+                self.mods_container_layout.addWidget(QLabel(f"Error loading mods: {e}"))
                 return
-            current_mods = json.loads(output)
             self.meta_data = {}
+            self.meta_paths = {}
             self.installed_mods = set()
-            meta_files = subprocess.check_output(
-                f"find {self.addons_dir} -type f -name 'meta' -not -path '*/core/*' -not -path '*/data/*'",
-                shell=True, text=True
-            ).splitlines()
-            for meta_file in meta_files:
-                success, meta_output = self.run_command(f"jq -c . {meta_file}")
-                if success:
-                    meta = json.loads(meta_output)
-                    mod_id = meta.get("meta", {}).get("id")
-                    if mod_id and mod_id != "null":
-                        name = meta.get("meta", {}).get("name", "Unknown")
-                        version = meta.get("meta", {}).get("versions", [{}])[0].get("version", "Unknown")
-                        self.meta_data[mod_id] = (name, version)
-                        self.installed_mods.add(mod_id)
+            if self.mod_catalog.refresh():
+                self.index_scenarios()
+            for mod_id, (path, name, version) in self.mod_catalog.mods().items():
+                self.meta_data[mod_id] = (name, version)
+                self.meta_paths[mod_id] = path
+                self.installed_mods.add(mod_id)
             self.active_mods = current_mods
             self.mod_checkboxes = {}
             active_mod_ids = {mod.get("modId", "") for mod in current_mods}
@@ -763,6 +4528,9 @@ class ArmaServerControlApp(QMainWindow):
                 checkbox.setChecked(is_active)
                 self.mod_checkboxes[mod_id] = checkbox
                 self.mods_container_layout.addWidget(checkbox)
+            self.metrics.update_mods(len(current_mods), len(self.installed_mods))
+            self.disk_usage_measured = None
+            self.update_log_mod_names()
         except Exception as e:
             self.mods_container_layout.addWidget(QLabel(f"Error: {e}"))
 
@@ -785,9 +4553,7 @@ class ArmaServerControlApp(QMainWindow):
                 if not valid_mods:
                     return
             mods_to_add = [{"modId": mod_id, "name": "Unknown"} for mod_id in valid_mods]
-            success, output = self.run_command(
-                f"jq '.game.mods += {json.dumps(mods_to_add)} | .game.mods |= unique_by(.modId)' {self.config_file} > /tmp/mods.json && mv /tmp/mods.json {self.config_file}"
-            )
+            success, output = self.update_config_mods(lambda mods: mods + mods_to_add)
             if success:
                 QMessageBox.information(
                     self,
@@ -808,10 +4574,7 @@ class ArmaServerControlApp(QMainWindow):
                         mod_name = mod.get("name", mod_name)
                         break
                 new_mods.append({"modId": mod_id, "name": mod_name})
-        success, output = self.run_command(
-            f"echo '{json.dumps({'game': {'mods': new_mods}})}' | jq '.game.mods' > /tmp/mods.json && "
-            f"jq --slurpfile mods /tmp/mods.json '.game.mods = $mods[0]' {self.config_file} > /tmp/server.json && mv /tmp/server.json {self.config_file}"
-        )
+        success, output = self.update_config_mods(lambda mods: new_mods)
         if success:
             QMessageBox.information(self, "Success", "Mod changes applied.")
             self.update_mods_display()
@@ -826,27 +4589,14 @@ class ArmaServerControlApp(QMainWindow):
             QMessageBox.warning(self, "Warning", f"No mod metadata available in {self.addons_dir}.")
             return
         try:
-            meta_data = {}
-            meta_files = subprocess.check_output(
-                f"find {self.addons_dir} -type f -name 'meta' -not -path '*/core/*' -not -path '*/data/*'",
-                shell=True, text=True
-            ).splitlines()
-            for meta_file in meta_files:
-                success, meta_output = self.run_command(f"jq -c . {meta_file}")
-                if success:
-                    meta = json.loads(meta_output)
-                    mod_id = meta.get("meta", {}).get("id")
-                    if mod_id and mod_id != "null":
-                        meta_data[mod_id] = meta.get("meta", {}).get("name", "Unknown")
+            self.mod_catalog.refresh()
+            meta_data = {mod_id: name for mod_id, (_, name, _) in self.mod_catalog.mods().items()}
             new_mods = []
             for mod in self.active_mods:
                 mod_id = mod.get("modId", "")
                 mod_name = meta_data.get(mod_id, mod.get("name", "Unknown"))
                 new_mods.append({"modId": mod_id, "name": mod_name})
-            success, output = self.run_command(
-                f"echo '{json.dumps({'game': {'mods': new_mods}})}' | jq '.game.mods' > /tmp/mods.json && "
-                f"jq --slurpfile mods /tmp/mods.json '.game.mods = $mods[0]' {self.config_file} > /tmp/server.json && mv /tmp/server.json {self.config_file}"
-            )
+            success, output = self.update_config_mods(lambda mods: new_mods)
             if success:
                 QMessageBox.information(self, "Success", "Mod names synced with metadata.")
                 self.update_mods_display()
@@ -865,9 +4615,7 @@ class ArmaServerControlApp(QMainWindow):
         )
         if reply != QMessageBox.Yes:
             return
-        success, output = self.run_command(
-            f"jq '.game.mods = []' {self.config_file} > /tmp/server.json && mv /tmp/server.json {self.config_file}"
-        )
+        success, output = self.update_config_mods(lambda mods: [])
         if success:
             QMessageBox.information(self, "Success", "All mods disabled.")
             self.update_mods_display()
@@ -891,27 +4639,15 @@ class ArmaServerControlApp(QMainWindow):
             QMessageBox.warning(self, "Warning", f"No mod metadata available in {self.addons_dir}.")
             return
         try:
-            success, output = self.run_command(f"jq -c '.game.mods // []' {self.config_file}")
-            if not success:
-                QMessageBox.critical(self, "Error", f"Failed to load mods: {output}")
+            try:
+                current_mods = self.read_config_mods()
+            except (OSError, ValueError) as e:
+                QMessageBox.critical(self, "Error", f"Failed to load mods: {e}")
                 return
-            current_mods = json.loads(output)
             current_mod_ids = {mod.get("modId", "") for mod in current_mods}
-            meta_data = {}
-            installed_mod_ids = set()
-            meta_files = subprocess.check_output(
-                f"find {self.addons_dir} -type f -name 'meta' -not -path '*/core/*' -not -path '*/data/*'",
-                shell=True, text=True
-            ).splitlines()
-            for meta_file in meta_files:
-                success, meta_output = self.run_command(f"jq -c . {meta_file}")
-                if success:
-                    meta = json.loads(meta_output)
-                    mod_id = meta.get("meta", {}).get("id")
-                    if mod_id and mod_id != "null":
-                        name = meta.get("meta", {}).get("name", "Unknown")
-                        meta_data[mod_id] = name
-                        installed_mod_ids.add(mod_id)
+            self.mod_catalog.refresh()
+            meta_data = {mod_id: name for mod_id, (_, name, _) in self.mod_catalog.mods().items()}
+            installed_mod_ids = set(meta_data)
             all_mod_ids = current_mod_ids | installed_mod_ids
             new_mods = []
             for mod_id in all_mod_ids:
@@ -923,10 +4659,7 @@ class ArmaServerControlApp(QMainWindow):
                 if mod_id in meta_data:
                     mod_name = meta_data[mod_id]
                 new_mods.append({"modId": mod_id, "name": mod_name})
-            success, output = self.run_command(
-                f"echo '{json.dumps({'game': {'mods': new_mods}})}' | jq '.game.mods' > /tmp/mods.json && "
-                f"jq --slurpfile mods /tmp/mods.json '.game.mods = $mods[0]' {self.config_file} > /tmp/server.json && mv /tmp/server.json {self.config_file}"
-            )
+            success, output = self.update_config_mods(lambda mods: new_mods)
             if success:
                 QMessageBox.information(self, "Success", f"All mods ({len(new_mods)}) enabled.")
                 self.update_mods_display()
@@ -935,113 +4668,180 @@ class ArmaServerControlApp(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error enabling mods: {e}")
 
+    def update_stage_button(self):
+        # Staging needs a mirror, without one the button would only ever show an error.
+        self.stage_mods_button.setEnabled(not self.mod_staging and bool(self.mod_source_input.text().strip()))
+
+    def set_mod_staging(self, staging):
+        self.mod_staging = staging
+        self.update_stage_button()
+
+    def stage_mods(self):
+        source_url = self.mod_source_input.text().strip()
+        if not source_url.startswith(("http://", "https://")):
+            QMessageBox.critical(self, "Error", "Self-hosted Mirror must be an http:// or https:// URL.")
+            return
+        is_valid, error_msg = self.validate_integer_input(self.mod_workers_input.text(), "Parallel Downloads", 1, 16)
+        if not is_valid:
+            QMessageBox.critical(self, "Error", error_msg)
+            return
+        if self.mod_stage_thread and self.mod_stage_thread.isRunning():
+            return
+        self.settings["mod_source_url"] = source_url
+        self.settings["mod_download_workers"] = int(self.mod_workers_input.text())
+        self.save_settings()
+        try:
+            mods = json.loads(ConfigFile.read(self.config_file)[0]).get("game", {}).get("mods", [])
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Failed to read mods from server.json: {e}")
+            return
+        self.mod_catalog.refresh()
+        stager = ModStager(source_url, self.addons_dir, self.mod_catalog.mods(), max_workers=self.settings["mod_download_workers"])
+        self.mod_stage_thread = ModStageThread(stager, mods, self)
+        self.mod_stage_thread.progress.connect(self.mod_stage_status_label.setText)
+        self.mod_stage_thread.staged.connect(self.mods_staged)
+        self.set_mod_staging(True)
+        self.mod_stage_status_label.setText("Resolving mod dependencies...")
+        self.mod_stage_thread.start()
+
+    def mods_staged(self, items, downloaded, error):
+        self.set_mod_staging(False)
+        if error:
+            self.mod_stage_status_label.setText(self.log_event("mods", f"Staging failed, server not restarted: {error}"))
+            QMessageBox.critical(self, "Error", f"Failed to stage mods: {error}")
+            return
+        if not items:
+            self.mod_stage_status_label.setText(self.log_event("mods", "All mods are up to date, nothing to install."))
+            return
+        self.log_event("mods", f"Staged {len(items)} new or updated mod(s), {downloaded / 1048576:.1f} MB downloaded. Restarting.")
+        self.set_mod_staging(True)
+        self.run_async(self.systemctl_commands("stop"), lambda success, output: self.install_staged_mods(items, success, output), timeout=180)
+
+    def install_staged_mods(self, items, stopped, output):
+        if not stopped:
+            # Renaming addon directories under a running server would pull files out from under it.
+            self.set_mod_staging(False)
+            self.mod_stage_status_label.setText(self.log_event("mods", f"Service did not stop, staged mods not installed: {output.strip()}"))
+            QMessageBox.critical(self, "Error", f"Failed to stop the service, staged mods were not installed: {output}")
+            return
+        try:
+            self.mod_stage_thread.stager.commit(items)
+            commit_error = ""
+        except ValueError as e:
+            commit_error = str(e)
+        except OSError as e:
+            # Neither the new nor the old mod set is complete, starting would load a broken mix.
+            self.set_mod_staging(False)
+            self.update_status_button_color()
+            self.mod_stage_status_label.setText(self.log_event(
+                "mods", f"Installing staged mods failed and could not be undone, server left stopped: {e}"))
+            QMessageBox.critical(self, "Error", f"Installing staged mods failed and could not be undone: {e}\n\n"
+                                 f"The server was left stopped. Check {self.addons_dir} and its .staging folder before starting it.")
+            return
+        self.run_async(self.systemctl_commands("start"),
+                       lambda success, output: self.staged_mods_installed(items, commit_error, success, output), timeout=180)
+
+    def staged_mods_installed(self, items, commit_error, success, output):
+        self.set_mod_staging(False)
+        if success:
+            self.metrics.record_control_restart()
+        self.update_status_button_color()
+        self.update_mods_display()
+        if commit_error:
+            self.mod_stage_status_label.setText(self.log_event("mods", f"Moving staged mods into place failed: {commit_error}"))
+            QMessageBox.critical(self, "Error", f"Failed to install staged mods, the server was restarted with the previous mods: {commit_error}")
+        elif not success:
+            QMessageBox.critical(self, "Error", f"Mods staged but the service did not start: {output}")
+        else:
+            self.mod_stage_status_label.setText(self.log_event("mods", f"{len(items)} mod(s) installed and server restarted."))
+            QMessageBox.information(self, "Success", f"{len(items)} new or updated mod(s) installed. Service restarted.")
+
     def load_start_params(self):
         if not os.path.exists(self.start_script):
             QMessageBox.critical(self, "Error", f"Start script {self.start_script} not found.")
             return
         try:
-            with open(self.start_script, 'r') as f:
-                content = f.read()
-            self.install_update_checkbox.setChecked('# $HOME/arma/install.sh' not in content)
-            param_patterns = [
-                (r'-maxFPS=(\d+)', self.max_fps_checkbox, self.max_fps_input),
-                (r'-logStats=(\d+)', self.log_stats_checkbox, self.log_stats_input),
-                (r'-keepNumOfLogs=(\d+)', self.keep_num_logs_checkbox, self.keep_num_logs_input),
-                (r'-aiLimit=(\d+)', self.ai_limit_checkbox, self.ai_limit_input),
-                (r'-autoReload=(\d+)', self.auto_reload_checkbox, self.auto_reload_input),
-                (r'-autoShutdown', self.auto_shutdown_checkbox, None),
-                (r'-loadSessionSave=([\w-]+)', self.load_session_save_checkbox, self.load_session_save_input),
-                (r'-loadSessionSave(?!\=)', self.load_session_save_checkbox, None),
-                (r'-logVoting', self.log_voting_checkbox, None),
-                (r'-disableAI', self.disable_ai_checkbox, None),
-                (r'-rplEncodeAsLongJobs', self.encode_as_long_jobs_checkbox, None),
-                (r'-disableNavmeshStreaming', self.disable_nav_mesh_checkbox, None),
-            ]
-            for pattern, checkbox, input_field in param_patterns:
-                match = re.search(pattern, content)
-                if match:
-                    checkbox.setChecked(True)
-                    if input_field and match.lastindex:
-                        input_field.setText(match.group(1))
-                else:
-                    checkbox.setChecked(False)
-                    if input_field:
-                        input_field.clear()
+            data, self.start_seen_digest = ConfigFile.read(self.start_script)
+            self.start_base = StartScript.parse(data.decode())
+            self.record_revision("start.sh", data, "disk")
+            for name in self.start_base:
+                self.set_start_field(name, self.start_base[name])
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load start script: {e}")
 
-    def validate_start_params(self):
-        validations = [
-            (self.max_fps_checkbox, self.max_fps_input, "Max FPS", 1, 240),
-            (self.log_stats_checkbox, self.log_stats_input, "Log Stats", 1000, 3600000),
-            (self.keep_num_logs_checkbox, self.keep_num_logs_input, "Keep Number of Logs", 1, 100),
-            (self.ai_limit_checkbox, self.ai_limit_input, "AI Limit", 0, 1000),
-            (self.auto_reload_checkbox, self.auto_reload_input, "Auto Reload", 10, 120),
-        ]
-        for checkbox, input_field, field_name, min_val, max_val in validations:
-            if checkbox.isChecked():
-                is_valid, error_msg = self.validate_integer_input(input_field.text(), field_name, min_val, max_val)
-                if not is_valid:
-                    return False, error_msg
-        if self.load_session_save_checkbox.isChecked():
-            is_valid, error_msg = self.validate_save_file_name(self.load_session_save_input.text())
-            if not is_valid:
-                return False, error_msg
-        return True, ""
+    def browse_saves(self):
+        dialog = SaveBrowserDialog(self.save_index, dict(self.scenarios), self)
+        if dialog.exec_() == QDialog.Accepted and dialog.selected_save():
+            self.load_session_save_checkbox.setChecked(True)
+            self.load_session_save_input.setText(dialog.selected_save())
+
+    def start_field(self, name):
+        for field in self.start_param_fields:
+            if field[0] == name:
+                return field
+        raise KeyError(name)
+
+    def get_start_field(self, name):
+        _, checkbox, input_field, _ = self.start_field(name)
+        if name == "install":
+            return checkbox.isChecked()
+        if not checkbox.isChecked():
+            return None
+        if input_field:
+            return input_field.text().strip() or True
+        return True
+
+    def set_start_field(self, name, value):
+        _, checkbox, input_field, _ = self.start_field(name)
+        checkbox.setChecked(bool(value))
+        if input_field:
+            input_field.setText(value if isinstance(value, str) else "")
 
     def save_start_params(self):
         if not os.path.exists(self.start_script):
             QMessageBox.critical(self, "Error", f"Start script {self.start_script} not found.")
             return
-        is_valid, error_msg = self.validate_start_params()
-        if not is_valid:
-            QMessageBox.critical(self, "Error", error_msg)
-            return
         try:
-            lines = [
-                "#!/bin/bash",
-                "",
-                "# Install or Update game",
-            ]
-            if self.install_update_checkbox.isChecked():
-                lines.append("$HOME/arma/install.sh")
+            mine = {field[0]: self.get_start_field(field[0]) for field in self.start_param_fields}
+            try:
+                config = json.loads(ConfigFile.read(self.config_file)[0])
+            except (OSError, ValueError):
+                config = None
+            if not self.confirm_valid(config, mine, config, self.start_base):
+                return
+            labels = {field[0]: field[3] for field in self.start_param_fields}
+            for attempt in range(3):
+                data, digest = ConfigFile.read(self.start_script)
+                theirs = StartScript.parse(data.decode())
+                merged, conflicts, from_theirs = ConfigFile.merge(self.start_base, mine, theirs)
+                if conflicts:
+                    choice = self.resolve_conflicts("start.sh", self.describe_conflicts(conflicts, mine, theirs, labels))
+                    if choice is None:
+                        return
+                    if choice == "theirs":
+                        for name in conflicts:
+                            merged[name] = theirs[name]
+                        from_theirs += conflicts
+                merged_errors, _ = self.new_problems(config, merged, config, theirs)
+                if merged_errors:
+                    QMessageBox.critical(self, "Error", "start.sh changed while saving and the merged result is invalid:\n\n"
+                                         + "\n".join(merged_errors))
+                    return
+                content = StartScript.build(merged)
+                if ConfigFile.write_if_unchanged(self.start_script, digest, content, mode=0o755):
+                    break
             else:
-                lines.append("# $HOME/arma/install.sh")
-            lines.extend([
-                "",
-                "# Start server",
-                "$HOME/arma/ArmaReforgerServer \\",
-                "  -config=$HOME/arma/server.json \\",
-                "  -profile=$HOME/arma/profile \\",
-            ])
-            if self.max_fps_checkbox.isChecked():
-                lines.append(f"  -maxFPS={self.max_fps_input.text()} \\")
-            if self.log_stats_checkbox.isChecked():
-                lines.append(f"  -logStats={self.log_stats_input.text()} \\")
-            if self.keep_num_logs_checkbox.isChecked():
-                lines.append(f"  -keepNumOfLogs={self.keep_num_logs_input.text()} \\")
-            if self.ai_limit_checkbox.isChecked():
-                lines.append(f"  -aiLimit={self.ai_limit_input.text()} \\")
-            if self.auto_reload_checkbox.isChecked():
-                lines.append(f"  -autoReload={self.auto_reload_input.text()} \\")
-            if self.auto_shutdown_checkbox.isChecked():
-                lines.append(f"  -autoShutdown \\")
-            if self.load_session_save_checkbox.isChecked():
-                save_name = self.load_session_save_input.text().strip()
-                lines.append(f"  -loadSessionSave{save_name and f'={save_name}' or ''} \\")
-            if self.log_voting_checkbox.isChecked():
-                lines.append(f"  -logVoting \\")
-            if self.disable_ai_checkbox.isChecked():
-                lines.append(f"  -disableAI \\")
-            if self.encode_as_long_jobs_checkbox.isChecked():
-                lines.append(f"  -rplEncodeAsLongJobs \\")
-            if self.disable_nav_mesh_checkbox.isChecked():
-                lines.append(f"  -disableNavmeshStreaming \\")
-            lines[-1] = lines[-1].rstrip(" \\")
-            with open(self.start_script, 'w') as f:
-                f.write("\n".join(lines))
-            os.chmod(self.start_script, 0o755)
-            QMessageBox.information(self, "Success", "Start parameters saved. Restart service to apply changes.")
+                QMessageBox.critical(self, "Error", "start.sh kept changing while saving. Please try again.")
+                return
+            self.start_base = merged
+            self.start_seen_digest = ConfigFile.digest(content.encode())
+            self.record_revision("start.sh", content, "gui")
+            for name in from_theirs:
+                self.set_start_field(name, merged[name])
+            message = "Start parameters saved. Restart service to apply changes."
+            if from_theirs:
+                message += "\n\nKept changes made outside the GUI to: " + ", ".join(labels[name] for name in from_theirs)
+            QMessageBox.information(self, "Success", message)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save start script: {e}")
 
@@ -1057,8 +4857,112 @@ class ArmaServerControlApp(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to read start script: {e}")
 
+def check_trends(args):
+    samples = []
+    try:
+        with open(args.check_trends, 'r') as f:
+            for line in f:
+                if line.strip():
+                    samples.append(json.loads(line))
+    except (OSError, ValueError) as e:
+        print(f"Error: Failed to read metrics from {args.check_trends}: {e}", file=sys.stderr)
+        return 2
+    options = ("rss_limit_mb", "fps_floor", "window_minutes", "horizon_minutes")
+    watchdog = TrendWatchdog(**{key: getattr(args, key) for key in options if hasattr(args, key)})
+    triggers = watchdog.replay(samples)
+    for ts, reasons in triggers:
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))} restart: {'; '.join(reasons)}")
+    if not triggers:
+        print(f"No restart needed across {len(samples)} samples.")
+    return 1 if triggers else 0
+
+def plan_capacity(args):
+    metrics = MetricsCollector(args.plan)
+    samples = metrics.read_history()
+    if not samples:
+        print(f"Error: No samples in {args.plan}", file=sys.stderr)
+        return 2
+    history = ConfigHistory(args.history_dir)
+    current = {"server.json": None, "start.sh": None}
+    for _, file_name, doc in history.timeline():
+        current[file_name] = doc
+    if args.server_json and os.path.exists(args.server_json):
+        with open(args.server_json, 'r') as f:
+            current["server.json"] = json.load(f)
+    if args.start_script and os.path.exists(args.start_script):
+        with open(args.start_script, 'r') as f:
+            current["start.sh"] = f.read()
+    start_params = StartScript.parse(current["start.sh"]) if current["start.sh"] is not None else {}
+    planner = CapacityPlanner(args.target_fps, args.peak_players, cpu_limit=args.cpu_limit)
+    plan = planner.plan(samples, history.timeline(), CapacityPlanner.settings_from(current["server.json"], start_params))
+    print(planner.describe(plan))
+    return 0 if plan["model"] else 1
+
+def run_snapshots(args):
+    snapshots = ProfileSnapshots(os.path.expanduser("~/.arsc/snapshots"), os.path.expanduser("~/arma/profile"))
+    try:
+        if args.list_snapshots:
+            for name in snapshots.names():
+                print(ProfileSnapshots.describe(name, snapshots.load(name)))
+        elif args.restore_snapshot:
+            target_dir = args.restore_to or os.path.expanduser(f"~/arma/profile-restore-{args.restore_snapshot}")
+            count = snapshots.restore(args.restore_snapshot, target_dir)
+            print(f"Restored {count} files from {args.restore_snapshot} to {target_dir}.")
+        else:
+            name, stats = snapshots.snapshot(keep=args.keep_snapshots)
+            print(f"Snapshot {name}: {stats['files']} files, {stats['changed_files']} changed, "
+                  f"{stats['stored_bytes'] / 1048576:.1f} MB new of {stats['bytes'] / 1048576:.1f} MB.")
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Arma Reforger Server Control")
+    parser.add_argument("--check-trends", metavar="METRICS_FILE",
+                        help="replay recorded metrics (e.g. ~/.arsc/metrics.jsonl) through the restart watchdog and exit")
+    parser.add_argument("--validate", metavar="SERVER_JSON", nargs="?", const=os.path.expanduser("~/arma/server.json"),
+                        help="check server.json (default ~/arma/server.json) and the start script, print every problem and exit")
+    parser.add_argument("--start-script", metavar="START_SH", default=os.path.expanduser("~/arma/start.sh"),
+                        help="start script checked together with --validate (default ~/arma/start.sh)")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="snapshot ~/arma/profile (without addons and logs) into ~/.arsc/snapshots and exit")
+    parser.add_argument("--keep-snapshots", type=int, default=14, metavar="N",
+                        help="snapshots kept by --snapshot, older ones are pruned (default 14)")
+    parser.add_argument("--list-snapshots", action="store_true", help="list profile snapshots and exit")
+    parser.add_argument("--restore-snapshot", metavar="NAME", help="restore a profile snapshot and exit")
+    parser.add_argument("--restore-to", metavar="DIR", help="directory for --restore-snapshot (default ~/arma/profile-restore-NAME)")
+    parser.add_argument("--plan", metavar="METRICS_FILE",
+                        help="recommend settings from recorded metrics (e.g. ~/.arsc/metrics.jsonl) and config history, and exit")
+    parser.add_argument("--history-dir", metavar="DIR", default=os.path.expanduser("~/.arsc/history"),
+                        help="config history used by --plan (default ~/.arsc/history)")
+    parser.add_argument("--server-json", metavar="SERVER_JSON",
+                        default=os.path.expanduser("~/arma/server.json"),
+                        help="current server.json for --plan (default ~/arma/server.json)")
+    parser.add_argument("--target-fps", type=int, default=30, help="FPS to keep at peak load for --plan (default 30)")
+    parser.add_argument("--peak-players", type=int, default=None,
+                        help="peak player count for --plan (default: busiest 5%% of the samples)")
+    parser.add_argument("--cpu-limit", type=float, default=None,
+                        help="highest predicted CPU for --plan, in percent of one core (default: 90%% of every core)")
+    parser.add_argument("--trace-summary", action="store_true",
+                        help="print the slowest operations recorded in ~/.arsc/trace.jsonl and exit")
+    parser.add_argument("--rss-limit-mb", type=int, default=argparse.SUPPRESS)
+    parser.add_argument("--fps-floor", type=int, default=argparse.SUPPRESS)
+    parser.add_argument("--window-minutes", type=int, default=argparse.SUPPRESS)
+    parser.add_argument("--horizon-minutes", type=int, default=argparse.SUPPRESS)
+    args, qt_args = parser.parse_known_args()
+    if args.check_trends:
+        sys.exit(check_trends(args))
+    if args.plan:
+        sys.exit(plan_capacity(args))
+    if args.trace_summary:
+        print(Telemetry.summary(Telemetry(os.path.expanduser("~/.arsc/trace.jsonl")).read()))
+        sys.exit(0)
+    if args.validate:
+        sys.exit(validate_files(args))
+    if args.snapshot or args.list_snapshots or args.restore_snapshot:
+        sys.exit(run_snapshots(args))
+    app = QApplication(sys.argv[:1] + qt_args)
     window = ArmaServerControlApp()
     window.show()
     sys.exit(app.exec_())
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+#
+# armar_sc_config.py - server.json and start.sh handling shared by armar-sc-gui.py and armar-sc.sh
+#
+# Dependencies: python3 (no Qt, so armar-sc.sh can validate on a headless server)
+#
+# Copyright (c) 2025 Hanzerik307
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import sys
+import argparse
+import json
+import os
+import re
+import hashlib
+import tempfile
+
+# Highest -maxFPS the server simulation can make use of; anything above only burns CPU.
+SERVER_FPS_BUDGET = 120
+
+class ConfigFile:
+    # Compare-and-swap file writes and a three-way merge of form fields, so a
+    # save never silently overwrites an edit made by armar-sc.sh or another admin.
+    @staticmethod
+    def digest(data):
+        return hashlib.sha256(data).hexdigest()
+
+    @classmethod
+    def read(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        return data, cls.digest(data)
+
+    @classmethod
+    def write_if_unchanged(cls, path, expected_digest, content, mode=None):
+        directory = os.path.dirname(path)
+        fd, tmp_file = tempfile.mkstemp(prefix=".arsc-", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+            if mode is None and os.path.exists(path):
+                mode = os.stat(path).st_mode & 0o7777
+            if mode is not None:
+                os.chmod(tmp_file, mode)
+            try:
+                _, current_digest = cls.read(path)
+            except FileNotFoundError:
+                current_digest = None
+            if current_digest != expected_digest:
+                os.unlink(tmp_file)
+                return False
+            os.replace(tmp_file, path)
+            return True
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.unlink(tmp_file)
+            raise
+
+    @staticmethod
+    def merge(base, mine, theirs):
+        merged = {}
+        conflicts = []
+        from_theirs = []
+        for key in mine:
+            if mine[key] == base.get(key) or mine[key] == theirs.get(key):
+                merged[key] = theirs.get(key)
+                if mine[key] != theirs.get(key):
+                    from_theirs.append(key)
+            elif theirs.get(key) == base.get(key):
+                merged[key] = mine[key]
+            else:
+                merged[key] = mine[key]
+                conflicts.append(key)
+        return merged, conflicts, from_theirs
+
+    @staticmethod
+    def get_path(config, path, default=None):
+        value = config
+        for key in path.split("."):
+            if not isinstance(value, dict) or key not in value:
+                return default
+            value = value[key]
+        return value
+
+    @staticmethod
+    def set_path(config, path, value):
+        keys = path.split(".")
+        for key in keys[:-1]:
+            config = config.setdefault(key, {})
+        config[keys[-1]] = value
+
+class StartScript:
+    # Parameters in the order they are written to start.sh; a value of None means
+    # disabled, True means a flag without a value.
+    PARAMS = [
+        ("maxFPS", re.compile(r'-maxFPS=(\d+)')),
+        ("logStats", re.compile(r'-logStats=(\d+)')),
+        ("keepNumOfLogs", re.compile(r'-keepNumOfLogs=(\d+)')),
+        ("aiLimit", re.compile(r'-aiLimit=(\d+)')),
+        ("autoReload", re.compile(r'-autoReload=(\d+)')),
+        ("autoShutdown", re.compile(r'-autoShutdown')),
+        ("loadSessionSave", re.compile(r'-loadSessionSave(?:=([\w-]+))?')),
+        ("logVoting", re.compile(r'-logVoting')),
+        ("disableAI", re.compile(r'-disableAI')),
+        ("rplEncodeAsLongJobs", re.compile(r'-rplEncodeAsLongJobs')),
+        ("disableNavmeshStreaming", re.compile(r'-disableNavmeshStreaming')),
+    ]
+
+    @classmethod
+    def parse(cls, content):
+        params = {"install": '# $HOME/arma/install.sh' not in content}
+        for name, pattern in cls.PARAMS:
+            match = pattern.search(content)
+            if not match:
+                params[name] = None
+            elif pattern.groups and match.group(1):
+                params[name] = match.group(1)
+            else:
+                params[name] = True
+        return params
+
+    @classmethod
+    def build(cls, params):
+        lines = [
+            "#!/bin/bash",
+            "",
+            "# Install or Update game",
+            "$HOME/arma/install.sh" if params.get("install") else "# $HOME/arma/install.sh",
+            "",
+            "# Start server",
+            "$HOME/arma/ArmaReforgerServer \\",
+            "  -config=$HOME/arma/server.json \\",
+            "  -profile=$HOME/arma/profile \\",
+        ]
+        for name, _ in cls.PARAMS:
+            value = params.get(name)
+            if value is True:
+                lines.append(f"  -{name} \\")
+            elif value:
+                lines.append(f"  -{name}={value} \\")
+        lines[-1] = lines[-1].rstrip(" \\")
+        return "\n".join(lines)
+
+class ConfigValidator:
+    # One declarative table of rules for server.json and the start parameters.
+    # The rules are compiled into checks once, then a whole file is validated in
+    # a single pass that collects every error instead of stopping at the first.
+    UUID_PATTERN = r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+    SERVER_SCHEMA = {
+        "publicAddress": {"type": "ip", "required": True, "label": "Public IP Address"},
+        "publicPort": {"type": "int", "min": 1024, "max": 65535, "required": True, "label": "Public Port"},
+        "bindAddress": {"type": "ip", "label": "Bind Address"},
+        "bindPort": {"type": "int", "min": 1024, "max": 65535, "label": "Bind Port"},
+        "a2s.address": {"type": "ip", "label": "A2S Address"},
+        "a2s.port": {"type": "int", "min": 1024, "max": 65535, "label": "A2S Port"},
+        "rcon.address": {"type": "ip", "label": "RCON Address"},
+        "rcon.port": {"type": "int", "min": 1024, "max": 65535, "label": "RCON Port"},
+        "rcon.password": {"type": "str", "pattern": r'^\S{3,}$', "label": "RCON Password",
+                          "hint": "at least 3 characters without spaces"},
+        "rcon.maxClients": {"type": "int", "min": 1, "max": 16, "label": "RCON Max Clients"},
+        "game.name": {"type": "str", "max_length": 100, "label": "Server Name"},
+        "game.password": {"type": "str", "label": "Game Password"},
+        "game.passwordAdmin": {"type": "str", "required": True, "min_length": 1, "label": "Admin Password"},
+        "game.admins": {"type": "list", "max_items": 20, "label": "Admins",
+                        "items": {"type": "str", "pattern": UUID_PATTERN, "label": "Player IdentityId",
+                                  "hint": "36-character UUID"}},
+        "game.scenarioId": {"type": "str", "required": True, "pattern": r'^\{[0-9A-Fa-f]{16}\}Missions/[\w-]+\.conf$',
+                            "label": "Scenario ID", "hint": "{16-character hex UUID}Missions/<name>.conf"},
+        "game.maxPlayers": {"type": "int", "min": 2, "max": 128, "required": True, "label": "Max Players"},
+        "game.visible": {"type": "bool", "label": "Visible"},
+        "game.crossPlatform": {"type": "bool", "label": "Crossplay"},
+        "game.supportedPlatforms": {"type": "list", "label": "Supported Platforms",
+                                    "items": {"type": "str", "choices": ["PLATFORM_PC", "PLATFORM_XBL", "PLATFORM_PSN"],
+                                              "label": "Platform"}},
+        "game.gameProperties.serverMaxViewDistance": {"type": "int", "min": 500, "max": 10000, "label": "Max View Distance"},
+        "game.gameProperties.serverMinGrassDistance": {"type": "int", "min": 50, "max": 150, "label": "Min Grass Distance"},
+        "game.gameProperties.networkViewDistance": {"type": "int", "min": 500, "max": 5000, "label": "Network View Distance"},
+        "game.gameProperties.disableThirdPerson": {"type": "bool", "label": "Disable Third Person"},
+        "game.gameProperties.fastValidation": {"type": "bool", "label": "Fast Validation"},
+        "game.gameProperties.battlEye": {"type": "bool", "label": "BattlEye"},
+        "game.gameProperties.VONDisableUI": {"type": "bool", "label": "Disable VON UI"},
+        "game.gameProperties.VONDisableDirectSpeechUI": {"type": "bool", "label": "Disable Direct Speech UI"},
+        "game.gameProperties.VONCanTransmitCrossFaction": {"type": "bool", "label": "Cross-Faction VON Transmit"},
+        "game.mods": {"type": "list", "label": "Mods",
+                      "items": {"type": "dict", "label": "Mod", "fields": {
+                          "modId": {"type": "str", "required": True, "pattern": r'^[0-9A-Fa-f]{16}$', "label": "modId",
+                                    "hint": "16-character hex ID"},
+                          "name": {"type": "str", "label": "name"},
+                          "version": {"type": "str", "label": "version"},
+                      }}},
+        "operating.lobbyPlayerSynchronise": {"type": "bool", "label": "Lobby Player Synchronise"},
+        "operating.disableNavmeshStreaming": {"type": "list", "label": "Disable Navmesh Streaming",
+                                              "items": {"type": "str", "min_length": 1, "label": "Navmesh name"}},
+        "operating.playerSaveTime": {"type": "int", "min": 1, "max": 86400, "label": "Player Save Time"},
+        "operating.aiLimit": {"type": "int", "min": -1, "max": 1000, "label": "AI Limit (operating)"},
+        "operating.slotReservationTimeout": {"type": "int", "min": 5, "max": 300, "label": "Slot Reservation Timeout"},
+        "operating.joinQueue.maxSize": {"type": "int", "min": 0, "max": 50, "label": "Join Queue Max Size"},
+    }
+    START_SCHEMA = {
+        "maxFPS": {"type": "int", "min": 1, "max": SERVER_FPS_BUDGET, "label": "Max FPS"},
+        "logStats": {"type": "int", "min": 1000, "max": 3600000, "label": "Log Stats"},
+        "keepNumOfLogs": {"type": "int", "min": 1, "max": 100, "label": "Keep Number of Logs"},
+        "aiLimit": {"type": "int", "min": 0, "max": 1000, "label": "AI Limit"},
+        "autoReload": {"type": "int", "min": 10, "max": 120, "label": "Auto Reload"},
+        "loadSessionSave": {"type": "flag", "pattern": r'^[\w-]{1,50}$', "label": "Save file name",
+                            "hint": "1-50 alphanumeric characters, underscores, or hyphens"},
+    }
+    # (scope, condition, message); scope says which file the rule needs, value(path)
+    # reads server.json and value("start.<name>") the start parameters.
+    PERFORMANCE_RULES = [
+        ("server", lambda value: value("game.gameProperties.networkViewDistance", 1500) > 2500 and value("game.maxPlayers", 0) > 64,
+         "Network View Distance above 2500 with more than 64 players multiplies replication traffic and server CPU."),
+        ("server", lambda value: value("game.gameProperties.serverMaxViewDistance", 1600) > 4000 and value("game.maxPlayers", 0) > 64,
+         "Max View Distance above 4000 with more than 64 players makes every client stream more of the world from the server."),
+        ("server", lambda value: value("game.gameProperties.networkViewDistance", 1500) > value("game.gameProperties.serverMaxViewDistance", 1600),
+         "Network View Distance is higher than Max View Distance; entities are replicated further out than anyone can see them."),
+        ("server", lambda value: value("game.gameProperties.fastValidation", True) is False,
+         "Fast Validation is off; every joining client is fully validated, which costs server CPU on each join."),
+        ("server", lambda value: value("operating.disableNavmeshStreaming", None) == [],
+         "Navmesh streaming is disabled for all navmeshes (empty disableNavmeshStreaming list); the whole navmesh is kept in memory."),
+        ("start", lambda value: value("start.maxFPS", None) is None,
+         "-maxFPS is not set; an uncapped server runs the simulation as fast as it can and uses a full CPU core."),
+        ("start", lambda value: value("start.logStats", 60000) < 10000,
+         "-logStats below 10000 ms writes a stats line to the log more than every 10 seconds."),
+        ("start", lambda value: value("start.disableNavmeshStreaming", None) is True,
+         "-disableNavmeshStreaming keeps the whole navmesh in memory."),
+        ("both", lambda value: value("start.aiLimit", 0) > 300 and value("game.maxPlayers", 0) > 64,
+         "-aiLimit above 300 with more than 64 players is likely to drop server FPS below 30 on busy maps."),
+    ]
+
+    def __init__(self):
+        self.server_checks = [(path, self.compile_rule(spec)) for path, spec in self.SERVER_SCHEMA.items()]
+        self.start_checks = [(name, self.compile_rule(spec)) for name, spec in self.START_SCHEMA.items()]
+
+    def compile_rule(self, spec):
+        label = spec["label"]
+        hint = f" ({spec['hint']})" if "hint" in spec else ""
+        checks = []
+        kind = spec["type"]
+        if kind == "int":
+            def check_type(value):
+                if isinstance(value, bool) or not isinstance(value, int):
+                    return f"{label} must be a valid integer."
+        elif kind == "bool":
+            def check_type(value):
+                if not isinstance(value, bool):
+                    return f"{label} must be true or false."
+        elif kind == "str":
+            def check_type(value):
+                if not isinstance(value, str):
+                    return f"{label} must be a string."
+        elif kind == "ip":
+            def check_type(value):
+                octets = value.split('.') if isinstance(value, str) else []
+                if len(octets) != 4 or not all(octet.isdigit() and int(octet) <= 255 for octet in octets):
+                    return f"Invalid {label} format (e.g., 123.123.123.123)."
+        elif kind == "list":
+            def check_type(value):
+                if not isinstance(value, list):
+                    return f"{label} must be a list."
+        elif kind == "dict":
+            def check_type(value):
+                if not isinstance(value, dict):
+                    return f"{label} must be an object."
+        elif kind == "flag":
+            def check_type(value):
+                if value is not True and not isinstance(value, str):
+                    return f"{label} must be a flag or a value."
+        else:
+            raise ValueError(f"Unknown rule type {kind}")
+        if "min" in spec or "max" in spec:
+            low, high = spec.get("min"), spec.get("max")
+            def check_range(value):
+                if (low is not None and value < low) or (high is not None and value > high):
+                    return f"{label} must be between {low} and {high}."
+            checks.append(check_range)
+        if "min_length" in spec:
+            def check_min_length(value):
+                if len(value) < spec["min_length"]:
+                    return f"{label} cannot be empty." if spec["min_length"] == 1 else f"{label} is too short."
+            checks.append(check_min_length)
+        if "max_length" in spec:
+            def check_max_length(value):
+                if len(value) > spec["max_length"]:
+                    return f"{label} must be at most {spec['max_length']} characters."
+            checks.append(check_max_length)
+        if "pattern" in spec:
+            pattern = re.compile(spec["pattern"])
+            def check_pattern(value):
+                if isinstance(value, str) and not pattern.match(value):
+                    return f"Invalid {label}: {value}{hint}"
+            checks.append(check_pattern)
+        if "choices" in spec:
+            def check_choices(value):
+                if value not in spec["choices"]:
+                    return f"Invalid {label}: {value} (one of {', '.join(spec['choices'])})"
+            checks.append(check_choices)
+        if "max_items" in spec:
+            def check_max_items(value):
+                if len(value) > spec["max_items"]:
+                    return f"{label}: at most {spec['max_items']} entries allowed."
+            checks.append(check_max_items)
+        if "items" in spec:
+            check_item = self.compile_rule(spec["items"])
+            def check_items(value):
+                errors = []
+                for index, item in enumerate(value):
+                    errors.extend(f"[{index}] {error}" for error in check_item(item))
+                return errors
+            checks.append(check_items)
+        if "fields" in spec:
+            fields = [(name, field_spec.get("required", False), self.compile_rule(field_spec))
+                      for name, field_spec in spec["fields"].items()]
+            def check_fields(value):
+                errors = []
+                for name, required, check_field in fields:
+                    if name in value:
+                        errors.extend(check_field(value[name]))
+                    elif required:
+                        errors.append(f"{label} is missing {name}.")
+                return errors
+            checks.append(check_fields)
+
+        def check(value):
+            error = check_type(value)
+            if error:
+                return [error]
+            errors = []
+            for rule_check in checks:
+                result = rule_check(value)
+                if isinstance(result, list):
+                    errors.extend(result)
+                elif result:
+                    errors.append(result)
+            return errors
+        return check
+
+    def validate(self, config=None, start_params=None):
+        errors = []
+        if config is not None:
+            if not isinstance(config, dict):
+                return ["server.json must be a JSON object."], []
+            for path, check in self.server_checks:
+                value = ConfigFile.get_path(config, path, None)
+                if value is None:
+                    if self.SERVER_SCHEMA[path].get("required"):
+                        errors.append(f"{path}: {self.SERVER_SCHEMA[path]['label']} is missing.")
+                    continue
+                errors.extend(f"{path}: {error}" for error in check(value))
+        if start_params is not None:
+            for name, check in self.start_checks:
+                value = start_params.get(name)
+                if value is None:
+                    continue
+                if self.START_SCHEMA[name]["type"] == "int":
+                    value = int(value) if isinstance(value, str) and value.isdigit() else value
+                errors.extend(f"-{name}: {error}" for error in check(value))
+        return errors, self.performance_warnings(config, start_params)
+
+    def performance_warnings(self, config, start_params):
+        scopes = {"server"} if config is not None else set()
+        if start_params is not None:
+            scopes.add("start")
+        if len(scopes) == 2:
+            scopes.add("both")
+        config, start_params = config or {}, start_params or {}
+
+        def value(path, default=None):
+            if path.startswith("start."):
+                found = start_params.get(path[6:])
+                if isinstance(found, str):
+                    try:
+                        found = float(found)
+                    except ValueError:
+                        return default
+            else:
+                found = ConfigFile.get_path(config, path, None)
+            if found is None:
+                return default
+            if isinstance(default, (int, float)) and not isinstance(found, bool) and not isinstance(found, (int, float)):
+                return default
+            return found
+        return [message for scope, condition, message in self.PERFORMANCE_RULES if scope in scopes and condition(value)]
+
+def validate_files(args):
+    try:
+        with open(args.validate, 'r') as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error: Failed to read {args.validate}: {e}", file=sys.stderr)
+        return 2
+    start_params = None
+    if args.start_script and os.path.exists(args.start_script):
+        with open(args.start_script, 'r') as f:
+            start_params = StartScript.parse(f.read())
+    errors, warnings = ConfigValidator().validate(config, start_params)
+    for error in errors:
+        print(f"Error: {error}")
+    for warning in warnings:
+        print(f"Warning: {warning}")
+    if not errors and not warnings:
+        print(f"{args.validate}: OK")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check server.json and start.sh like the Arma Reforger Server Control GUI")
+    parser.add_argument("--validate", metavar="SERVER_JSON", nargs="?", const=os.path.expanduser("~/arma/server.json"),
+                        default=os.path.expanduser("~/arma/server.json"),
+                        help="server.json to check (default ~/arma/server.json)")
+    parser.add_argument("--start-script", metavar="START_SH", default=os.path.expanduser("~/arma/start.sh"),
+                        help="start script checked together with server.json (default ~/arma/start.sh)")
+    sys.exit(validate_files(parser.parse_args()))
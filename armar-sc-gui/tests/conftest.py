@@ -0,0 +1,25 @@
+import importlib.util
+import os
+
+import pytest
+
+GUI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "armar-sc-gui.py")
+CONFIG_MODULE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "armar_sc_config.py")
+
+
+@pytest.fixture(scope="session")
+def gui():
+    # armar-sc-gui.py is a script with a dash in its name, load it by path.
+    pytest.importorskip("PyQt5.QtWidgets")
+    spec = importlib.util.spec_from_file_location("armar_sc_gui", GUI_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def config_module():
+    spec = importlib.util.spec_from_file_location("armar_sc_config", CONFIG_MODULE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
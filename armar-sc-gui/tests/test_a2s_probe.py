@@ -0,0 +1,74 @@
+import asyncio
+import socket
+import struct
+import threading
+
+import pytest
+
+CHALLENGE = b"\x12\x34\x56\x78"
+
+
+def info_payload(name, map_name, players, max_players, bots=0):
+    return (b"\xFF\xFF\xFF\xFFI\x11" + name.encode() + b"\x00" + map_name.encode() + b"\x00"
+            + b"reforger\x00Arma Reforger\x00" + struct.pack("<HBBB", 0, players, max_players, bots))
+
+
+@pytest.fixture
+def a2s_server():
+    # Answers the plain query with S2C_CHALLENGE and the challenged one with A2S_INFO.
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(0.1)
+    requests = []
+    stop = threading.Event()
+
+    def serve():
+        while not stop.is_set():
+            try:
+                data, addr = sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            requests.append(data)
+            if data.endswith(CHALLENGE):
+                sock.sendto(info_payload("Test Server", "Everon", 12, 64, 2), addr)
+            else:
+                sock.sendto(b"\xFF\xFF\xFF\xFFA" + CHALLENGE, addr)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield sock.getsockname()[1], requests
+    stop.set()
+    thread.join()
+    sock.close()
+
+
+def test_query_answers_challenge(gui, a2s_server):
+    port, requests = a2s_server
+    result = asyncio.run(gui.A2SProbe(timeout=1.0).query("127.0.0.1", port))
+    assert result["ok"], result["error"]
+    assert result["name"] == "Test Server"
+    assert result["map"] == "Everon"
+    assert result["players"] == 12
+    assert result["max_players"] == 64
+    assert result["latency_ms"] is not None and result["latency_ms"] >= 0
+    assert len(requests) == 2
+    assert requests[1] == gui.A2SProbe.INFO_REQUEST + CHALLENGE
+
+
+def test_parse_info_rejects_other_packets(gui):
+    assert gui.A2SProbe.parse_info(info_payload("a", "b", 1, 2))["bots"] == 0
+    with pytest.raises(ValueError):
+        gui.A2SProbe.parse_info(b"\xFF\xFF\xFF\xFFA" + CHALLENGE)
+
+
+def test_query_times_out(gui):
+    silent = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    silent.bind(("127.0.0.1", 0))
+    try:
+        result = asyncio.run(gui.A2SProbe(timeout=0.2).query("127.0.0.1", silent.getsockname()[1]))
+    finally:
+        silent.close()
+    assert not result["ok"]
+    assert result["error"] == "timeout"
+    assert result["latency_ms"] is None
+    assert "no answer (timeout)" in gui.A2SProbe.describe(result)
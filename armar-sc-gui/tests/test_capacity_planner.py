@@ -0,0 +1,65 @@
+VIEW_DISTANCES = (1000, 1500, 2000, 2500, 3000)
+
+
+def server_json(view_distance):
+    return {"game": {"maxPlayers": 64, "gameProperties": {"serverMaxViewDistance": view_distance, "networkViewDistance": 500}}}
+
+
+def recorded(gui):
+    # FPS = 80 - 0.5 * players - 10 * view_km and CPU = 50 + 2 * players + 40 * view_km, exactly.
+    start_sh = gui.StartScript.build({"maxFPS": "120", "logStats": "10000"})
+    timeline = [(0, "start.sh", start_sh)]
+    samples = []
+    ts = 100
+    for view_distance in VIEW_DISTANCES:
+        timeline.append((ts, "server.json", server_json(view_distance)))
+        for step in range(60):
+            ts += 15
+            players = 10 + step * 7 % 51
+            samples.append({"ts": ts, "state": "active", "players": players, "ai": 0,
+                            "fps": 80 - 0.5 * players - 10 * view_distance / 1000,
+                            "cpu": 50 + 2 * players + 40 * view_distance / 1000})
+    return samples, timeline, start_sh
+
+
+def plan_for(gui, view_distance, cpu_limit):
+    samples, timeline, start_sh = recorded(gui)
+    planner = gui.CapacityPlanner(target_fps=30, peak_players=40, cpu_limit=cpu_limit)
+    current = gui.CapacityPlanner.settings_from(server_json(view_distance), gui.StartScript.parse(start_sh))
+    return planner.plan(samples, timeline, current)
+
+
+def recommended(plan, key, default):
+    return next((value for name, _, value, _ in plan["changes"] if name == key), default)
+
+
+def test_recovers_the_linear_relation(gui):
+    plan = plan_for(gui, 1500, 10000)
+    coefficients = plan["model"]["coefficients"]
+    assert plan["model"]["r2"] > 0.99
+    assert abs(coefficients["view_km"] - -10) < 0.1
+    # players and network_players are collinear at a fixed network distance, only their sum is identified.
+    assert abs(coefficients["players"] + coefficients["network_players"] * 0.5 - -0.5) < 0.01
+    assert abs(plan["predicted_now"] - 45) < 0.1
+    assert abs(plan["cpu_now"] - 190) < 0.5
+
+
+def test_raises_view_distance_while_fps_allows(gui):
+    # 60 - 10 * view_km >= 31 (target plus margin) up to 2900 m, the last 250 m step is 2750.
+    plan = plan_for(gui, 1500, 10000)
+    assert recommended(plan, "serverMaxViewDistance", 1500) == 2750
+    assert plan["predicted_after"] >= 31
+
+
+def test_cpu_limit_caps_the_recommendation(gui):
+    # 130 + 40 * view_km <= 205 up to 1875 m, so 1750 even though FPS would allow 2750.
+    plan = plan_for(gui, 1500, 205)
+    assert recommended(plan, "serverMaxViewDistance", 1500) == 1750
+    assert plan["cpu_after"] <= 205
+
+
+def test_lowers_settings_that_saturate_cpu(gui):
+    plan = plan_for(gui, 3000, 205)
+    assert recommended(plan, "serverMaxViewDistance", 3000) == 1750
+    assert "CPU at peak is predicted above 205%" in dict((name, reason) for name, _, _, reason in plan["changes"])["serverMaxViewDistance"]
+    assert "Predicted CPU at peak: 250% now, 200% recommended" in gui.CapacityPlanner(cpu_limit=205).describe(plan)
@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+
+from conftest import CONFIG_MODULE
+
+VALID = {
+    "publicAddress": "192.168.1.10",
+    "publicPort": 2001,
+    "game": {"name": "Test", "passwordAdmin": "secret", "maxPlayers": 32,
+             "scenarioId": "{ECC61978EDCC2B5A}Missions/23_Campaign.conf"},
+}
+
+
+def test_max_fps_is_capped_at_the_budget(config_module):
+    validator = config_module.ConfigValidator()
+    budget = config_module.SERVER_FPS_BUDGET
+    errors, _ = validator.validate(None, {"maxFPS": str(budget)})
+    assert errors == []
+    errors, _ = validator.validate(None, {"maxFPS": str(budget + 1)})
+    assert errors == [f"-maxFPS: Max FPS must be between 1 and {budget}."]
+
+
+def test_validates_without_qt(tmp_path):
+    server_json = tmp_path / "server.json"
+    start_sh = tmp_path / "start.sh"
+    start_sh.write_text("$HOME/arma/ArmaReforgerServer -maxFPS=60 -logStats=60000")
+    # -S and -I keep site-packages (and with them PyQt5) out, like a headless server.
+    command = [sys.executable, "-S", "-I", CONFIG_MODULE, "--validate", str(server_json), "--start-script", str(start_sh)]
+    server_json.write_text(json.dumps(VALID))
+    result = subprocess.run(command, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "OK" in result.stdout
+    server_json.write_text(json.dumps(dict(VALID, publicPort=80)))
+    result = subprocess.run(command, capture_output=True, text=True)
+    assert result.returncode == 1
+    assert "Error: publicPort: Public Port must be between 1024 and 65535." in result.stdout
@@ -0,0 +1,60 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+
+@pytest.fixture
+def exporter(gui):
+    collector = gui.MetricsCollector()
+    collector.update_unit("ActiveState=active\nMainPID=0\nNRestarts=3\nControlGroup=\n")
+    collector.ingest_log_line("FPS: 58.5, Players: 17, AI: 240")
+    collector.update_mods(4, 6)
+    collector.update_disk_usage(1024)
+    collector.record_control_restart()
+    exporter = gui.MetricsExporter(collector, 0)
+    exporter.start()
+    yield exporter
+    exporter.stop()
+
+
+def fetch(exporter, path, accept=None):
+    request = urllib.request.Request(f"http://127.0.0.1:{exporter.port}{path}", headers={"Accept": accept} if accept else {})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.headers["Content-Type"], response.read().decode()
+
+
+def test_serves_gauges_and_counters(exporter):
+    content_type, body = fetch(exporter, "/metrics")
+    assert content_type.startswith("text/plain; version=0.0.4")
+    lines = body.splitlines()
+    assert "# TYPE arma_unit_up gauge" in lines
+    assert "arma_unit_up 1" in lines
+    assert 'arma_unit_state{state="active"} 1' in lines
+    assert 'arma_unit_state{state="failed"} 0' in lines
+    assert "# TYPE arma_unit_restarts_total counter" in lines
+    assert "arma_unit_restarts_total 3" in lines
+    assert "arma_control_restarts_total 1" in lines
+    assert "arma_server_fps 58.5" in lines
+    assert "arma_server_players 17" in lines
+    assert "arma_server_ai 240" in lines
+    assert "arma_mods_active 4" in lines
+    assert "arma_addons_disk_bytes 1024" in lines
+
+
+def test_openmetrics_format(exporter):
+    content_type, body = fetch(exporter, "/metrics", "application/openmetrics-text")
+    assert content_type.startswith("application/openmetrics-text")
+    assert "# TYPE arma_unit_restarts counter" in body.splitlines()
+    assert body.endswith("# EOF\n")
+
+
+def test_other_paths_are_not_found(exporter):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        fetch(exporter, "/admin")
+    assert error.value.code == 404
+
+
+def test_binds_to_localhost_only(exporter):
+    assert exporter.server.server_address[0] == "127.0.0.1"
+    assert exporter.port != 0
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class SlowHandler(SimpleHTTPRequestHandler):
+    # Holds every file request for a moment and records how many overlap.
+    state = None
+
+    def do_GET(self):
+        state = self.state
+        with state["lock"]:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        try:
+            if not self.path.endswith("manifest.json"):
+                time.sleep(0.2)
+            super().do_GET()
+        finally:
+            with state["lock"]:
+                state["active"] -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+def publish(root, mod_id, name, version, files, corrupt=()):
+    manifest = {"id": mod_id, "name": name, "version": version, "dependencies": [], "files": []}
+    os.makedirs(os.path.join(root, "mods", mod_id), exist_ok=True)
+    for path, data in files.items():
+        target = os.path.join(root, "mods", mod_id, version, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(b"corrupted" if path in corrupt else data)
+        manifest["files"].append({"path": path, "size": len(data), "sha256": hashlib.sha256(data).hexdigest()})
+    with open(os.path.join(root, "mods", mod_id, "manifest.json"), 'w') as f:
+        json.dump(manifest, f)
+
+
+@pytest.fixture
+def content_source(tmp_path):
+    root = tmp_path / "source"
+    root.mkdir()
+    state = {"lock": threading.Lock(), "active": 0, "peak": 0}
+    handler = type("Handler", (SlowHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=str(root)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield str(root), f"http://127.0.0.1:{server.server_address[1]}", state
+    server.shutdown()
+    server.server_close()
+
+
+def test_stages_in_parallel_and_commits(gui, tmp_path, content_source):
+    root, url, state = content_source
+    files = {f"data/part{index}.pak": os.urandom(2048) for index in range(4)}
+    publish(root, "AAAAAAAAAAAAAAAA", "Mod A", "1.0.1", files)
+    addons = tmp_path / "addons"
+    old_dir = addons / "ModA_AAAAAAAAAAAAAAAA"
+    old_dir.mkdir(parents=True)
+    (old_dir / "stale.pak").write_bytes(b"old")
+    installed = {"AAAAAAAAAAAAAAAA": (str(old_dir), "Mod A", "1.0.0")}
+    stager = gui.ModStager(url, str(addons), installed, max_workers=4)
+
+    items, downloaded = stager.stage([{"modId": "AAAAAAAAAAAAAAAA"}])
+
+    assert downloaded == sum(len(data) for data in files.values())
+    assert state["peak"] >= 2
+    assert not list(old_dir.glob("data/*"))
+    stager.commit(items)
+    for path, data in files.items():
+        assert (old_dir / path).read_bytes() == data
+    assert not (old_dir / "stale.pak").exists()
+    assert json.loads((old_dir / "meta").read_text())["meta"]["versions"][0]["version"] == "1.0.1"
+    assert not os.listdir(addons / ".staging")
+
+
+def test_rejects_checksum_mismatch(gui, tmp_path, content_source):
+    root, url, _ = content_source
+    publish(root, "BBBBBBBBBBBBBBBB", "Mod B", "2.0", {"good.pak": b"good", "bad.pak": b"expected"}, corrupt=("bad.pak",))
+    stager = gui.ModStager(url, str(tmp_path / "addons"), {}, max_workers=2)
+
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        stager.stage([{"modId": "BBBBBBBBBBBBBBBB"}])
+    staged = tmp_path / "addons" / ".staging" / "ModB_BBBBBBBBBBBBBBBB"
+    assert not list(staged.rglob("*.part"))
+    assert not (staged / "bad.pak").exists()
+
+
+def test_manifest_without_files(gui, tmp_path, content_source):
+    root, url, _ = content_source
+    publish(root, "CCCCCCCCCCCCCCCC", "Mod C", "1.0", {})
+    stager = gui.ModStager(url, str(tmp_path / "addons"), {})
+
+    items, downloaded = stager.stage([{"modId": "CCCCCCCCCCCCCCCC"}])
+
+    assert downloaded == 0
+    assert os.path.exists(os.path.join(items[0]["staged"], "meta"))
+
+
+def test_commit_rolls_back_when_a_rename_fails(gui, tmp_path, monkeypatch):
+    addons = tmp_path / "addons"
+    items = []
+    for name in ("ModA_AAAAAAAAAAAAAAAA", "ModB_BBBBBBBBBBBBBBBB"):
+        (addons / name).mkdir(parents=True)
+        (addons / name / "version").write_text("old")
+        (addons / ".staging" / name).mkdir(parents=True)
+        (addons / ".staging" / name / "version").write_text("new")
+        items.append({"staged": str(addons / ".staging" / name), "target": str(addons / name)})
+    stager = gui.ModStager("http://unused", str(addons), {})
+    replace = os.replace
+
+    def failing_replace(src, dst):
+        if src == items[1]["staged"]:
+            raise OSError("disk full")
+        replace(src, dst)
+    monkeypatch.setattr(gui.os, "replace", failing_replace)
+
+    with pytest.raises(ValueError, match="previous mods restored"):
+        stager.commit(items)
+    for item in items:
+        assert open(os.path.join(item["target"], "version")).read() == "old"
+        assert open(os.path.join(item["staged"], "version")).read() == "new"
+    assert sorted(os.listdir(addons / ".staging")) == ["ModA_AAAAAAAAAAAAAAAA", "ModB_BBBBBBBBBBBBBBBB"]
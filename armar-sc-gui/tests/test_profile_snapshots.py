@@ -0,0 +1,64 @@
+import os
+import time
+
+
+def test_prune_keeps_chunks_of_running_snapshots(gui, tmp_path):
+    profile = tmp_path / "profile"
+    profile.mkdir()
+    (profile / "settings.json").write_bytes(b"first")
+    snapshots = gui.ProfileSnapshots(str(tmp_path / "store"), str(profile))
+    first, _ = snapshots.snapshot()
+    old_chunk = snapshots.load(first)["files"]["settings.json"]["chunks"][0]
+    old_path = snapshots.chunk_path(old_chunk)
+    os.utime(old_path, (time.time() - 60, time.time() - 60))
+
+    # What a concurrent snapshot leaves behind before its manifest exists.
+    tmp_file = os.path.join(os.path.dirname(old_path), ".tmp-partial")
+    open(tmp_file, 'wb').close()
+    os.utime(tmp_file, (time.time() - 60, time.time() - 60))
+    fresh_chunk = snapshots.chunk_path("ff" + "0" * 62)
+    os.makedirs(os.path.dirname(fresh_chunk), exist_ok=True)
+
+    (profile / "settings.json").write_bytes(b"second")
+    started = time.time()
+    second, _ = snapshots.snapshot()
+    with open(fresh_chunk, 'wb') as f:
+        f.write(b"unreferenced yet")
+
+    assert snapshots.remove_old(1, started) == 1
+    assert snapshots.names() == [second]
+    assert not os.path.exists(old_path)
+    assert os.path.exists(tmp_file)
+    assert os.path.exists(fresh_chunk)
+    restored = tmp_path / "restored"
+    snapshots.restore(second, str(restored))
+    assert (restored / "settings.json").read_bytes() == b"second"
+    assert os.path.exists(os.path.join(str(tmp_path / "store"), "lock"))
+
+
+def test_snapshots_only_store_changed_chunks(gui, tmp_path, monkeypatch):
+    monkeypatch.setattr(gui.ProfileSnapshots, "CHUNK_SIZE", 1024)
+    profile = tmp_path / "profile"
+    (profile / "profile").mkdir(parents=True)
+    big = bytearray(os.urandom(4 * 1024))
+    (profile / "profile" / "big.bin").write_bytes(bytes(big))
+    (profile / "settings.json").write_bytes(os.urandom(1500))
+    snapshots = gui.ProfileSnapshots(str(tmp_path / "store"), str(profile))
+
+    _, first = snapshots.snapshot()
+    assert first["files"] == 2 and first["changed_files"] == 2
+    assert first["stored_bytes"] > 0
+
+    _, unchanged = snapshots.snapshot()
+    assert unchanged["changed_files"] == 0
+    assert unchanged["stored_bytes"] == 0
+
+    # One 1 KB chunk of one file changes, only that chunk is new.
+    big[2048:2052] = b"edit"
+    (profile / "profile" / "big.bin").write_bytes(bytes(big))
+    os.utime(profile / "profile" / "big.bin", (time.time() + 5, time.time() + 5))
+    name, changed = snapshots.snapshot()
+    assert changed["changed_files"] == 1
+    chunks = snapshots.load(name)["files"]["profile/big.bin"]["chunks"]
+    assert 0 < changed["stored_bytes"] <= os.path.getsize(snapshots.chunk_path(chunks[2]))
+    assert sum(len(files) for _, _, files in os.walk(snapshots.chunks_dir)) == 2 + 4 + 1
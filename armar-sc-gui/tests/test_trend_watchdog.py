@@ -0,0 +1,46 @@
+MB = 1048576
+
+
+def series(start_ts, minutes, rss_mb, rss_growth_mb_per_min=0.0, fps=50.0, pid=1234, started="Mon 2026-10-19 10:00:00 UTC"):
+    return [{"ts": start_ts + minute * 60, "state": "active", "pid": pid, "started": started,
+             "rss": int((rss_mb + rss_growth_mb_per_min * minute) * MB), "fps": fps}
+            for minute in range(minutes)]
+
+
+def test_leaking_series_triggers(gui):
+    watchdog = gui.TrendWatchdog(rss_limit_mb=12000, horizon_minutes=60)
+    # 100 MB/min from 8000 MB: 11900 MB after 40 min, 17900 MB projected an hour later.
+    samples = series(1000000, 40, 8000, 100)
+    reasons = watchdog.evaluate(samples)
+    assert len(reasons) == 1
+    assert reasons[0].startswith("RSS growing 6000 MB/h")
+    triggers = watchdog.replay(samples)
+    assert len(triggers) == 1
+    # The projection crosses 12000 MB once 8000 + 100 * (t + 60) >= 12000, at the 20th sample (min_points).
+    assert triggers[0][0] == samples[19]["ts"]
+
+
+def test_flat_series_does_not_trigger(gui):
+    watchdog = gui.TrendWatchdog(rss_limit_mb=12000)
+    samples = series(1000000, 120, 9000, 0, fps=45)
+    assert watchdog.evaluate(samples) == []
+    assert watchdog.replay(samples) == []
+
+
+def test_restart_without_inactive_sample_splits_the_run(gui):
+    watchdog = gui.TrendWatchdog(rss_limit_mb=12000)
+    # RSS drops back after a restart systemd did between two samples; spanning both runs
+    # would fit one line through the sawtooth, only the flat second run counts.
+    before = series(1000000, 30, 6000, 150, pid=1234)
+    after = series(before[-1]["ts"] + 60, 30, 4000, 0, pid=5678, started="Mon 2026-10-19 11:00:00 UTC")
+    run = watchdog.current_run(before + after)
+    assert run == after
+    assert watchdog.evaluate(before + after) == []
+    triggers = watchdog.replay(before + after)
+    assert len(triggers) == 1 and triggers[0][0] <= before[-1]["ts"]
+
+
+def test_samples_without_run_identity_still_join(gui):
+    watchdog = gui.TrendWatchdog()
+    samples = series(1000000, 10, 4000, pid=None, started=None)
+    assert watchdog.current_run(samples) == samples
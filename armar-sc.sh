@@ -107,16 +107,71 @@ update_json() {
     local slurp_file="$2"
     local tmp_file=$(mktemp)
     if [ -n "$slurp_file" ]; then
-        jq --slurpfile mods "$slurp_file" "$filter" "$CONFIG_FILE" > "$tmp_file" && mv "$tmp_file" "$CONFIG_FILE"
+        jq --slurpfile mods "$slurp_file" "$filter" "$CONFIG_FILE" > "$tmp_file"
     else
-        jq "$filter" "$CONFIG_FILE" > "$tmp_file" && mv "$tmp_file" "$CONFIG_FILE"
+        jq "$filter" "$CONFIG_FILE" > "$tmp_file"
     fi
-    # Check if the update succeeded
-    if [ $? -eq 0 ]; then
+    if [ $? -ne 0 ]; then
+        rm -f "$tmp_file"
+        echo -e "${RED}Error: Failed to update configuration file.${RESET}"
+        return 1
+    fi
+    # Check the edited copy before it replaces server.json, problems already in the file don't block the edit
+    local validator
+    validator=$(validator_path)
+    if [ -f "$validator" ]; then
+        local new_errors
+        new_errors=$(validation_errors "$validator" "$tmp_file" | grep -Fxv -f <(validation_errors "$validator" "$CONFIG_FILE"))
+        if [ -n "$new_errors" ]; then
+            rm -f "$tmp_file"
+            echo -e "${RED}${new_errors}${RESET}"
+            echo -e "${RED}Error: The change fails validation, $CONFIG_FILE was not modified.${RESET}"
+            return 1
+        fi
+    else
+        echo -e "${YELLOW}Warning: $validator not found, this change was NOT validated.${RESET}"
+    fi
+    if mv "$tmp_file" "$CONFIG_FILE"; then
         echo -e "${GREEN}Configuration updated successfully. Restart service after all changes are made.${RESET}"
+        [ -f "$validator" ] && validate_config
+        return 0
     else
+        rm -f "$tmp_file"
         echo -e "${RED}Error: Failed to update configuration file.${RESET}"
+        return 1
+    fi
+}
+
+# Path of armar_sc_config.py, the validator the GUI uses (plain python3, no Qt needed)
+validator_path() {
+    command -v armar_sc_config.py || echo "$HOME/bin/armar_sc_config.py"
+}
+
+# Prints only the validator's Error: lines for a server.json
+validation_errors() {
+    python3 "$1" --validate "$2" 2>&1 | grep '^Error:'
+}
+
+# Check server.json and start.sh with the GUI's validator (same rules as the GUI)
+# Returns 1 on errors, 2 when armar_sc_config.py is not installed
+validate_config() {
+    local validator
+    validator=$(validator_path)
+    if [ ! -f "$validator" ]; then
+        echo -e "${YELLOW}Warning: $validator not found, configuration not validated.${RESET}"
+        return 2
     fi
+    local output status
+    output=$(python3 "$validator" --validate "$CONFIG_FILE" 2>&1)
+    status=$?
+    while IFS= read -r line; do
+        case "$line" in
+            Error:*) echo -e "${RED}${line}${RESET}" ;;
+            Warning:*) echo -e "${YELLOW}${line}${RESET}" ;;
+            *) echo "$line" ;;
+        esac
+    done <<< "$output"
+    return $status
 }
 
 # Validate an IP address format
@@ -231,12 +286,15 @@ EOF
 [Unit]
 Description=Arma Reforger Server
 After=network.target
+StartLimitIntervalSec=900
+StartLimitBurst=5
 
 [Service]
 Type=simple
 ExecStart=/home/$USER/arma/start.sh
 WorkingDirectory=/home/$USER/arma
 Restart=always
+RestartSec=10
 
 [Install]
 WantedBy=default.target
@@ -293,6 +351,25 @@ list_scenarios() {
     done
 }
 
+# Add scenarios found by the GUI's scenario indexer ($TEMPLATE_DIR/mod-catalog.json),
+# modded ones are labelled with the mod they come from
+load_catalog_scenarios() {
+    local catalog="$TEMPLATE_DIR/mod-catalog.json"
+    if ! command -v jq &> /dev/null || [ ! -f "$catalog" ]; then
+        return
+    fi
+    declare -A known_ids
+    for entry in "${SCENARIOS[@]}"; do
+        known_ids["${entry%%|*}"]=1
+    done
+    while IFS= read -r entry; do
+        [ -z "$entry" ] || [ -n "${known_ids[${entry%%|*}]}" ] && continue
+        known_ids["${entry%%|*}"]=1
+        SCENARIOS+=("$entry")
+    done < <(jq -r '.sources[] | (if .kind == "mod" then " [" + .name + "]" else "" end) as $source
+        | (.scenarios // [])[] | "\(.[0])|\(.[1])\($source)"' "$catalog" 2>/dev/null | sort -t'|' -k2)
+}
+
 # Manage mods in the server configuration
 manage_mods() {
     if ! command -v jq &> /dev/null; then
@@ -596,6 +673,8 @@ show_help_about() {
     clear
 }
 
+load_catalog_scenarios
+
 # Main loop for the script
 while true; do
     CURRENT_NAME=$(get_json_value ".game.name")
@@ -864,6 +943,7 @@ while true; do
                             echo -e "${RED}Error: jq is not installed. Cannot view JSON configuration.${RESET}"
                         elif jq . "$CONFIG_FILE" 2>/dev/null; then
                             echo "Server configuration displayed above."
+                            validate_config
                         else
                             echo -e "${RED}Error: Unable to read server JSON at $CONFIG_FILE${RESET}"
                         fi
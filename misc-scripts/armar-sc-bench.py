@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+
+# armar-sc-bench.py - Benchmarks for the hot paths of armar-sc-gui.py
+#
+# Builds a synthetic ~/arma tree (addons with meta files, a large server.json
+# modlist, start.sh and a big server log) in a temporary HOME, times the GUI's
+# code paths against it and compares the results with a stored baseline.
+# Needs python3-pyqt5, like the GUI. Runs on the offscreen Qt platform.
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+GUI_SCRIPT = os.path.join(REPO_DIR, "armar-sc-gui", "armar-sc-gui.py")
+DEFAULT_BASELINE = os.path.expanduser("~/.arsc/bench-baseline.json")
+
+BENCHMARKS = []
+
+def benchmark(name, repeat=None):
+    def register(func):
+        BENCHMARKS.append((name, func, repeat))
+        return func
+    return register
+
+def mod_id(index):
+    return f"{index:016X}"
+
+def build_tree(home, mod_count, log_size_mb):
+    arma = os.path.join(home, "arma")
+    addons = os.path.join(arma, "profile", "addons")
+    os.makedirs(addons)
+    mods = []
+    for index in range(mod_count):
+        path = os.path.join(addons, f"BenchMod{index}_{mod_id(index)}")
+        os.makedirs(path)
+        meta = {"meta": {"id": mod_id(index), "name": f"Bench Mod {index}", "versions": [{"version": f"1.0.{index % 50}"}]}}
+        with open(os.path.join(path, "meta"), 'w') as f:
+            json.dump(meta, f)
+        with open(os.path.join(path, "data.pak"), 'wb') as f:
+            f.write(b"{%s}Missions/Bench_%d.conf" % (mod_id(index).encode(), index) if index % 10 == 0 else b"\0" * 64)
+        mods.append({"modId": mod_id(index), "name": f"Bench Mod {index}", "version": f"1.0.{index % 50}"})
+    with open(os.path.join(REPO_DIR, "server-files", "server.json"), 'r') as f:
+        config = json.load(f)
+    config["game"]["mods"] = mods
+    with open(os.path.join(arma, "server.json"), 'w') as f:
+        json.dump(config, f, indent=2)
+    with open(os.path.join(REPO_DIR, "server-files", "start.sh"), 'r') as f:
+        start_script = f.read()
+    with open(os.path.join(arma, "start.sh"), 'w') as f:
+        f.write(start_script)
+    os.chmod(os.path.join(arma, "start.sh"), 0o755)
+    log_file = os.path.join(home, "server.log")
+    write_log(log_file, log_size_mb)
+    return log_file
+
+def write_log(path, size_mb):
+    rng = random.Random(307)
+    noise = [
+        "SCRIPT       : Loading mission\n",
+        "RPL          : rpl::Pip::ProcessNetToGame\n",
+        "NETWORK      : ### Connecting player: connectionID=%d, Name=Player%d\n",
+        "WORLD        : Entity spawned at <%d, 0, %d>\n",
+    ]
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(path, 'w') as f:
+        while written < target:
+            lines = []
+            for _ in range(1000):
+                if rng.random() < 0.2:
+                    lines.append(f"12:00:00.000  DEFAULT      : FPS: {rng.uniform(20, 60):.1f}, frame time (avg: 16.6 ms), "
+                                 f"Mem: {rng.randint(3000000, 9000000)} kB, Players: {rng.randint(0, 64)}, AI: {rng.randint(0, 400)}\n")
+                else:
+                    line = rng.choice(noise)
+                    lines.append("12:00:00.000  " + (line % (rng.randint(0, 999), rng.randint(0, 999)) if "%d" in line else line))
+            block = "".join(lines)
+            f.write(block)
+            written += len(block)
+
+def load_gui():
+    spec = importlib.util.spec_from_file_location("armar_sc_gui", GUI_SCRIPT)
+    gui = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(gui)
+    # Dialogs would block the run; answer them the way a user saving changes would.
+    gui.QMessageBox.information = staticmethod(lambda *args, **kwargs: gui.QMessageBox.Ok)
+    gui.QMessageBox.warning = staticmethod(lambda *args, **kwargs: gui.QMessageBox.Ok)
+    gui.QMessageBox.critical = staticmethod(lambda *args, **kwargs: gui.QMessageBox.Ok)
+    gui.QMessageBox.question = staticmethod(lambda *args, **kwargs: gui.QMessageBox.Yes)
+    return gui
+
+class Context:
+    def __init__(self, gui, app, window, home, log_file, args):
+        self.gui = gui
+        self.app = app
+        self.window = window
+        self.home = home
+        self.log_file = log_file
+        self.args = args
+
+@benchmark("mod_scan_cold")
+def bench_mod_scan_cold(ctx):
+    catalog_file = os.path.join(ctx.home, ".arsc", "bench-catalog.json")
+    if os.path.exists(catalog_file):
+        os.unlink(catalog_file)
+    catalog = ctx.gui.ModCatalog(catalog_file, ctx.window.addons_dir, ctx.window.game_addons_dir)
+    catalog.refresh()
+    return len(catalog.mods())
+
+@benchmark("mod_scan_warm")
+def bench_mod_scan_warm(ctx):
+    ctx.window.mod_catalog.refresh()
+    return len(ctx.window.mod_catalog.mods())
+
+@benchmark("update_mods_display")
+def bench_update_mods_display(ctx):
+    ctx.window.update_mods_display()
+    ctx.app.processEvents()
+    return len(ctx.window.mod_checkboxes)
+
+@benchmark("sync_mods")
+def bench_sync_mods(ctx):
+    ctx.window.sync_mods()
+    ctx.app.processEvents()
+
+@benchmark("config_load")
+def bench_config_load(ctx):
+    ctx.window.load_config()
+
+@benchmark("config_save")
+def bench_config_save(ctx):
+    ctx.window.save_config()
+
+@benchmark("config_validate")
+def bench_config_validate(ctx):
+    with open(ctx.window.config_file, 'r') as f:
+        config = json.load(f)
+    errors, warnings = ctx.window.validator.validate(config, ctx.window.start_base)
+    return len(errors)
+
+@benchmark("start_params_parse_build_x1000")
+def bench_start_params(ctx):
+    with open(ctx.window.start_script, 'r') as f:
+        content = f.read()
+    for _ in range(1000):
+        content = ctx.gui.StartScript.build(ctx.gui.StartScript.parse(content))
+
+@benchmark("start_params_load")
+def bench_start_params_load(ctx):
+    ctx.window.load_start_params()
+
+@benchmark("start_params_save")
+def bench_start_params_save(ctx):
+    ctx.window.save_start_params()
+
+@benchmark("log_ingest_collector", repeat=1)
+def bench_log_ingest(ctx):
+    collector = ctx.gui.MetricsCollector()
+    matched = 0
+    with open(ctx.log_file, 'r') as f:
+        for line in f:
+            if collector.ingest_log_line(line):
+                matched += 1
+    return matched
+
+@benchmark("log_ingest_gui_4mb", repeat=1)
+def bench_log_ingest_gui(ctx):
+    # The GUI path appends to the log pane, so only feed it a slice of the log.
+    ctx.window.log_model.clear()
+    with open(ctx.log_file, 'r') as f:
+        for _ in range(64):
+            ctx.window.append_log_output(f.read(64 * 1024))
+            ctx.app.processEvents()
+
+@benchmark("log_filter_1m_lines", repeat=1)
+def bench_log_filter(ctx):
+    lines = []
+    with open(ctx.log_file, 'r') as f:
+        for line in f:
+            lines.append(line.rstrip("\n"))
+            if len(lines) >= 1000000:
+                break
+    levels = [ctx.gui.LogFilter.level(line) for line in lines]
+    log_filter = ctx.gui.LogFilter(("error", "warning", "info"), r"connect(ing|ed)", ())
+    return len(log_filter.select(lines, levels, 0, len(lines)))
+
+@benchmark("gui_tab_switch")
+def bench_tab_switch(ctx):
+    for index in range(ctx.window.tabs.count()):
+        ctx.window.tabs.setCurrentIndex(index)
+        ctx.app.processEvents()
+    ctx.window.tabs.setCurrentIndex(0)
+    ctx.app.processEvents()
+
+@benchmark("gui_sample_metrics")
+def bench_sample_metrics(ctx):
+    ctx.window.sample_metrics()
+    ctx.app.processEvents()
+
+@benchmark("gui_history_refresh")
+def bench_history_refresh(ctx):
+    ctx.window.update_history_list()
+    ctx.app.processEvents()
+
+def run(ctx, names, repeat):
+    results = {}
+    for name, func, fixed_repeat in BENCHMARKS:
+        if names and name not in names:
+            continue
+        timings = []
+        for _ in range(fixed_repeat or repeat):
+            start = time.perf_counter()
+            func(ctx)
+            timings.append(time.perf_counter() - start)
+        results[name] = {"median": statistics.median(timings), "min": min(timings), "runs": len(timings)}
+        print(f"  {name:<34} median {results[name]['median'] * 1000:10.2f} ms   min {results[name]['min'] * 1000:10.2f} ms", flush=True)
+    return results
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else 0
+        status = "REGRESSION" if ratio > 1 + threshold else ("faster" if ratio < 1 - threshold else "ok")
+        print(f"  {name:<34} {ratio:6.2f}x baseline  {status}")
+        if status == "REGRESSION":
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark armar-sc-gui.py against synthetic server trees")
+    parser.add_argument("--mods", default="10,500,5000", help="comma separated addon counts to test (default 10,500,5000)")
+    parser.add_argument("--log-size-mb", type=int, default=256, help="size of the synthetic server log (default 256)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark, the median is reported (default 5)")
+    parser.add_argument("--only", default="", help="comma separated benchmark names to run")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help=f"baseline file (default {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown that counts as a regression (default 0.2 = 20%%)")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args()
+    if args.list:
+        for name, _, _ in BENCHMARKS:
+            print(name)
+        return 0
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    real_home = os.path.expanduser("~")
+    names = [name for name in args.only.split(",") if name]
+    results = {}
+    gui = load_gui()
+    app = gui.QApplication(sys.argv[:1])
+    for mod_count in [int(count) for count in args.mods.split(",") if count]:
+        with tempfile.TemporaryDirectory(prefix="arsc-bench-") as home:
+            print(f"{mod_count} mods, {args.log_size_mb} MB log:", flush=True)
+            log_file = build_tree(home, mod_count, args.log_size_mb)
+            os.environ["HOME"] = home
+            try:
+                start = time.perf_counter()
+                window = gui.ArmaServerControlApp()
+                app.processEvents()
+                startup = time.perf_counter() - start
+                print(f"  {'gui_startup':<34} median {startup * 1000:10.2f} ms", flush=True)
+                ctx = Context(gui, app, window, home, log_file, args)
+                mod_results = {"gui_startup": {"median": startup, "min": startup, "runs": 1}}
+                mod_results.update(run(ctx, names, args.repeat))
+                window.close()
+                app.processEvents()
+            finally:
+                os.environ["HOME"] = real_home
+            for name, result in mod_results.items():
+                results[f"{name}[{mod_count}]"] = result
+
+    baseline = {}
+    try:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f).get("results", {})
+    except (OSError, ValueError):
+        pass
+    regressions = []
+    if baseline:
+        print(f"Compared with {args.baseline}:")
+        regressions = compare(results, baseline, args.threshold)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({"created": time.time(), "results": results}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())